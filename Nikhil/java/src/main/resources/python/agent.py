@@ -7,13 +7,17 @@ conventions and the `openai` Python SDK.
 
 Dependencies
 ------------
-- openai                (official OpenAI SDK)
+- openai                (official OpenAI SDK, through llm_transport)
 - json                  (standard library)
 - logging               (standard library)
 - chat_types.ChatMessage, chat_types.ChatCompletion,
   chat_types.ToolCall, chat_types.ToolCallResult, chat_types.TextPart
 - tool.Tool             (protocol / abstract base class for tools)
 - json_schema.JsonSchema
+- response_cache.ResponseCache (optional LLM response cache)
+- llm_transport.LlmTransport   (how requests reach the model)
+- resilience.RetryPolicy       (retries, deadlines and hedging of requests)
+- run_budget.RunBudget         (optional limits shared by the agents of a run)
 """
 
 from __future__ import annotations
@@ -21,8 +25,10 @@ from __future__ import annotations
 import json
 import logging
 import os
-from collections.abc import Iterable, Sequence
-from typing import Any, Dict, List, Mapping, MutableMapping, Type
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any, ClassVar, Dict, List, Mapping, MutableMapping, Tuple, Type
 
 import openai
 
@@ -34,15 +40,21 @@ from chat_types import (
     ToolCallResult,
 )
 from json_schema import JsonSchema
+from llm_transport import LlmTransport, OpenAITransport, StreamedPayload
+import log_config
+from prompt_template import PromptTemplate
+from rate_limiter import RateLimiter
+from resilience import RetryPolicy
+from run_budget import RunBudget
+from response_cache import ResponseCache
+import timing
+import tokens
 from tool import Tool
 
 # --------------------------------------------------------------------------- #
 # Logging (equivalent to Java SimpleLogger)
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------------- #
@@ -60,10 +72,53 @@ class Agent:
         Human-readable description of the agent’s capabilities.
     tools : Iterable[Tool], optional
         Tools that the agent can invoke.
+
+    Requests start with a static prefix, the personality (as system message)
+    and the tool definitions, that does not change between the calls made
+    for one command and is serialised identically each time, so that the
+    provider can serve it from its prompt cache; how many prompt tokens were
+    cached is counted in :pyattr:`usage` (see :class:`Agent.UsageStats`).
     """
 
     DEFAULT_MODEL: str = "gpt-4.1"
 
+    @dataclass
+    class UsageStats:
+        """Token usage reported by the API, for the requests actually sent."""
+
+        requests: int = 0
+        prompt_tokens: int = 0
+        cached_tokens: int = 0  # prompt tokens served from the provider's prompt cache
+        completion_tokens: int = 0
+
+        @property
+        def cache_hit_rate(self) -> float:
+            """Fraction of prompt tokens read from the prompt cache."""
+            return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+        def add(self, usage: Mapping[str, Any]) -> None:
+            self.requests += 1
+            self.prompt_tokens += usage.get("prompt_tokens") or 0
+            self.completion_tokens += usage.get("completion_tokens") or 0
+            details = usage.get("prompt_tokens_details") or {}
+            self.cached_tokens += details.get("cached_tokens") or 0
+
+    # Usage of all agents in the process; see reset_total_usage()
+    total_usage: ClassVar["Agent.UsageStats"] = UsageStats()
+    _total_usage_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    # Transport used by agents that do not set their own (None == OpenAI);
+    # e.g. the benchmark replays recorded responses for every nested agent.
+    default_transport: ClassVar[LlmTransport | None] = None
+
+    _openai_transport: ClassVar[LlmTransport] = OpenAITransport()
+
+    # Scheduler every request goes through (None == RateLimiter.get_instance())
+    rate_limiter: ClassVar[RateLimiter | None] = None
+
+    # Retries / deadlines / hedging of agents that do not set their own policy
+    default_retry_policy: ClassVar[RetryPolicy] = RetryPolicy()
+
     # -------------------------- construction --------------------------- #
     def __init__(
         self,
@@ -92,17 +147,102 @@ class Agent:
         self.max_history_length: int = float("inf")  # no hard limit
         self.max_conversation_steps: int = float("inf")
 
+        # Token budget for the whole prompt (personality, messages and tool
+        # definitions), enforced before each request; None == no limit.
+        self.max_prompt_tokens: int | None = None
+
         # Model configuration ------------------------------------------ #
         self.model: str = self.DEFAULT_MODEL
         self.temperature: float = 0.0
         self.personality: str | None = None
         self._response_format: str | None = None
 
+        # Sent as "prompt_cache_key" to help the provider route requests
+        # sharing the same prefix to the same cache; None == not sent.
+        self.prompt_cache_key: str | None = None
+
+        # Static head of the messages: (personality it was built for, messages)
+        self._prefix: Tuple[str | None, List[Dict[str, Any]]] = (None, [])
+
+        # Request parts built once and reused by every request (see
+        # _create_tool_definitions and _create_response_format)
+        self._tool_definitions: List[Dict[str, Any]] | None = None
+        self._tool_definitions_json: str | None = None
+        self._tool_tokens: Tuple[str, int] | None = None  # (model, tokens)
+        self._response_format_payload: Tuple[str | None, Dict[str, Any] | None] = (None, None)
+
+        self.usage: Agent.UsageStats = Agent.UsageStats()
+        # Requests of one agent can run in parallel (e.g. critic samples)
+        self._usage_lock = threading.Lock()
+
+        # Priority of this agent's requests when rate limits are hit
+        self.priority: int = RateLimiter.NORMAL
+
+        # Optional cache of LLM responses (can be shared between agents)
+        self.response_cache: ResponseCache | None = None
+
+        # Transport for this agent only; see default_transport
+        self.transport: LlmTransport | None = None
+
+        # Retry policy for this agent only; see default_retry_policy
+        self.retry_policy: RetryPolicy | None = None
+
+        # Budget every request is charged to (None == unlimited); set per run
+        # by ExecutorModule from ExecutionContext.budget
+        self.run_budget: RunBudget | None = None
+
         # OpenAI configuration ----------------------------------------- #
         # Expect OPENAI_API_KEY in the environment
         openai.api_key = os.getenv("OPENAI_API_KEY")
 
     # --------------------------- utils -------------------------------- #
+    # Tools ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+    def add_tool(self, tool: Tool) -> None:
+        """Make *tool* available to the model from the next request on."""
+        if tool is None:
+            raise ValueError("tool must not be None")
+        if tool.id in self._tool_map:
+            raise ValueError(f"A tool with id {tool.id} already exists")
+        tool.init(self)
+        self._tool_map[tool.id] = tool
+        self.invalidate_tool_definitions()
+
+    def invalidate_tool_definitions(self) -> None:
+        """
+        Rebuild the tool definitions for the next request; called when the
+        tool map changes, or to be called after changing the description or
+        parameters of a tool already added.
+        """
+        self._tool_definitions = None
+        self._tool_definitions_json = None
+        self._tool_tokens = None
+
+    # Usage ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+    def reset_usage(self) -> None:
+        """Start counting this agent's token usage anew."""
+        self.usage = Agent.UsageStats()
+
+    @staticmethod
+    def reset_total_usage() -> "Agent.UsageStats":
+        """Start counting the process-wide usage anew; return the previous counters."""
+        with Agent._total_usage_lock:
+            previous, Agent.total_usage = Agent.total_usage, Agent.UsageStats()
+        return previous
+
+    def _record_usage(self, usage: Mapping[str, Any]) -> None:
+        with self._usage_lock:
+            self.usage.add(usage)
+        with Agent._total_usage_lock:
+            Agent.total_usage.add(usage)
+        details = usage.get("prompt_tokens_details") or {}
+        logger.debug(
+            "%s: %s prompt tokens (%s cached), %s completion tokens",
+            self.id,
+            usage.get("prompt_tokens"),
+            details.get("cached_tokens", 0),
+            usage.get("completion_tokens"),
+        )
+
     # Conversation helpers ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
     def clear_conversation(self) -> None:
         """Start a new chat (clears stored history)."""
@@ -127,13 +267,7 @@ class Agent:
         The provided message(s) are appended to the conversation, the LLM is
         queried, and the reply is stored in the history.
         """
-        # Normalise input
-        if isinstance(message, str):
-            new_messages = [ChatMessage(message)]
-        elif isinstance(message, ChatMessage):
-            new_messages = [message]
-        else:
-            new_messages = list(message)
+        new_messages = self._normalise_messages(message)
 
         # Build conversation context
         conversation: List[ChatMessage] = list(self.history) + new_messages
@@ -142,12 +276,35 @@ class Agent:
         # Call the model
         completion = self._chat_completion(conversation)
 
-        # Update history (respecting max_history_length)
-        self.history.extend(new_messages)
-        self.history.append(completion.message)
-        if len(self.history) > self.max_history_length:
-            del self.history[: len(self.history) - self.max_history_length]
+        self._update_history(new_messages, completion)
+        return completion
+
+    def chat_stream(
+        self,
+        message: str | ChatMessage | Sequence[ChatMessage],
+        on_tool_call: Callable[[ToolCall], None],
+    ) -> ChatCompletion:
+        """
+        Same as :meth:`chat`, but the reply is streamed: *on_tool_call* is
+        called with each tool call as soon as its arguments are complete,
+        while the model is still generating the next ones, so that the caller
+        can start executing it. It runs in the calling thread and should
+        return quickly (e.g. by handing the call over to a worker).
+
+        With a response format, reading stops as soon as the reply holds a
+        whole JSON object.
+        """
+        if on_tool_call is None:
+            raise ValueError("on_tool_call must not be None")
+
+        new_messages = self._normalise_messages(message)
+
+        conversation: List[ChatMessage] = list(self.history) + new_messages
+        self._trim_conversation(conversation)
 
+        completion = self._stream_completion(conversation, on_tool_call)
+
+        self._update_history(new_messages, completion)
         return completion
 
     # ------------------------------------------------------------------ #
@@ -159,10 +316,89 @@ class Agent:
         self._trim_conversation(conversation)
         return self._chat_completion(conversation)
 
+    # --------------------- asynchronous chat API ---------------------- #
+    async def achat(
+        self, message: str | ChatMessage | Sequence[ChatMessage]
+    ) -> ChatCompletion:
+        """
+        Awaitable version of :meth:`chat`.
+
+        With the default transport, requests go through the HTTP connection
+        pool shared by all agents (see :attr:`OpenAITransport.POOL_SIZE`). As
+        with :meth:`chat`, the history of one agent must not be updated by
+        concurrent calls.
+        """
+        new_messages = self._normalise_messages(message)
+
+        conversation: List[ChatMessage] = list(self.history) + new_messages
+        self._trim_conversation(conversation)
+
+        completion = await self._achat_completion(conversation)
+
+        self._update_history(new_messages, completion)
+        return completion
+
+    async def achat_stream(
+        self,
+        message: str | ChatMessage | Sequence[ChatMessage],
+        on_tool_call: Callable[[ToolCall], None],
+    ) -> ChatCompletion:
+        """
+        Awaitable version of :meth:`chat_stream`; *on_tool_call* runs in the
+        event loop and must not block (e.g. it can schedule a task).
+        """
+        if on_tool_call is None:
+            raise ValueError("on_tool_call must not be None")
+
+        new_messages = self._normalise_messages(message)
+
+        conversation: List[ChatMessage] = list(self.history) + new_messages
+        self._trim_conversation(conversation)
+
+        completion = await self._astream_completion(conversation, on_tool_call)
+
+        self._update_history(new_messages, completion)
+        return completion
+
+    async def acomplete(self, prompt: str | ChatMessage) -> ChatCompletion:
+        """Awaitable version of :meth:`complete`."""
+        single = ChatMessage(prompt) if isinstance(prompt, str) else prompt
+        conversation = [single]
+        self._trim_conversation(conversation)
+        return await self._achat_completion(conversation)
+
+    @staticmethod
+    async def aclose_client() -> None:
+        """Close the HTTP connection pool shared by asynchronous calls."""
+        await OpenAITransport.aclose_session()
+
     # -------------------------- internals ----------------------------- #
-    # Trim conversation to honour limits and add personality ~~~~~~~~~~~ #
+    # Chat helpers ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+    @staticmethod
+    def _normalise_messages(
+        message: str | ChatMessage | Sequence[ChatMessage],
+    ) -> List[ChatMessage]:
+        if isinstance(message, str):
+            return [ChatMessage(message)]
+        if isinstance(message, ChatMessage):
+            return [message]
+        return list(message)
+
+    def _update_history(
+        self, new_messages: Sequence[ChatMessage], completion: ChatCompletion
+    ) -> None:
+        """Append the exchange to history, respecting max_history_length."""
+        self.history.extend(new_messages)
+        self.history.append(completion.message)
+        if len(self.history) > self.max_history_length:
+            del self.history[: len(self.history) - self.max_history_length]
+
+    # Trim conversation to honour limits ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
     def _trim_conversation(self, messages: List[ChatMessage]) -> None:
-        """Mutate *messages* so it respects configured limits."""
+        """
+        Mutate *messages* so it respects configured limits. The personality
+        is not part of it: it is added by :meth:`_create_request`.
+        """
         # Remove leading tool-results without matching calls
         while messages and messages[0].has_tool_call_results():
             messages.pop(0)
@@ -174,9 +410,62 @@ class Agent:
         if not messages:
             raise ValueError("No messages left in conversation after trimming")
 
-        # Inject personality (developer role) as first message
+        if self.max_prompt_tokens is not None:
+            self._enforce_token_budget(messages)
+
+    # Token budget ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+    def _enforce_token_budget(self, messages: List[ChatMessage]) -> None:
+        """
+        Drop the oldest *messages* until the prompt fits :pyattr:`max_prompt_tokens`;
+        fail before calling the model if even the last message does not fit.
+        """
+        budget = self.max_prompt_tokens - self.count_fixed_tokens()
+        used = [self.count_message_tokens(m) for m in messages]
+
+        while len(messages) > 1 and sum(used) > budget:
+            messages.pop(0)
+            used.pop(0)
+            # Never start with tool results whose call was dropped
+            while len(messages) > 1 and messages[0].has_tool_call_results():
+                messages.pop(0)
+                used.pop(0)
+
+        if sum(used) > budget:
+            raise ValueError(
+                f"Prompt for {self.id} needs {sum(used) + self.count_fixed_tokens()} tokens, "
+                f"over its budget of {self.max_prompt_tokens} tokens"
+            )
+
+    def count_tokens(self, text: str) -> int:
+        """Number of tokens of *text* for this agent's model."""
+        return tokens.count_tokens(text, self.model)
+
+    def count_fixed_tokens(self) -> int:
+        """Tokens sent with every request: personality and tool definitions."""
+        n = 0
         if self.personality:
-            messages.insert(0, ChatMessage(self.personality, ChatMessage.Author.DEVELOPER))
+            n += self.count_tokens(self.personality) + tokens.TOKENS_PER_MESSAGE
+        n += self._count_tool_tokens()
+        return n
+
+    def _count_tool_tokens(self) -> int:
+        if self._tool_tokens is None or self._tool_tokens[0] != self.model:
+            self._create_tool_definitions()
+            text = self._tool_definitions_json
+            self._tool_tokens = (self.model, self.count_tokens(text) if text else 0)
+        return self._tool_tokens[1]
+
+    def count_message_tokens(self, msg: ChatMessage) -> int:
+        n = tokens.TOKENS_PER_MESSAGE
+        for part in msg.parts:
+            if isinstance(part, ToolCall):
+                n += self.count_tokens(part.tool.id)
+                n += self.count_tokens(json.dumps(part.arguments, separators=(",", ":")))
+            elif isinstance(part, ToolCallResult):
+                n += self.count_tokens(part.result or "")
+            else:
+                n += self.count_tokens(part.get_content())
+        return n
 
     # Convert ChatMessage → OpenAI message dict ~~~~~~~~~~~~~~~~~~~~~~~~ #
     def _from_chat_message(self, msg: ChatMessage) -> List[Dict[str, Any]]:
@@ -219,21 +508,8 @@ class Agent:
     # Convert OpenAI message → ChatMessage ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
     def _from_openai_message(self, message: Mapping[str, Any]) -> ChatMessage:
         if "tool_calls" in message:
-            calls: List[ToolCall] = []
-            for tc in message["tool_calls"]:
-                tool_id = tc["function"]["name"]
-                tool = self._tool_map.get(tool_id)
-                if tool is None:
-                    raise ValueError(f"No tool registered with id '{tool_id}'")
-
-                calls.append(
-                    ToolCall(
-                        id_=tc["id"],
-                        tool=tool,
-                        arguments=json.loads(tc["function"]["arguments"]),
-                    )
-                )
-            return ChatMessage(ChatMessage.Author.BOT, calls)
+            calls = [self._to_tool_call(tc) for tc in message["tool_calls"]]
+            return ChatMessage(calls, ChatMessage.Author.BOT)
 
         parts: List[TextPart] = []
         if content := message.get("content"):
@@ -241,23 +517,33 @@ class Agent:
         if message.get("role") == "assistant" and message.get("content") is None:
             parts.append(TextPart("**The model generated an empty response**"))
 
-        return ChatMessage(ChatMessage.Author.BOT, parts)
+        return ChatMessage(parts, ChatMessage.Author.BOT)
+
+    def _to_tool_call(self, tc: Mapping[str, Any]) -> ToolCall:
+        tool_id = tc["function"]["name"]
+        tool = self._tool_map.get(tool_id)
+        if tool is None:
+            raise ValueError(f"No tool registered with id '{tool_id}'")
+        return ToolCall(id_=tc["id"], tool=tool, arguments=json.loads(tc["function"]["arguments"]))
 
     # Prepare response_format / tools for OpenAI call ~~~~~~~~~~~~~~~~~~ #
+    # Both are built once and shared by all requests: they must not be modified.
     def _create_response_format(self) -> Dict[str, Any] | None:
-        if self._response_format is None:
-            return None
-        return {
-            "type": "json_object",
-            "schema": json.loads(self._response_format),
-        }
+        schema, payload = self._response_format_payload
+        if schema is not self._response_format:
+            payload = (
+                None
+                if self._response_format is None
+                else {"type": "json_object", "schema": json.loads(self._response_format)}
+            )
+            self._response_format_payload = (self._response_format, payload)
+        return payload
 
     def _create_tool_definitions(self) -> List[Dict[str, Any]] | None:
         if not self._tool_map:
             return None
-        tools = []
-        for t in self._tool_map.values():
-            tools.append(
+        if self._tool_definitions is None:
+            self._tool_definitions = [
                 {
                     "type": "function",
                     "function": {
@@ -266,34 +552,274 @@ class Agent:
                         "parameters": json.loads(t.json_parameters),
                     },
                 }
-            )
-        return tools
+                for t in self._tool_map.values()
+            ]
+            self._tool_definitions_json = json.dumps(self._tool_definitions, separators=(",", ":"))
+        return self._tool_definitions
 
     # Core: call OpenAI and wrap result ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
     def _chat_completion(self, messages: Sequence[ChatMessage]) -> ChatCompletion:
-        openai_messages: List[Dict[str, Any]] = []
-        for m in messages:
-            openai_messages.extend(self._from_chat_message(m))
+        with timing.timed(timing.SERIALISATION):
+            req = self._create_request(messages)
 
-        req: Dict[str, Any] = {
-            "model": self.model,
-            "messages": openai_messages,
-            "temperature": self.temperature,
-        }
+        key = self._cache_key(req)
+        if key is not None and (payload := self.response_cache.get(key)) is not None:
+            return self._from_payload(payload)
 
-        if (rf := self._create_response_format()) is not None:
-            req["response_format"] = rf
+        logger.debug("OpenAI request: %s", log_config.lazy_json(req), extra=log_config.PAYLOAD)
+
+        payload = self._get_retry_policy().call(self.model, lambda timeout: self._send(req, timeout))
+        return self._to_chat_completion(payload, key)
+
+    async def _achat_completion(self, messages: Sequence[ChatMessage]) -> ChatCompletion:
+        with timing.timed(timing.SERIALISATION):
+            req = self._create_request(messages)
+
+        key = self._cache_key(req)
+        if key is not None and (payload := self.response_cache.get(key)) is not None:
+            return self._from_payload(payload)
+
+        logger.debug("OpenAI request: %s", log_config.lazy_json(req), extra=log_config.PAYLOAD)
+
+        payload = await self._get_retry_policy().acall(
+            self.model, lambda timeout: self._asend(req, timeout)
+        )
+        return self._to_chat_completion(payload, key)
+
+    def _send(self, req: Mapping[str, Any], timeout: float | None) -> Dict[str, Any]:
+        """
+        One attempt at *req*; retries and hedged requests each go through the
+        rate limiter and take a call from the run budget.
+        """
+        timeout = self._start_call(timeout)
+        limiter, reserved = self._get_rate_limiter(), self._estimate_tokens(req)
+        limiter.acquire(self.model, reserved, self.priority)
+        with timing.timed(timing.LLM):
+            payload = self._get_transport().create(req, timeout)
+        self._settle(limiter, reserved, payload)
+        return payload
+
+    async def _asend(self, req: Mapping[str, Any], timeout: float | None) -> Dict[str, Any]:
+        timeout = self._start_call(timeout)
+        limiter, reserved = self._get_rate_limiter(), self._estimate_tokens(req)
+        await limiter.aacquire(self.model, reserved, self.priority)
+        payload = await self._get_transport().acreate(req, timeout)
+        self._settle(limiter, reserved, payload)
+        return payload
+
+    # Streaming ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+    def _stream_completion(
+        self, messages: Sequence[ChatMessage], on_tool_call: Callable[[ToolCall], None]
+    ) -> ChatCompletion:
+        with timing.timed(timing.SERIALISATION):
+            req = self._create_request(messages)
+
+        key = self._cache_key(req)
+        if key is not None and (payload := self.response_cache.get(key)) is not None:
+            completion = self._from_payload(payload)
+            for call in completion.message.get_tool_calls():
+                on_tool_call(call)
+            return completion
+
+        logger.debug("OpenAI request: %s", log_config.lazy_json(req), extra=log_config.PAYLOAD)
+
+        # Tool calls may already be running when a stream breaks: no hedging
+        payload = self._get_retry_policy().call(
+            self.model, lambda timeout: self._send_stream(req, timeout, on_tool_call), hedge=False
+        )
+        return self._to_chat_completion(payload, key)
+
+    async def _astream_completion(
+        self, messages: Sequence[ChatMessage], on_tool_call: Callable[[ToolCall], None]
+    ) -> ChatCompletion:
+        with timing.timed(timing.SERIALISATION):
+            req = self._create_request(messages)
+
+        key = self._cache_key(req)
+        if key is not None and (payload := self.response_cache.get(key)) is not None:
+            completion = self._from_payload(payload)
+            for call in completion.message.get_tool_calls():
+                on_tool_call(call)
+            return completion
+
+        logger.debug("OpenAI request: %s", log_config.lazy_json(req), extra=log_config.PAYLOAD)
+
+        payload = await self._get_retry_policy().acall(
+            self.model,
+            lambda timeout: self._asend_stream(req, timeout, on_tool_call),
+            hedge=False,
+        )
+        return self._to_chat_completion(payload, key)
+
+    def _send_stream(
+        self,
+        req: Mapping[str, Any],
+        timeout: float | None,
+        on_tool_call: Callable[[ToolCall], None],
+    ) -> Dict[str, Any]:
+        """One streamed attempt at *req*; see :meth:`chat_stream`."""
+        timeout = self._start_call(timeout)
+        limiter, reserved = self._get_rate_limiter(), self._estimate_tokens(req)
+        limiter.acquire(self.model, reserved, self.priority)
+
+        streamed = StreamedPayload()
+        dispatched = 0
+        try:
+            with timing.timed(timing.LLM):
+                chunks = self._get_transport().stream(req, timeout)
+                try:
+                    for chunk in chunks:
+                        for i in streamed.add(chunk):
+                            on_tool_call(self._to_tool_call(streamed.tool_call(i)))
+                            dispatched += 1
+                        if self._response_format is not None and streamed.json_complete:
+                            break
+                finally:
+                    chunks.close()
+        except Exception as exc:
+            if dispatched:  # must not be dispatched again by a retry
+                raise RuntimeError(
+                    f"Stream from {self.model} broke after {dispatched} tool call(s) "
+                    f"had been dispatched: {exc}"
+                ) from exc
+            raise
+
+        for i in streamed.finish():
+            on_tool_call(self._to_tool_call(streamed.tool_call(i)))
+        payload = streamed.payload()
+        self._settle(limiter, reserved, payload)
+        return payload
+
+    async def _asend_stream(
+        self,
+        req: Mapping[str, Any],
+        timeout: float | None,
+        on_tool_call: Callable[[ToolCall], None],
+    ) -> Dict[str, Any]:
+        timeout = self._start_call(timeout)
+        limiter, reserved = self._get_rate_limiter(), self._estimate_tokens(req)
+        await limiter.aacquire(self.model, reserved, self.priority)
+
+        streamed = StreamedPayload()
+        dispatched = 0
+        try:
+            chunks = self._get_transport().astream(req, timeout)
+            try:
+                async for chunk in chunks:
+                    for i in streamed.add(chunk):
+                        on_tool_call(self._to_tool_call(streamed.tool_call(i)))
+                        dispatched += 1
+                    if self._response_format is not None and streamed.json_complete:
+                        break
+            finally:
+                await chunks.aclose()
+        except Exception as exc:
+            if dispatched:  # must not be dispatched again by a retry
+                raise RuntimeError(
+                    f"Stream from {self.model} broke after {dispatched} tool call(s) "
+                    f"had been dispatched: {exc}"
+                ) from exc
+            raise
+
+        for i in streamed.finish():
+            on_tool_call(self._to_tool_call(streamed.tool_call(i)))
+        payload = streamed.payload()
+        self._settle(limiter, reserved, payload)
+        return payload
+
+    def _get_transport(self) -> LlmTransport:
+        return self.transport or Agent.default_transport or Agent._openai_transport
+
+    def _get_retry_policy(self) -> RetryPolicy:
+        return self.retry_policy or Agent.default_retry_policy
+
+    # Rate limits ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+    @staticmethod
+    def _get_rate_limiter() -> RateLimiter:
+        return Agent.rate_limiter or RateLimiter.get_instance()
+
+    def _estimate_tokens(self, req: Mapping[str, Any]) -> int:
+        """Cheap estimate of the prompt tokens of *req*, reserved before sending it."""
+        chars = 0
+        for m in req["messages"]:
+            chars += len(m.get("content") or "")
+            for tc in m.get("tool_calls") or ():
+                chars += len(tc["function"]["arguments"])
+        n = -(-chars // tokens.CHARS_PER_TOKEN) + tokens.TOKENS_PER_MESSAGE * len(req["messages"])
+        if "tools" in req:
+            n += self._count_tool_tokens()
+        return n
+
+    def _start_call(self, timeout: float | None) -> float | None:
+        """Take the request from the run budget, if any; return its timeout cut to the deadline."""
+        if self.run_budget is None:
+            return timeout
+        return self.run_budget.start_llm_call(timeout)
+
+    def _settle(self, limiter: RateLimiter, reserved: int, payload: Mapping[str, Any]) -> None:
+        """Correct the rate-limit reservation, and charge the run budget, with the actual usage."""
+        usage = payload.get("usage")
+        used = reserved
+        if usage:
+            used = usage.get("total_tokens") or (
+                (usage.get("prompt_tokens") or 0) + (usage.get("completion_tokens") or 0)
+            )
+            limiter.settle(self.model, reserved, used)
+        if self.run_budget is not None:
+            self.run_budget.add_tokens(used)
+
+    def _create_request(self, messages: Sequence[ChatMessage]) -> Dict[str, Any]:
+        """
+        Request body for *messages*: the static parts (tool definitions,
+        response format and the personality at the head of the messages)
+        come first and are identical across the calls made for one command.
+        """
+        req: Dict[str, Any] = {"model": self.model, "temperature": self.temperature}
         if (td := self._create_tool_definitions()) is not None:
             req["tools"] = td
+        if (rf := self._create_response_format()) is not None:
+            req["response_format"] = rf
+        if self.prompt_cache_key is not None:
+            req["prompt_cache_key"] = self.prompt_cache_key
 
-        logger.info("OpenAI request: %s", req)
+        openai_messages: List[Dict[str, Any]] = list(self._prompt_prefix())
+        for m in messages:
+            openai_messages.extend(self._from_chat_message(m))
+        req["messages"] = openai_messages
+        return req
+
+    def _prompt_prefix(self) -> List[Dict[str, Any]]:
+        """Messages sent before the conversation: the personality, as system message."""
+        personality, prefix = self._prefix
+        if personality != self.personality:
+            prefix = (
+                self._from_chat_message(ChatMessage(self.personality, ChatMessage.Author.DEVELOPER))
+                if self.personality
+                else []
+            )
+            self._prefix = (self.personality, prefix)
+        return prefix
+
+    def _to_chat_completion(
+        self, payload: Mapping[str, Any], cache_key: str | None = None
+    ) -> ChatCompletion:
+        completion = self._from_payload(payload)
+        if (usage := payload.get("usage")) is not None:
+            self._record_usage(usage)
+
+        # Only complete answers are worth replaying
+        if cache_key is not None and completion.finish_reason == ChatCompletion.FinishReason.COMPLETED:
+            self.response_cache.put(cache_key, payload)
+        return completion
 
-        resp = openai.ChatCompletion.create(**req)
-        choice = resp.choices[0]
-        finish_reason = self._map_finish_reason(choice.finish_reason)
+    def _from_payload(self, payload: Mapping[str, Any]) -> ChatCompletion:
+        """Build a reply from a transport payload; tool calls are bound to this agent's tools."""
+        finish_reason = self._map_finish_reason(payload["finish_reason"])
+        return ChatCompletion(finish_reason, self._from_openai_message(payload["message"]))
 
-        chat_message = self._from_openai_message(choice.message)
-        return ChatCompletion(finish_reason, chat_message)
+    # Response cache ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+    def _cache_key(self, req: Mapping[str, Any]) -> str | None:
+        return None if self.response_cache is None else self.response_cache.key_for(req)
 
     # Finish-reason mapping ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
     @staticmethod
@@ -312,8 +838,11 @@ class Agent:
     def fill_slots(template: str, slots: Mapping[str, Any]) -> str:  
         """
         Replace every ``{{key}}`` in *template* with the corresponding value
-        from *slots*. Unknown keys are left untouched; *None* is replaced by
-        the empty string.
+        from *slots*. Unknown keys and *None* are replaced by the empty string.
+
+        Templates are compiled once (see :class:`PromptTemplate`); callers
+        rendering the same large template repeatedly should keep a
+        :meth:`PromptTemplate.bind` version with the static slots filled.
 
         Parameters
         ----------
@@ -332,12 +861,7 @@ class Agent:
         if slots is None:
             raise ValueError("slots must not be None")
 
-        def _sub(match: re.Match[str]) -> str:
-            key = match.group(1).strip()
-            value = slots.get(key)
-            return "" if value is None else str(value)
-
-        return re.sub(r"\{\{([^}]+)\}\}", _sub, template)
+        return PromptTemplate.compile(template).render(slots)
         
     # --------------------------- teardown ----------------------------- #
     def close(self) -> None:
@@ -4,16 +4,25 @@ Python translation of `com.infosys.small.pnbc.Api` – revised.
 
 A single `invoke(...)` method now handles both normal and logged calls by means
 of an optional `log` keyword-only flag.
+
+APIs returning lists can mix :class:`Api.PageParameters` into their parameters
+and build their result with :meth:`Api.page`, to support paging and field
+projection.
 """
 
 from __future__ import annotations
 
+import json
 import logging
-from typing import Any, Mapping, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from pydantic import BaseModel, Field
 
 from chat_types import ToolCall, ToolCallResult
 from execution_context import ExecutionContext
+from json_schema import JsonSchema
 from executor_module import ExecutorModule
+import log_config
 from scenario_component import ScenarioComponent
 from tool import AbstractTool
 
@@ -23,16 +32,44 @@ if TYPE_CHECKING:
 # --------------------------------------------------------------------------- #
 # Logging
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
 class Api(AbstractTool):
     """Abstract tool representing a simulated backend API."""
 
+    # Page size used by :meth:`page` when the caller does not provide a limit;
+    # None returns all remaining items.
+    default_page_size: int | None = None
+
+    class PageParameters(BaseModel):
+        """Paging and projection parameters shared by APIs returning lists."""
+
+        limit: Optional[int] = Field(
+            None,
+            alias="limit",
+            description="If provided, at most this many items are returned.",
+        )
+        cursor: Optional[str] = Field(
+            None,
+            alias="cursor",
+            description=(
+                "To get the next page of results, pass the nextCursor value returned "
+                "by the previous call."
+            ),
+        )
+        fields: Optional[List[str]] = Field(
+            None,
+            alias="fields",
+            description=(
+                "If provided, only these fields (JSON names, e.g. \"Customer Number\") "
+                "are returned for each item."
+            ),
+        )
+
+        model_config = {"populate_by_name": True}
+
     # --------------------------- construction --------------------------- #
     def __init__(self, id_: str, description: str, schema: type) -> None:
         if id_ is None:
@@ -75,6 +112,89 @@ class Api(AbstractTool):
             raise RuntimeError("Execution context is not set.")
         return ctx.run_id
 
+    # ------------------------------ paging ----------------------------- #
+    def page(
+        self,
+        items: Sequence[Any],
+        args: Mapping[str, Any],
+        to_dict: Callable[[Any], Dict[str, Any]] | None = None,
+        total: int | None = None,
+    ) -> str:
+        """
+        Return the page of *items* selected by the ``limit``, ``cursor`` and
+        ``fields`` entries of *args* (see :class:`PageParameters`), as JSON.
+
+        When a page is requested, the result is an envelope
+        ``{"total": <items matched>, "items": [...], "nextCursor": "..."}``
+        (``nextCursor`` only if more items follow); otherwise it is the plain
+        JSON array of all *items*, as before paging existed.
+
+        Parameters
+        ----------
+        items : Sequence[Any]
+            All matching items, in the order they are returned.
+        args : Mapping[str, Any]
+            Call arguments.
+        to_dict : Callable | None
+            Turns an item into its JSON object; by default Pydantic models are
+            dumped by alias without None values, and other items used as they are.
+        total : int | None
+            Number of matching items, when *items* holds only the first ones
+            (at least up to the end of the page, see :meth:`page_window`);
+            ``len(items)`` by default.
+        """
+        if items is None:
+            raise ValueError("items must not be None")
+        models = to_dict is None and bool(items) and isinstance(items[0], BaseModel)
+        if to_dict is None:
+            to_dict = _to_dict
+
+        offset, limit = self.page_window(args)
+        cursor = self.get_string("cursor", args, None)
+        fields = args.get("fields") or None
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(",") if f.strip()]
+
+        if limit is None and not cursor and not fields:
+            if models:
+                return JsonSchema.serialize_many(items, by_alias=True)
+            return json.dumps(
+                [to_dict(i) for i in items], ensure_ascii=False, separators=(",", ":")
+            )
+
+        if total is None:
+            total = len(items)
+        end = total if limit is None else min(offset + limit, total)
+        rows = [to_dict(i) for i in items[offset:end]]
+        if fields:
+            rows = [{f: r[f] for f in fields if f in r} for r in rows]
+
+        envelope: Dict[str, Any] = {"total": total, "items": rows}
+        if end < total:
+            envelope["nextCursor"] = str(end)
+        return json.dumps(envelope, ensure_ascii=False, separators=(",", ":"))
+
+    def page_window(self, args: Mapping[str, Any]) -> Tuple[int, int | None]:
+        """
+        (offset, page size) of the page :meth:`page` returns for *args*; a
+        page size of None means all remaining items. APIs can use it to fetch
+        only the first ``offset + page size`` items.
+        """
+        limit = self.default_page_size
+        if args.get("limit") is not None:
+            limit = self.get_long("limit", args)
+            if limit < 0:
+                raise ValueError("limit must not be negative")
+
+        cursor = self.get_string("cursor", args, None)
+        try:
+            offset = int(cursor) if cursor else 0
+        except ValueError as exc:
+            raise ValueError(f'Invalid cursor "{cursor}".') from exc
+        if offset < 0:
+            raise ValueError(f'Invalid cursor "{cursor}".')
+        return offset, limit
+
     # ------------------------------ invoke ----------------------------- #
     def invoke(self, call: ToolCall, *, log: bool = False) -> ToolCallResult:  # noqa: D401
         """
@@ -106,3 +226,9 @@ class Api(AbstractTool):
         # Retrieve canned result
         result = ScenarioComponent.get_instance().get(scenario_id, self.id, args)
         return ToolCallResult.from_call(call, result)
+
+
+def _to_dict(item: Any) -> Dict[str, Any]:
+    if isinstance(item, BaseModel):
+        return item.model_dump(exclude_none=True, by_alias=True)
+    return item
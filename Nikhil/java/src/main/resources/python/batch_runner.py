@@ -0,0 +1,372 @@
+"""batch_runner.py
+
+Batch execution of Orchestrator runs (Python counterpart of the run loop of
+the Java ``TestMaster``; grading of the runs against success criteria is not
+ported).
+
+Every scenario is run ``--runs`` times; each run gets its own
+:class:`Orchestrator` and :class:`ExecutionContext`. Runs are spread over a
+pool of worker processes (default) or of asyncio workers in this process, at
+most ``--concurrency`` at a time, so that the LLM rate limit is respected.
+
+As soon as a run finishes, one JSON line is appended to the results file with
+its final Step and ``log_entries`` (see :class:`RunResult`), so partial
+results survive an interrupted batch. With ``--db``, the steps and log
+entries of every run are also persisted, while it executes, in a SQLite
+database (see :class:`persistence.SqliteDbConnector`). With ``--max-seconds``,
+``--max-llm-calls``, ``--max-tokens`` or ``--max-steps``, every run gets a
+:class:`run_budget.RunBudget` with those limits, shared by all its agents.
+
+Usage
+-----
+::
+
+    python batch_runner.py --scenarios scenario-01,scenario-03 --runs 20 \\
+        --concurrency 8 --output results.jsonl --db runs.sqlite \\
+        --max-seconds 900 --max-llm-calls 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, IO, List, Sequence, Tuple
+
+from execution_context import ExecutionContext
+from orchestrator import Orchestrator
+from persistence import SqliteDbConnector
+from run_budget import RunBudget
+from steps import Step, ToolCallStep
+
+logger = logging.getLogger(__name__)
+
+# Scenarios to use when none is given (same as the Java TestMaster)
+DEFAULT_SCENARIOS: Tuple[str, ...] = (
+    "scenario-01",
+    "scenario-02a",
+    "scenario-02b",
+    "scenario-03",
+    "scenario-05",
+)
+
+# Max number of runs executing at the same time
+DEFAULT_CONCURRENCY: int = 15
+
+PROCESS_MODE = "process"
+ASYNC_MODE = "async"
+
+
+def _open_db(db_path: Path | None) -> ExecutionContext.DbConnector:
+    if db_path is None:
+        return ExecutionContext.NullDbConnector()
+    return SqliteDbConnector(db_path)
+
+
+@dataclass
+class RunResult:
+    """Outcome of one Orchestrator run, as written to the results file."""
+
+    scenario_id: str
+    run_id: str
+    model: str = "-"
+    status: str | None = None
+    orchestrator_steps: int = 0
+    total_steps: int = 0
+    seconds: float = 0.0
+    final_step: Dict[str, Any] | None = None
+    log_entries: List[Dict[str, Any]] = field(default_factory=list)
+    error: str | None = None
+    # Run budget consumption (when the run had one)
+    llm_calls: int | None = None
+    tokens: int | None = None
+
+
+# --------------------------------------------------------------------------- #
+# Single run
+# --------------------------------------------------------------------------- #
+def run_ids(scenario_ids: Sequence[str], runs: int) -> List[Tuple[str, str]]:
+    """(scenario id, run id) of every run in the batch, e.g. ``scenario-01-0003``."""
+    if runs < 1:
+        raise ValueError("runs must be positive")
+    return [(s, f"{s}-{i:04d}") for s in scenario_ids for i in range(1, runs + 1)]
+
+
+def count_nested_steps(steps: Sequence[Step]) -> int:
+    """Number of tool calls in *steps*, including those made by nested agents."""
+    tot = 0
+    for s in steps:
+        if isinstance(s, ToolCallStep):
+            tot += count_nested_steps(s.action_steps) + 1
+    return tot
+
+
+def _new_context(
+    db: ExecutionContext.DbConnector,
+    scenario_id: str,
+    run_id: str,
+    limits: RunBudget.Limits | None,
+) -> ExecutionContext:
+    ctx = ExecutionContext(db, scenario_id, run_id)
+    if limits is not None:
+        ctx.budget = RunBudget(limits)
+    return ctx
+
+
+def _to_result(
+    scenario_id: str,
+    run_id: str,
+    agent: Orchestrator,
+    ctx: ExecutionContext,
+    step: Step,
+    seconds: float,
+) -> RunResult:
+    budget = ctx.budget
+    return RunResult(
+        scenario_id=scenario_id,
+        run_id=run_id,
+        model=agent.model,
+        status=step.status.value if step.status else None,
+        orchestrator_steps=len(agent.steps),
+        total_steps=count_nested_steps(agent.steps),
+        seconds=seconds,
+        final_step=step.model_dump(mode="json", exclude_none=True, serialize_as_any=True),
+        log_entries=[asdict(e) for e in ctx.log_entries],
+        llm_calls=budget.llm_calls if budget is not None else None,
+        tokens=budget.tokens if budget is not None else None,
+    )
+
+
+def execute_run(
+    scenario_id: str,
+    run_id: str,
+    db_path: Path | None = None,
+    limits: RunBudget.Limits | None = None,
+) -> RunResult:
+    """
+    Execute one run; errors are reported in the result rather than raised.
+    If *db_path* is given, steps and log entries are persisted there; if
+    *limits* are given, the run stops when it reaches any of them.
+    """
+    start = time.perf_counter()
+    agent = None
+    db = _open_db(db_path)
+    try:
+        agent = Orchestrator()
+        ctx = _new_context(db, scenario_id, run_id, limits)
+        step = agent.execute(ctx)
+        return _to_result(scenario_id, run_id, agent, ctx, step, time.perf_counter() - start)
+    except Exception as e:  # noqa: BLE001
+        logger.error("Run %s failed: %s", run_id, e, exc_info=True)
+        return RunResult(
+            scenario_id,
+            run_id,
+            model=agent.model if agent else "-",
+            seconds=time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+    finally:
+        if agent is not None:
+            agent.close()
+        db.close()
+
+
+async def aexecute_run(
+    scenario_id: str,
+    run_id: str,
+    db_path: Path | None = None,
+    limits: RunBudget.Limits | None = None,
+) -> RunResult:
+    """Awaitable version of :func:`execute_run`."""
+    start = time.perf_counter()
+    agent = None
+    db = _open_db(db_path)
+    try:
+        agent = Orchestrator()
+        ctx = _new_context(db, scenario_id, run_id, limits)
+        step = await agent.aexecute(ctx)
+        return _to_result(scenario_id, run_id, agent, ctx, step, time.perf_counter() - start)
+    except Exception as e:  # noqa: BLE001
+        logger.error("Run %s failed: %s", run_id, e, exc_info=True)
+        return RunResult(
+            scenario_id,
+            run_id,
+            model=agent.model if agent else "-",
+            seconds=time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+    finally:
+        if agent is not None:
+            agent.close()
+        db.close()
+
+
+# --------------------------------------------------------------------------- #
+# Batch
+# --------------------------------------------------------------------------- #
+def _write(out: IO[str], result: RunResult) -> None:
+    out.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+    out.flush()
+    logger.info(
+        "%s: %s (%.1fs)", result.run_id, result.error or result.status, result.seconds
+    )
+
+
+def run_batch(
+    scenario_ids: Sequence[str],
+    runs: int,
+    output: Path,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    mode: str = PROCESS_MODE,
+    db_path: Path | None = None,
+    limits: RunBudget.Limits | None = None,
+) -> List[RunResult]:
+    """
+    Run every scenario *runs* times, appending each result to *output* as it
+    completes.
+
+    Parameters
+    ----------
+    scenario_ids : Sequence[str]
+        Scenarios to run.
+    runs : int
+        Number of runs per scenario.
+    output : Path
+        JSONL results file (truncated).
+    concurrency : int
+        Max number of runs executing at the same time.
+    mode : str
+        ``"process"`` for a process pool, ``"async"`` for asyncio workers.
+    db_path : Path | None
+        SQLite database where the steps and log entries of every run are
+        persisted (appended to, if it exists).
+    limits : RunBudget.Limits | None
+        Limits of each run (wall-clock time, LLM calls, tokens, steps).
+
+    Returns
+    -------
+    List[RunResult]
+        Results, in completion order.
+    """
+    if not scenario_ids:
+        raise ValueError("scenario_ids must not be empty")
+    if concurrency < 1:
+        raise ValueError("concurrency must be positive")
+    if mode not in (PROCESS_MODE, ASYNC_MODE):
+        raise ValueError(f"mode must be '{PROCESS_MODE}' or '{ASYNC_MODE}'")
+
+    todo = run_ids(scenario_ids, runs)
+    concurrency = min(concurrency, len(todo))
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    with output.open("w", encoding="utf-8") as out:
+        if mode == PROCESS_MODE:
+            return _run_processes(todo, concurrency, out, db_path, limits)
+        return asyncio.run(_run_async(todo, concurrency, out, db_path, limits))
+
+
+def _run_processes(
+    todo: List[Tuple[str, str]],
+    concurrency: int,
+    out: IO[str],
+    db_path: Path | None,
+    limits: RunBudget.Limits | None,
+) -> List[RunResult]:
+    results: List[RunResult] = []
+    with ProcessPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(execute_run, s, r, db_path, limits): (s, r) for s, r in todo}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:  # noqa: BLE001  (e.g. a worker process died)
+                scenario_id, run_id = futures[future]
+                result = RunResult(scenario_id, run_id, error=f"{type(e).__name__}: {e}")
+            _write(out, result)
+            results.append(result)
+    return results
+
+
+async def _run_async(
+    todo: List[Tuple[str, str]],
+    concurrency: int,
+    out: IO[str],
+    db_path: Path | None,
+    limits: RunBudget.Limits | None,
+) -> List[RunResult]:
+    queue: asyncio.Queue[Tuple[str, str]] = asyncio.Queue()
+    for item in todo:
+        queue.put_nowait(item)
+
+    results: List[RunResult] = []
+
+    async def worker() -> None:
+        while True:
+            try:
+                scenario_id, run_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = await aexecute_run(scenario_id, run_id, db_path, limits)
+            _write(out, result)
+            results.append(result)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        await Orchestrator.aclose_client()
+    return results
+
+
+def format_summary(results: Sequence[RunResult]) -> str:
+    by_status: Dict[str, int] = {}
+    for r in results:
+        key = "ERROR" if r.error else str(r.status)
+        by_status[key] = by_status.get(key, 0) + 1
+    lines = [f"Runs: {len(results)}"]
+    lines += [f"  {k}: {v}" for k, v in sorted(by_status.items())]
+    return "\n".join(lines)
+
+
+# --------------------------------------------------------------------------- #
+# CLI
+# --------------------------------------------------------------------------- #
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run Orchestrator scenarios in batch.")
+    parser.add_argument("--scenarios", default=",".join(DEFAULT_SCENARIOS),
+                        help="comma-separated scenario ids")
+    parser.add_argument("--runs", type=int, default=3, help="runs per scenario")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="max runs executing at the same time")
+    parser.add_argument("--mode", choices=(PROCESS_MODE, ASYNC_MODE), default=PROCESS_MODE,
+                        help="worker processes or asyncio workers")
+    parser.add_argument("--output", type=Path,
+                        default=Path(f"batch-{int(time.time())}.jsonl"),
+                        help="JSONL results file")
+    parser.add_argument("--db", type=Path, default=None,
+                        help="SQLite database where steps and log entries are persisted")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="wall-clock limit of each run")
+    parser.add_argument("--max-llm-calls", type=int, default=None,
+                        help="max LLM calls of each run, nested agents included")
+    parser.add_argument("--max-tokens", type=int, default=None,
+                        help="max tokens of each run, nested agents included")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="max steps of each run, nested agents included")
+    args = parser.parse_args(argv)
+
+    limits = RunBudget.Limits(args.max_seconds, args.max_llm_calls, args.max_tokens,
+                              args.max_steps)
+    scenario_ids = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    results = run_batch(scenario_ids, args.runs, args.output, args.concurrency, args.mode,
+                        args.db, limits if limits != RunBudget.Limits() else None)
+    print(format_summary(results))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
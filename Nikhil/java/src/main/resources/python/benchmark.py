@@ -0,0 +1,250 @@
+"""benchmark.py
+
+Offline benchmark of the agent loop (executor, critic, tools, ScenarioComponent).
+
+Every selected agent is run once per scenario found in the scenario folder.
+LLM traffic goes through a record/replay transport (see ``llm_transport``):
+record cassettes once against OpenAI, then replay them without network to
+measure where time goes outside the model.
+
+Usage
+-----
+Record (needs OPENAI_API_KEY)::
+
+    python benchmark.py --record
+
+Replay, optionally simulating model latency::
+
+    python benchmark.py --latency 0.5 --json results.json
+
+For each run the report shows wall-clock time split into LLM time, tool time,
+serialisation time, ScenarioComponent lookups and the remaining Python
+overhead (also per step), plus the share of prompt tokens that the provider
+served from its prompt cache (as recorded). InspectBillTool is not benchmarked, as its command
+needs an attachment name that cannot be derived generically from a scenario.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from agent import Agent
+from customer_portal import CustomerPortal
+from execution_context import ExecutionContext
+from lab_agent import LabAgent
+from llm_transport import LlmTransport, OpenAITransport, RecordingTransport, ReplayTransport
+from operator_communication_tool import OperatorCommunicationTool
+from orchestrator import Orchestrator
+from peace import Peace
+from scenario_component import ScenarioComponent
+import timing
+from update_poa_tool import UpdatePoATool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCENARIO_FOLDER: Path = Path(__file__).resolve().parent.parent / "scenarios"
+
+
+# --------------------------------------------------------------------------- #
+# Benchmarked agents
+# --------------------------------------------------------------------------- #
+# name -> (factory, command); "{{estate}}" is replaced by the Customer Number of
+# the first unassigned task in the scenario. Orchestrator runs its own process.
+AGENTS: Dict[str, Tuple[Callable[[], LabAgent], str | None]] = {
+    "orchestrator": (Orchestrator, None),
+    "peace": (
+        Peace,
+        'List all unassigned payment tasks (Step Name="Handle Account 1") for Customer Number {{estate}}.',
+    ),
+    "customer_portal": (
+        CustomerPortal,
+        "List all bank accounts for customer with Customer Number {{estate}}.",
+    ),
+    "operator_communication": (
+        OperatorCommunicationTool,
+        "Tell the Operations Officer that processing of estate with Customer Number "
+        "{{estate}} has started.",
+    ),
+    "update_poa": (UpdatePoATool, UpdatePoATool.COMMAND),
+}
+
+
+@dataclass
+class BenchmarkResult:
+    scenario_file: str
+    scenario_id: str
+    agent: str
+    status: str
+    steps: int
+    llm_calls: int
+    wall: float
+    llm: float
+    tool: float
+    serialisation: float
+    scenario: float
+    overhead: float
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def overhead_per_step(self) -> float:
+        return self.overhead / self.steps if self.steps else 0.0
+
+
+# --------------------------------------------------------------------------- #
+# Runner
+# --------------------------------------------------------------------------- #
+def _estate_of(scenario_id: str) -> str:
+    """Customer Number of the first unassigned task in the scenario, if any."""
+    tasks = ScenarioComponent.get_instance().get(scenario_id, "getUnassignedTasks", {})
+    try:
+        return str(json.loads(tasks)[0]["Customer Number"])
+    except (ValueError, LookupError, TypeError):
+        return "UNKNOWN"
+
+
+def run_one(
+    scenario_file: str,
+    scenario_id: str,
+    agent_name: str,
+    transport: LlmTransport,
+) -> BenchmarkResult:
+    """Run one agent on one scenario through *transport*, collecting timings."""
+    factory, command = AGENTS[agent_name]
+
+    Agent.default_transport = transport
+    agent = factory()
+    ctx = ExecutionContext(ExecutionContext.NullDbConnector(), scenario_id, f"bench-{agent_name}-{scenario_id}")
+    if command is not None:
+        command = Agent.fill_slots(command, {"estate": _estate_of(scenario_id)})
+
+    Agent.reset_total_usage()
+    timings = timing.start_timing()
+    start = time.perf_counter()
+    try:
+        if command is None:
+            step = agent.execute(ctx)  # type: ignore[call-arg]
+        else:
+            step = agent.execute(ctx, command)
+    finally:
+        wall = time.perf_counter() - start
+        timing.stop_timing()
+        Agent.default_transport = None
+        agent.close()
+
+    usage = Agent.reset_total_usage()
+    spent = {c: timings.seconds.get(c, 0.0) for c in (
+        timing.LLM, timing.TOOL, timing.SERIALISATION, timing.SCENARIO
+    )}
+    return BenchmarkResult(
+        scenario_file=scenario_file,
+        scenario_id=scenario_id,
+        agent=agent_name,
+        status=str(step.status.value if step.status else None),
+        steps=len(agent.steps),
+        llm_calls=timings.counts.get(timing.LLM, 0),
+        wall=wall,
+        llm=spent[timing.LLM],
+        tool=spent[timing.TOOL],
+        serialisation=spent[timing.SERIALISATION],
+        scenario=spent[timing.SCENARIO],
+        overhead=wall - timings.total(),
+        prompt_tokens=usage.prompt_tokens,
+        cached_tokens=usage.cached_tokens,
+    )
+
+
+def run(
+    scenario_folder: Path,
+    cassette_folder: Path,
+    agent_names: Sequence[str],
+    record: bool = False,
+    latency: float = 0.0,
+) -> List[BenchmarkResult]:
+    ScenarioComponent.DEFAULT_FOLDER = scenario_folder
+    ScenarioComponent.reset_instance()
+
+    results: List[BenchmarkResult] = []
+    for file in sorted(scenario_folder.glob("*.json")):
+        with file.open(encoding="utf-8") as fh:
+            scenario_ids = [s["id"] for s in json.load(fh)]
+
+        for scenario_id in scenario_ids:
+            for name in agent_names:
+                cassette = cassette_folder / f"{scenario_id}__{name}.jsonl"
+                if record:
+                    transport: LlmTransport = RecordingTransport(OpenAITransport(), cassette)
+                elif cassette.is_file():
+                    transport = ReplayTransport(cassette, latency=latency)
+                else:
+                    logger.warning("No cassette %s, skipping", cassette)
+                    continue
+
+                try:
+                    results.append(run_one(file.name, scenario_id, name, transport))
+                finally:
+                    transport.close()
+    return results
+
+
+def format_report(results: Sequence[BenchmarkResult]) -> str:
+    header = (
+        f"{'scenario':<14}{'agent':<24}{'status':<12}{'steps':>6}{'calls':>6}"
+        f"{'wall':>9}{'llm':>9}{'tool':>9}{'ser.':>9}{'scen.':>9}{'ovh.':>9}{'ovh/step':>10}"
+        f"{'cached':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.scenario_id:<14}{r.agent:<24}{r.status:<12}{r.steps:>6}{r.llm_calls:>6}"
+            f"{r.wall:>9.3f}{r.llm:>9.3f}{r.tool:>9.3f}{r.serialisation:>9.3f}"
+            f"{r.scenario:>9.3f}{r.overhead:>9.3f}{r.overhead_per_step:>10.4f}"
+            f"{r.cached_tokens / r.prompt_tokens if r.prompt_tokens else 0.0:>8.0%}"
+        )
+    return "\n".join(lines)
+
+
+# --------------------------------------------------------------------------- #
+# CLI
+# --------------------------------------------------------------------------- #
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the agent loop.")
+    parser.add_argument("--scenarios", type=Path, default=DEFAULT_SCENARIO_FOLDER,
+                        help="folder with scenario_*.json files")
+    parser.add_argument("--cassettes", type=Path, default=None,
+                        help="folder for cassettes (default: <scenarios>/../cassettes)")
+    parser.add_argument("--agents", default=",".join(AGENTS),
+                        help=f"comma-separated agents to run, among: {', '.join(AGENTS)}")
+    parser.add_argument("--record", action="store_true",
+                        help="call OpenAI and record cassettes instead of replaying them")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="simulated seconds per LLM call when replaying")
+    parser.add_argument("--json", type=Path, default=None, help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    agent_names = [a.strip() for a in args.agents.split(",") if a.strip()]
+    unknown = [a for a in agent_names if a not in AGENTS]
+    if unknown:
+        parser.error(f"unknown agents: {', '.join(unknown)}")
+
+    cassettes = args.cassettes or args.scenarios.parent / "cassettes"
+    results = run(args.scenarios, cassettes, agent_names, record=args.record, latency=args.latency)
+
+    print(format_report(results))
+    if args.json is not None:
+        args.json.write_text(
+            json.dumps([dict(asdict(r), overhead_per_step=r.overhead_per_step) for r in results], indent=2),
+            encoding="utf-8",
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
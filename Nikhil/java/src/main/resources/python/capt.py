@@ -21,15 +21,13 @@ from scenario_component import ScenarioComponent
 from tool import AbstractTool
 
 # External dependency already ported in the project; do not provide fallbacks.
+import log_config
 from peace import Peace  # type: ignore  # Assume available as instructed
 
 # ------------------------------------------------------------------------------
 # Logging (equivalent to Java SimpleLogger)
 # ------------------------------------------------------------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
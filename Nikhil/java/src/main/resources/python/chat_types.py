@@ -31,6 +31,7 @@ from collections.abc import Sequence
 from typing import Any, Mapping, overload, Self, Type, TypeVar
 
 from json_schema import JsonSchema
+import log_config
 
 # Forward‑references to avoid circular imports at type‑checking time
 if False:  # pragma: no cover
@@ -41,10 +42,7 @@ if False:  # pragma: no cover
 # --------------------------------------------------------------------------- #
 # Logging configuration (equivalent to Java SimpleLogger)
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------------- #
@@ -0,0 +1,165 @@
+"""cow_collections.py
+
+Copy-on-write dict and list, used by :class:`ExecutionContext` so that
+:meth:`ExecutionContext.fork` is cheap: a fork shares its data with the
+original until either of them is modified, at which point only the modified
+one takes a (shallow) copy. Values are shared, never copied, so they must be
+treated as immutable: replace them instead of changing them in place (e.g.
+``UpdatePersonDataApi`` stores an updated copy of the person).
+
+Copying on write is done under a per-instance lock, together with the write
+itself, so that concurrent writers (e.g. :meth:`ExecutionContext.log` called by
+parallel tool calls) do not lose each other's changes; reads take no lock.
+Operations made of several calls (e.g. ``setdefault``) are not atomic.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    TypeVar,
+    overload,
+)
+
+K = TypeVar("K")
+V = TypeVar("V")
+T = TypeVar("T")
+
+
+class CowDict(MutableMapping[K, V]):
+    """Dict whose content is shared with its forks until it is written."""
+
+    __slots__ = ("_data", "_shared", "_lock")
+
+    def __init__(self, data: Optional[Mapping[K, V]] = None) -> None:
+        self._data: Dict[K, V] = dict(data) if data else {}
+        self._shared: bool = False
+        self._lock = threading.Lock()  # guards writes
+
+    def fork(self) -> "CowDict[K, V]":
+        """Return a copy that shares this dict's content until one of the two is written."""
+        child: CowDict[K, V] = CowDict.__new__(CowDict)
+        child._lock = threading.Lock()
+        with self._lock:
+            child._data = self._data
+            child._shared = self._shared = True
+        return child
+
+    def _own(self) -> Dict[K, V]:
+        # Called with the lock held
+        if self._shared:
+            self._data = dict(self._data)
+            self._shared = False
+        return self._data
+
+    def __getitem__(self, key: K) -> V:
+        return self._data[key]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        with self._lock:
+            self._own()[key] = value
+
+    def __delitem__(self, key: K) -> None:
+        with self._lock:
+            if key not in self._data:
+                raise KeyError(key)
+            del self._own()[key]
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: K, default=None):  # type: ignore[override]
+        return self._data.get(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data = {}
+            self._shared = False
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"CowDict({self._data!r})"
+
+
+class CowList(MutableSequence[T]):
+    """List whose content is shared with its forks until it is written."""
+
+    __slots__ = ("_data", "_shared", "_lock")
+
+    def __init__(self, data: Optional[Iterable[T]] = None) -> None:
+        self._data: List[T] = list(data) if data else []
+        self._shared: bool = False
+        self._lock = threading.Lock()  # guards writes
+
+    def fork(self) -> "CowList[T]":
+        """Return a copy that shares this list's content until one of the two is written."""
+        child: CowList[T] = CowList.__new__(CowList)
+        child._lock = threading.Lock()
+        with self._lock:
+            child._data = self._data
+            child._shared = self._shared = True
+        return child
+
+    def _own(self) -> List[T]:
+        # Called with the lock held
+        if self._shared:
+            self._data = list(self._data)
+            self._shared = False
+        return self._data
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index):
+        return self._data[index]
+
+    def __setitem__(self, index, value) -> None:
+        with self._lock:
+            self._own()[index] = value
+
+    def __delitem__(self, index) -> None:
+        with self._lock:
+            del self._own()[index]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._data)
+
+    def insert(self, index: int, value: T) -> None:
+        with self._lock:
+            self._own().insert(index, value)
+
+    def append(self, value: T) -> None:
+        with self._lock:
+            self._own().append(value)
+
+    def extend(self, values: Iterable[T]) -> None:
+        values = list(values)  # not under the lock: *values* may be this list
+        with self._lock:
+            self._own().extend(values)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data = []
+            self._shared = False
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"CowList({self._data!r})"
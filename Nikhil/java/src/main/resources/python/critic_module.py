@@ -1,11 +1,18 @@
 # critic_module.py
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import List, Mapping
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
 
 from agent import Agent
 from json_schema import JsonSchema
+import log_config
+from prompt_template import PromptTemplate
+from rate_limiter import RateLimiter
 from react_agent import ReactAgent
 from steps import Step, ToolCallStep
 from tool import Tool
@@ -13,10 +20,7 @@ from tool import Tool
 # --------------------------------------------------------------------------- #
 # Logging configuration (equivalent to Java SimpleLogger)
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -25,8 +29,26 @@ class CriticModule(Agent):
     Critic component of a `ReactAgent`.
 
     It reviews the executor’s actions and suggests improvements when necessary.
+
+    By default each review is a single LLM call; see :meth:`use_self_consistency`
+    to sample several answers concurrently and take a majority vote.
     """
 
+    # The original (Java) implementation sent every review prompt twice.
+    LEGACY_CALLS_PER_REVIEW: int = 2
+
+    @dataclass
+    class ReviewStats:
+        """Counters for the reviews performed during one executor run."""
+
+        reviews: int = 0
+        llm_calls: int = 0
+
+        @property
+        def saved_calls(self) -> int:
+            """LLM calls saved compared with the legacy double-call review."""
+            return self.reviews * CriticModule.LEGACY_CALLS_PER_REVIEW - self.llm_calls
+
     # --------------------------------------------------------------------- #
     # Prompt templates
     # --------------------------------------------------------------------- #
@@ -109,8 +131,41 @@ class CriticModule(Agent):
         self._agent: ReactAgent = agent
         self._tools: List[Tool] = list(tools)
 
+        # Review templates with the slots that do not change between reviews
+        # filled (see _get_review_template), and the tool descriptions
+        self._review_templates: Dict[str, Tuple[Tuple[str, ...], PromptTemplate]] = {}
+        self._tool_description: str | None = None
+        self._tool_description_key: Tuple[Tuple[str, str, str], ...] | None = None
+
         self.temperature = 0.0
         self.model = model
+        self.priority = RateLimiter.LOW  # reviews wait behind executor steps
+
+        # Number of answers sampled per review (1 == single-shot)
+        self.review_samples: int = 1
+        self.stats: CriticModule.ReviewStats = CriticModule.ReviewStats()
+
+    # ------------------------------------------------------------------ #
+    # Review strategy
+    # ------------------------------------------------------------------ #
+    def use_single_shot(self) -> None:
+        """One LLM call per review, at temperature 0 (default)."""
+        self.review_samples = 1
+        self.temperature = 0.0
+
+    def use_self_consistency(self, samples: int = 3, temperature: float = 0.7) -> None:
+        """
+        Sample *samples* answers concurrently for each review and return the
+        majority answer (see :meth:`_vote`).
+        """
+        if samples < 1:
+            raise ValueError("samples must be at least 1")
+        self.review_samples = samples
+        self.temperature = temperature
+
+    def reset_stats(self) -> None:
+        """Start counting for a new executor run."""
+        self.stats = CriticModule.ReviewStats()
 
     # ------------------------------------------------------------------ #
     # Read-only properties
@@ -131,33 +186,92 @@ class CriticModule(Agent):
         """Review the executor’s final conclusions."""
         return self._review(self._REVIEW_CONCLUSIONS_TEMPLATE, steps)
 
+    async def areview_tool_call(self, steps: List[Step]) -> str:
+        """Awaitable version of :meth:`review_tool_call`."""
+        return await self._areview(self._REVIEW_TOOL_CALL_TEMPLATE, steps)
+
+    async def areview_conclusions(self, steps: List[Step]) -> str:
+        """Awaitable version of :meth:`review_conclusions`."""
+        return await self._areview(self._REVIEW_CONCLUSIONS_TEMPLATE, steps)
+
     # ------------------------------------------------------------------ #
     # Internal logic
     # ------------------------------------------------------------------ #
     def _review(self, template: str, steps: List[Step]) -> str:
+        prompt = self._prepare_review(template, steps)
+
+        n = self.review_samples
+        if n <= 1:
+            answers = [self.complete(prompt).get_text()]
+        else:
+            with ThreadPoolExecutor(max_workers=n, thread_name_prefix=self.id) as pool:
+                answers = [c.get_text() for c in pool.map(self.complete, [prompt] * n)]
+
+        return self._conclude(answers)
+
+    async def _areview(self, template: str, steps: List[Step]) -> str:
+        prompt = self._prepare_review(template, steps)
+
+        completions = await asyncio.gather(
+            *(self.acomplete(prompt) for _ in range(max(1, self.review_samples)))
+        )
+        return self._conclude([c.get_text() for c in completions])
+
+    def _conclude(self, answers: List[str]) -> str:
+        self.stats.reviews += 1
+        self.stats.llm_calls += len(answers)
+
+        suggestion = self._vote(answers)
+        logger.debug("**** Suggestion: %s", suggestion)
+        return suggestion
+
+    @staticmethod
+    def _vote(answers: List[str]) -> str:
+        """
+        Majority vote between "CONTINUE" and "make a suggestion"; if the latter
+        wins, return the most frequent suggestion (first sampled on ties).
+        """
+        if len(answers) == 1:
+            return answers[0]
+
+        suggestions = [a for a in answers if a.strip().upper() != "CONTINUE"]
+        if len(suggestions) * 2 <= len(answers):
+            return "CONTINUE"
+
+        counts = Counter(a.strip() for a in suggestions)
+        best = max(counts.values())
+        return next(a for a in suggestions if counts[a.strip()] == best)
+
+    def _prepare_review(self, template: str, steps: List[Step]) -> str:
+        """Set the critic personality for *steps* and return the review prompt."""
         if steps is None:
             raise ValueError("steps must not be None")
 
-        # Prepare placeholders for the prompt
-        mapping: Mapping[str, str] = {
-            "command": self._agent.executor.command,
-            "executor_id": self._agent.executor.id,
-            "context": self._agent.context,
-            "tools": self._build_tool_description(self._tools),
-            "steps": JsonSchema.serialize(steps),
-        }
-
-        # Set critic personality
-        self.personality = Agent.fill_slots(template, mapping)
+        # Set critic personality; only the command changes between reviews
+        self.personality = self._get_review_template(template).render(
+            {"command": self._agent.executor.command}
+        )
 
-        # As in Java: send the same message twice
         self.clear_conversation()
-        prompt = Agent.fill_slots("<steps>\n{{steps}}\n</steps>", mapping)
-        suggestion = self.chat(prompt).get_text()
-        logger.debug("**** Suggestion: %s", suggestion)
+        return f"<steps>\n{JsonSchema.serialize(steps)}\n</steps>"
+
+    def _get_review_template(self, template: str) -> PromptTemplate:
+        key = (self._agent.executor.id, self._agent.context, self._get_tool_description())
+        cached = self._review_templates.get(template)
+        if cached is None or cached[0] != key:
+            bound = PromptTemplate.compile(template).bind(
+                {"executor_id": key[0], "context": key[1], "tools": key[2]}
+            )
+            cached = self._review_templates[template] = (key, bound)
+        return cached[1]
 
-        # Second call (mirrors original behaviour)
-        return self.chat(prompt).get_text()
+    def _get_tool_description(self) -> str:
+        # Rebuilt only if a tool definition changed
+        key = tuple((t.id, t.description, t.json_parameters) for t in self._tools)
+        if self._tool_description is None or self._tool_description_key != key:
+            self._tool_description = self._build_tool_description(self._tools)
+            self._tool_description_key = key
+        return self._tool_description
 
     # ------------------------------------------------------------------ #
     # Helpers
@@ -14,7 +14,7 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any, Mapping, Sequence
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
 
 from pydantic import Field
 
@@ -22,15 +22,13 @@ from api import Api
 from chat_types import ToolCall, ToolCallResult
 from execution_context import ExecutionContext
 from lab_agent import LabAgent
+import log_config
 from react_agent import ReactAgent
 
 # --------------------------------------------------------------------------- #
 # Logging (equivalent to Java SimpleLogger)
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -106,7 +104,11 @@ class CustomerPortal(LabAgent):
             )
 
     class GetTransactionsApi(Api):
-        class Parameters(ReactAgent.Parameters):
+        # Estates can have hundreds of transactions; longer statements are
+        # returned a page at a time
+        default_page_size = 50
+
+        class Parameters(ReactAgent.Parameters, Api.PageParameters):
             account_number: str = Field(
                 ...,
                 alias="accountNumber",
@@ -118,10 +120,50 @@ class CustomerPortal(LabAgent):
         def __init__(self) -> None:
             super().__init__(
                 id_="getTransactions",
-                description="Returns transactions for the specified account.",
+                description=(
+                    "Returns transactions for the specified account, a page at a time; "
+                    "use nextCursor to get the following pages."
+                ),
                 schema=CustomerPortal.GetTransactionsApi.Parameters,
             )
 
+        def invoke(self, call: ToolCall, *, log: bool = False) -> ToolCallResult:  # noqa: D401
+            result = super().invoke(call, log=log)
+            statement = self._parse_statement(str(result.result))
+            if statement is None:  # errors, or no table of entries
+                return result
+
+            head, transactions, tail = statement
+            paged = any(call.arguments.get(k) for k in ("limit", "cursor", "fields"))
+            if not paged and len(transactions) <= self.default_page_size:
+                return result
+
+            parts = [head.rstrip(), self.page(transactions, call.arguments), tail.strip()]
+            return ToolCallResult.from_call(call, "\n\n".join(p for p in parts if p))
+
+        @staticmethod
+        def _parse_statement(text: str) -> Tuple[str, List[Dict[str, str]], str] | None:
+            """
+            Split an account statement into the text before its (Markdown) table
+            of entries, one dict per entry (column name -> value), and the text
+            after the table; None if there is no table.
+            """
+            lines = text.splitlines()
+            start = next((i for i, ln in enumerate(lines) if ln.lstrip().startswith("|")), None)
+            if start is None or start + 1 >= len(lines):
+                return None
+
+            def cells(line: str) -> List[str]:
+                return [c.strip() for c in line.strip().strip("|").split("|")]
+
+            header = cells(lines[start])
+            end = start + 2  # skip the |---|---| separator
+            rows: List[Dict[str, str]] = []
+            while end < len(lines) and lines[end].lstrip().startswith("|"):
+                rows.append(dict(zip(header, cells(lines[end]))))
+                end += 1
+            return "\n".join(lines[:start]), rows, "\n".join(lines[end:])
+
     class SendCommunicationApi(Api):
         class Parameters(ReactAgent.Parameters):
             customer_number: str = Field(
@@ -1,20 +1,21 @@
 from __future__ import annotations
 
+import itertools
 import logging
-import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, List, Mapping, MutableMapping, Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, MutableMapping, Sequence, Tuple
+
+from cow_collections import CowDict, CowList
+import log_config
+from run_budget import RunBudget
+from task_store import TaskStore, field_for_alias
 
 # --------------------------------------------------------------------------- #
 # Logging configuration (equivalent to Java SimpleLogger)
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-    stream=sys.stderr,
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------------- #
@@ -34,8 +35,24 @@ class ExecutionContext:
     """
     Holds the *mutable* simulation state during a test run and offers
     utilities for logging and task filtering.
+
+    Many runs can start from the same state with :meth:`fork`, which is
+    cheap: forks share tasks, persons, documents and log entries with the
+    original until either side changes them (copy-on-write). :meth:`diff`
+    and :meth:`merge` compare forks and bring the changes of one into
+    another.
     """
 
+    # Keyed collections compared by diff() and merge()
+    COLLECTIONS: Tuple[str, ...] = (
+        "unassigned_tasks",
+        "operator_tasks",
+        "related_persons",
+        "proforma_document",
+        "sks",
+        "poa",
+    )
+
     # ------------------------- life-cycle ------------------------------ #
     def __init__(
         self,
@@ -55,25 +72,53 @@ class ExecutionContext:
         self.run_id: str = run_id
 
         # Dynamic state ------------------------------------------------- #
-        self.unassigned_tasks: list["_Task"] | None = None
-        self.operator_tasks: list["_Task"] = []
-        self.related_persons: dict[str, "_Person"] | None = None
+        self.unassigned_tasks: TaskStore | None = None
+        self.operator_tasks: TaskStore = TaskStore()
+        self.related_persons: MutableMapping[str, "_Person"] | None = None
+
+        self.proforma_document: MutableMapping[str, str] = CowDict()
+        self.sks: MutableMapping[str, str] = CowDict()
+        self.poa: MutableMapping[str, str] = CowDict()
+
+        self.log_entries: CowList[ExecutionContext.LogEntry] = CowList()
 
-        self.proforma_document: dict[str, str] = {}
-        self.sks: dict[str, str] = {}
-        self.poa: dict[str, str] = {}
+        # Limits shared by every agent executing in this context, nested ones
+        # included (None == unlimited)
+        self.budget: RunBudget | None = None
 
-        self.log_entries: list[ExecutionContext.LogEntry] = []
+        # State of the context this one was forked from, at fork time
+        self.forked_from: ExecutionContext | None = None
+        self._fork_ids = itertools.count(1)
 
     # ------------------------------------------------------------------ #
     # Database connector (abstract)                                      #
     # ------------------------------------------------------------------ #
     class DbConnector:
-        """A pluggable persistence hook used by the simulator."""
+        """
+        A pluggable persistence hook used by the simulator.
+
+        Implementations are called from the agent loop, so they should not
+        block (see :class:`persistence.BufferedDbConnector`).
+        """
 
         def add_step(self, run_id: str, step: "Step") -> None:  # noqa: D401
             raise NotImplementedError
 
+        def add_log_entry(self, run_id: str, entry: "ExecutionContext.LogEntry") -> None:
+            """Called for every entry logged in a context using this connector."""
+
+        def flush(self) -> None:
+            """Write any record that is still buffered."""
+
+        def close(self) -> None:
+            """Flush and release resources."""
+
+    class NullDbConnector(DbConnector):
+        """DbConnector that discards everything, for runs that need not be stored."""
+
+        def add_step(self, run_id: str, step: "Step") -> None:  # noqa: D401
+            pass
+
     # ------------------------------------------------------------------ #
     # Log entries                                                        #
     # ------------------------------------------------------------------ #
@@ -160,6 +205,200 @@ class ExecutionContext:
                 f"{self.customer_number} CONTENT -> {self.content}"
             )
 
+    # ------------------------------------------------------------------ #
+    # Fork / diff / merge                                                #
+    # ------------------------------------------------------------------ #
+    @dataclass
+    class MappingDiff:
+        """Changes to one keyed collection (tasks are keyed by (Customer Number, Time Created))."""
+
+        added: Dict[Any, Any] = field(default_factory=dict)
+        changed: Dict[Any, Any] = field(default_factory=dict)
+        removed: List[Any] = field(default_factory=list)
+
+        def __bool__(self) -> bool:
+            return bool(self.added or self.changed or self.removed)
+
+    @dataclass
+    class Diff:
+        """Changes that turn one context's state into another's."""
+
+        # Collection name (see COLLECTIONS) -> changes; only changed collections are present
+        collections: Dict[str, "ExecutionContext.MappingDiff"] = field(default_factory=dict)
+        # Entries logged after the common part of the two logs
+        new_log_entries: List["ExecutionContext.LogEntry"] = field(default_factory=list)
+        # Entries of the first log that are not in the second one (e.g. after clear_log())
+        dropped_log_entries: int = 0
+
+        def __bool__(self) -> bool:
+            return bool(self.collections or self.new_log_entries or self.dropped_log_entries)
+
+    def fork(
+        self,
+        run_id: str | None = None,
+        db: "ExecutionContext.DbConnector | None" = None,
+        budget: RunBudget | None = None,
+    ) -> "ExecutionContext":
+        """
+        Return a new context starting from the current state of this one.
+
+        Collections are copy-on-write, so forking costs the same whatever
+        their size, and unchanged data is shared by all forks; the fork's
+        :attr:`forked_from` keeps the state at fork time, for :meth:`merge`.
+
+        Parameters
+        ----------
+        run_id : str | None
+            Run id of the fork; defaults to this run id plus a ``.<n>`` suffix.
+        db : ExecutionContext.DbConnector | None
+            Connector of the fork; defaults to this context's one.
+        budget : RunBudget | None
+            Budget of the fork; a fork is a run of its own and does not share
+            the budget of this context.
+        """
+        if run_id is None:
+            run_id = f"{self.run_id}.{next(self._fork_ids)}"
+        child = self._copy(run_id, db if db is not None else self.db)
+        child.budget = budget
+        child.forked_from = self._copy(self.run_id, self.db)
+        return child
+
+    def _copy(self, run_id: str, db: "ExecutionContext.DbConnector") -> "ExecutionContext":
+        ctx = ExecutionContext(db, self.scenario_id, run_id)
+        if self.unassigned_tasks is not None:
+            ctx.unassigned_tasks = self.unassigned_tasks.fork()
+        ctx.operator_tasks = self.operator_tasks.fork()
+        ctx.related_persons = self._fork_mapping("related_persons")
+        ctx.proforma_document = self._fork_mapping("proforma_document")
+        ctx.sks = self._fork_mapping("sks")
+        ctx.poa = self._fork_mapping("poa")
+        ctx.log_entries = self.log_entries.fork()
+        return ctx
+
+    def _fork_mapping(self, name: str) -> Any:
+        mapping = getattr(self, name)
+        if mapping is None:
+            return None
+        if not isinstance(mapping, CowDict):
+            # Tools may have replaced it with a plain dict
+            mapping = CowDict(mapping)
+            setattr(self, name, mapping)
+        return mapping.fork()
+
+    def _entries(self, name: str) -> Mapping[Any, Any]:
+        collection = getattr(self, name)
+        if collection is None:
+            return {}
+        if isinstance(collection, TaskStore):
+            return dict(collection.items())
+        return collection
+
+    @staticmethod
+    def diff(base: "ExecutionContext", other: "ExecutionContext") -> "ExecutionContext.Diff":
+        """
+        Changes that turn the state of *base* into that of *other*. Values are
+        compared by identity first, so data shared by forks is cheap to compare.
+        """
+        if base is None:
+            raise ValueError("base must not be None")
+        if other is None:
+            raise ValueError("other must not be None")
+
+        result = ExecutionContext.Diff()
+        for name in ExecutionContext.COLLECTIONS:
+            before, after = base._entries(name), other._entries(name)
+            changes = ExecutionContext.MappingDiff()
+            for key, value in after.items():
+                if key not in before:
+                    changes.added[key] = value
+                elif not _same(before[key], value):
+                    changes.changed[key] = value
+            changes.removed = [key for key in before if key not in after]
+            if changes:
+                result.collections[name] = changes
+
+        common = 0
+        for mine, theirs in zip(base.log_entries, other.log_entries):
+            if not _same(mine, theirs):
+                break
+            common += 1
+        result.new_log_entries = list(other.log_entries[common:])
+        result.dropped_log_entries = len(base.log_entries) - common
+        return result
+
+    def merge(self, branch: "ExecutionContext", overwrite: bool = False) -> "ExecutionContext.Diff":
+        """
+        Apply to this context the changes *branch* made since it was forked
+        (three-way merge against ``branch.forked_from``): collection entries
+        are added, replaced or removed, and the entries *branch* logged are
+        appended to this log (entries it dropped are not removed from here).
+
+        Merging the same branch twice appends its log entries twice.
+
+        Parameters
+        ----------
+        overwrite : bool
+            What to do when an entry changed by *branch* was also changed
+            here since the fork: if False, raise ValueError and leave this
+            context untouched; if True, take the branch's version.
+
+        Returns
+        -------
+        ExecutionContext.Diff
+            The changes that were applied.
+        """
+        if branch is None:
+            raise ValueError("branch must not be None")
+        base = branch.forked_from
+        if base is None:
+            raise ValueError("branch was not created by fork()")
+
+        changes = ExecutionContext.diff(base, branch)
+
+        if not overwrite:
+            conflicts: List[str] = []
+            for name, mapping_diff in changes.collections.items():
+                before, mine = base._entries(name), self._entries(name)
+                updated = {**mapping_diff.added, **mapping_diff.changed}
+                for key in [*updated, *mapping_diff.removed]:
+                    current = mine.get(key)
+                    if _same(current, before.get(key)):
+                        continue  # not changed here
+                    if key in updated and _same(current, updated[key]):
+                        continue  # changed the same way
+                    if key not in updated and key not in mine:
+                        continue  # removed here too
+                    conflicts.append(f"{name}[{key}]")
+            if conflicts:
+                raise ValueError(f"Merge conflicts: {', '.join(conflicts)}")
+
+        for name, mapping_diff in changes.collections.items():
+            self._apply(name, mapping_diff)
+        for entry in changes.new_log_entries:
+            self.log_entries.append(entry)
+            self.db.add_log_entry(self.run_id, entry)
+        return changes
+
+    def _apply(self, name: str, changes: "ExecutionContext.MappingDiff") -> None:
+        collection = getattr(self, name)
+        if isinstance(collection, TaskStore) or (collection is None and name.endswith("_tasks")):
+            store = collection if collection is not None else TaskStore()
+            with TaskStore.locked(store):
+                for key in changes.removed:
+                    store.remove(*key)
+                for task in [*changes.changed.values(), *changes.added.values()]:
+                    store.remove(*TaskStore.key_of(task))
+                    store.add(task)
+            setattr(self, name, store)
+            return
+
+        mapping = collection if collection is not None else CowDict()
+        for key in changes.removed:
+            mapping.pop(key, None)
+        mapping.update(changes.added)
+        mapping.update(changes.changed)
+        setattr(self, name, mapping)
+
     # ------------------------------------------------------------------ #
     # Logging convenience wrappers                                       #
     # ------------------------------------------------------------------ #
@@ -167,6 +406,7 @@ class ExecutionContext:
         if entry is None:
             raise ValueError("entry must not be None")
         self.log_entries.append(entry)
+        self.db.add_log_entry(self.run_id, entry)
         logger.info("%s", entry)
 
     # --- overloaded helpers (mirror Java API) ------------------------- #
@@ -222,7 +462,7 @@ class ExecutionContext:
     # ------------------------------------------------------------------ #
     @staticmethod
     def filter_tasks(
-        tasks: Sequence["_Task"],
+        tasks: Sequence["_Task"] | TaskStore,
         filter_by: str | None = None,
         filter_value: str | None = None,
         customer_number: str | None = None,
@@ -236,6 +476,8 @@ class ExecutionContext:
         """
         if tasks is None:
             raise ValueError("tasks must not be None")
+        if isinstance(tasks, TaskStore):
+            return tasks.filter(filter_by, filter_value, customer_number)
 
         def _matches(task: "_Task") -> bool:
             # Filter by customer number first (if provided)
@@ -243,14 +485,14 @@ class ExecutionContext:
                 return False
 
             if filter_by and filter_value is not None:
-                # Pydantic exposes alias→field mapping via model_fields
-                for fld in task.model_fields.values():  # type: ignore[attr-defined]
-                    if fld.alias == filter_by:
-                        value = getattr(task, fld.name)
-                        return str(value) == filter_value
+                fld = field_for_alias(type(task), filter_by)
                 # If alias not found, nothing matches
-                return False
+                return fld is not None and str(getattr(task, fld)) == filter_value
 
             return True
 
         return [t for t in tasks if _matches(t)]
+
+
+def _same(a: Any, b: Any) -> bool:
+    return a is b or a == b
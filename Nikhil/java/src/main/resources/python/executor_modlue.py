@@ -1,23 +1,28 @@
 # executor_module.py
 from __future__ import annotations
 
-import json
+import asyncio
+import contextlib
 import logging
-from typing import List, Mapping, Sequence, TYPE_CHECKING
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, List, Sequence, Tuple, TYPE_CHECKING
 
 from agent import Agent
 from chat_types import ChatCompletion, ToolCall, ToolCallResult
 from json_schema import JsonSchema
+import log_config
+from observation_store import FetchObservationTool, ObservationStore
+from prompt_template import PromptTemplate
+from rate_limiter import RateLimiter
+from run_budget import RunBudget
 from steps import Step, ToolCallStep, Status
+import timing
 from tool import Tool
 
 if TYPE_CHECKING:
     from react_agent import ReactAgent
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +32,7 @@ class ExecutorModule(Agent):
     # Constants
     # ------------------------------------------------------------------ #
     MAX_STEPS: int = 40  # hard stop to avoid infinite loops
+    KEEP_FULL_STEPS: int = 3  # never elided when fitting the token budget
 
     _PROMPT_TEMPLATE: str = (
         "# Identity\n\n"
@@ -85,19 +91,68 @@ class ExecutorModule(Agent):
         self._check_last_step: bool = bool(check_last_step)
         self._command: str | None = None
 
+        # _PROMPT_TEMPLATE with the slots that do not change between commands
+        # filled, and the (id, context, examples) it was filled with
+        self._personality_template: PromptTemplate | None = None
+        self._personality_key: Tuple[str, str, str] | None = None
+
+        # When max_prompt_tokens is set, observations of older steps are cut to
+        # their head and tail (these many characters) until the prompt fits;
+        # the most recent KEEP_FULL_STEPS steps are always sent in full.
+        self.observation_head_chars: int = 1000
+        self.observation_tail_chars: int = 500
+
+        # Opt-in, see use_observation_store()
+        self.observation_store: ObservationStore | None = None
+        self._owns_observation_store: bool = False
+
+        # Opt-in: run the tool calls returned in one completion concurrently,
+        # at most max_parallel_tool_calls at a time (see AbstractTool.max_concurrency
+        # for per-tool limits). Steps are always recorded in the original order.
+        self.parallel_tool_calls: bool = False
+        self.max_parallel_tool_calls: int = 4
+
+        # Opt-in: stream replies and start executing each tool call as soon as
+        # the model has generated it, while it generates the next ones; JSON
+        # (final step) replies are read only up to the end of the object.
+        self.streaming: bool = False
+
         self.temperature = 0.0
         self.model = model
+        self.priority = RateLimiter.HIGH  # executor steps go ahead of critic reviews
         self.set_response_format(Step)
 
+    def use_observation_store(self, store: ObservationStore | None = None) -> None:
+        """
+        Keep observations longer than ``observation_head_chars +
+        observation_tail_chars`` in *store* (a new one, cleared at each
+        execution, by default). Apart from the most recent KEEP_FULL_STEPS
+        steps, prompts then show them cut to head and tail with their handle,
+        and the model gets a ``fetchObservation`` tool to read them in full.
+        """
+        if self.observation_store is not None:
+            raise RuntimeError("An observation store is already in use")
+
+        self._owns_observation_store = store is None
+        self.observation_store = store if store is not None else ObservationStore()
+        self.add_tool(FetchObservationTool(self.observation_store))
+
     # ------------------------------------------------------------------ #
     # convenience wrappers (delegate to ReactAgent)
     # ------------------------------------------------------------------ #
+    @property
+    def agent(self) -> "ReactAgent":  # noqa: D401
+        """Return the parent `ReactAgent`."""
+        return self._agent
+
     @property
     def command(self) -> str | None:
         return self._command
 
     def _add_step(self, step: Step) -> None:
         self._agent.add_step(step)
+        if self.run_budget is not None:
+            self.run_budget.add_step()
 
     def _last_step(self) -> Step | None:
         return self._agent.get_last_step()
@@ -105,21 +160,179 @@ class ExecutorModule(Agent):
     # ------------------------------------------------------------------ #
     # main execution loop
     # ------------------------------------------------------------------ #
+    _NO_SUGGESTION: str = (
+        "No suggestions. Proceed as you see best, using the tools at your disposal."
+    )
+    _INSTRUCTIONS_TEMPLATE: str = "<steps>\n{{steps}}\n</steps>\n\nSuggestion: {{suggestion}}"
+
     def execute(self, command: str) -> Step:
+        self._start(command)
+        suggestion = self._NO_SUGGESTION
+
+        # --------------------- loop ----------------------------------- #
+        while self._is_running():
+            self.clear_conversation()
+            prompt = self._build_prompt(suggestion)
+
+            with self._streamed_calls() as streamed:
+                try:
+                    reply = (
+                        self.chat_stream(prompt, streamed.submit)
+                        if streamed is not None
+                        else self.chat(prompt)
+                    )
+                except Exception as exc:
+                    self._add_streamed_steps(streamed)
+                    self._add_step(self._llm_error_step(prompt, exc))
+                    break
+
+                if reply.finish_reason != ChatCompletion.FinishReason.COMPLETED:
+                    self._add_streamed_steps(streamed)
+                    self._add_step(self._truncated_step(prompt, reply))
+                    break
+
+                # ------------------- handle model output ------------------ #
+                if reply.message.has_tool_calls():
+                    with_error = False
+                    results = (
+                        streamed.results()
+                        if streamed is not None
+                        else self._dispatch(reply.message.get_tool_calls())
+                    )
+                    for call, result in results:
+                        with_error |= self._add_tool_call_step(call, result)
+
+                        if len(self._agent.steps) > self.MAX_STEPS:
+                            break
+
+                    try:
+                        suggestion = (
+                            self._agent.reviewer.review_tool_call(self._agent.steps)
+                            if with_error
+                            else "CONTINUE"
+                        )
+                    except RunBudget.Exhausted:
+                        break  # _finish() records why
+                else:
+                    self._add_final_step(reply)
+
+                    if self._last_step().status == Status.IN_PROGRESS:
+                        suggestion = self._PROCEED_SUGGESTION
+                    elif self._check_last_step:
+                        try:
+                            suggestion = self._agent.reviewer.review_conclusions(
+                                self._agent.steps
+                            )
+                        except RunBudget.Exhausted:
+                            self._conclusions_unchecked()
+                            break
+                        self._apply_conclusions_review(suggestion)
+
+        return self._finish()
+
+    async def aexecute(self, command: str) -> Step:
+        """
+        Awaitable version of :meth:`execute`.
+
+        LLM calls (executor and critic) are awaited on the shared async client;
+        tool calls are synchronous and run in the default executor, so that
+        nested agents used as tools do not block the event loop.
+        """
+        self._start(command)
+        suggestion = self._NO_SUGGESTION
+
+        while self._is_running():
+            self.clear_conversation()
+            prompt = self._build_prompt(suggestion)
+
+            async with self._astreamed_calls() as streamed:
+                try:
+                    reply = (
+                        await self.achat_stream(prompt, streamed.submit)
+                        if streamed is not None
+                        else await self.achat(prompt)
+                    )
+                except Exception as exc:
+                    await self._aadd_streamed_steps(streamed)
+                    self._add_step(self._llm_error_step(prompt, exc))
+                    break
+
+                if reply.finish_reason != ChatCompletion.FinishReason.COMPLETED:
+                    await self._aadd_streamed_steps(streamed)
+                    self._add_step(self._truncated_step(prompt, reply))
+                    break
+
+                if reply.message.has_tool_calls():
+                    with_error = False
+                    results = (
+                        streamed.results()
+                        if streamed is not None
+                        else self._adispatch(reply.message.get_tool_calls())
+                    )
+                    async for call, result in results:
+                        with_error |= self._add_tool_call_step(call, result)
+
+                        if len(self._agent.steps) > self.MAX_STEPS:
+                            break
+
+                    try:
+                        suggestion = (
+                            await self._agent.reviewer.areview_tool_call(self._agent.steps)
+                            if with_error
+                            else "CONTINUE"
+                        )
+                    except RunBudget.Exhausted:
+                        break  # _finish() records why
+                else:
+                    self._add_final_step(reply)
+
+                    if self._last_step().status == Status.IN_PROGRESS:
+                        suggestion = self._PROCEED_SUGGESTION
+                    elif self._check_last_step:
+                        try:
+                            suggestion = await self._agent.reviewer.areview_conclusions(
+                                self._agent.steps
+                            )
+                        except RunBudget.Exhausted:
+                            self._conclusions_unchecked()
+                            break
+                        self._apply_conclusions_review(suggestion)
+
+        return self._finish()
+
+    # ------------------------------------------------------------------ #
+    # loop helpers (shared by execute / aexecute)
+    # ------------------------------------------------------------------ #
+    def _get_personality_template(self) -> PromptTemplate:
+        key = (self.id, self._agent.context, self._agent.examples)
+        if self._personality_template is None or self._personality_key != key:
+            self._personality_template = PromptTemplate.compile(self._PROMPT_TEMPLATE).bind(
+                {"id": key[0], "context": key[1], "examples": key[2]}
+            )
+            self._personality_key = key
+        return self._personality_template
+
+    _PROCEED_SUGGESTION: str = (
+        "**STRICTLY** proceed with next steps, by calling appropriate tools."
+    )
+
+    def _start(self, command: str) -> None:
+        """Set personality for *command* and record the first bookkeeping step."""
         if command is None:
             raise ValueError("command must not be None")
 
         self._command = command
         self._agent.steps.clear()
+        if self._owns_observation_store:
+            self.observation_store.clear()  # type: ignore[union-attr]
+        self._agent.reviewer.reset_stats()
+        self.reset_usage()
+
+        # Executor and critic are charged to the run budget, if any
+        self.run_budget = self._agent.get_run_budget()
+        self._agent.reviewer.run_budget = self.run_budget
 
-        # --- personality & first bookkeeping step -------------------- #
-        slots: Mapping[str, str] = {
-            "command": command,
-            "id": self.id,
-            "context": self._agent.context,
-            "examples": self._agent.examples,
-        }
-        self.personality = Agent.fill_slots(self._PROMPT_TEMPLATE, slots)
+        self.personality = self._get_personality_template().render({"command": command})
 
         first_step = (
             Step.builder()
@@ -131,7 +344,7 @@ class ExecutorModule(Agent):
                         "I am starting execution of the below user's command in "
                         "<user_command>\n\n<user_command>\n{{command}}\n</user_command>"
                     ),
-                    slots,
+                    {"command": command},
                 )
             )
             .observation("Execution just started.")
@@ -139,137 +352,282 @@ class ExecutorModule(Agent):
         )
         self._add_step(first_step)
 
-        suggestion = (
-            "No suggestions. Proceed as you see best, using the tools at your disposal."
+    def _is_running(self) -> bool:
+        last = self._last_step()
+        return (
+            len(self._agent.steps) < self.MAX_STEPS
+            and (last is None or last.status is None or last.status == Status.IN_PROGRESS)
+            and self._budget_exhausted() is None
         )
-        instructions_tpl = "<steps>\n{{steps}}\n</steps>\n\nSuggestion: {{suggestion}}"
 
-        # --------------------- loop ----------------------------------- #
-        while (
-            len(self._agent.steps) < self.MAX_STEPS
-            and (
-                self._last_step() is None
-                or self._last_step().status is None
-                or self._last_step().status == Status.IN_PROGRESS
-            )
-        ):
-            self.clear_conversation()
+    def _budget_exhausted(self) -> str | None:
+        """Why the run budget ran out, or None if it did not (or there is none)."""
+        return None if self.run_budget is None else self.run_budget.exhausted()
 
-            steps_json = json.dumps(
-                [
-                    s.model_dump(exclude={"action_steps"})
-                    if isinstance(s, ToolCallStep)
-                    else s.model_dump()
-                    for s in self._agent.steps
-                ],
-                separators=(",", ":"),
-            )
+    def _build_prompt(self, suggestion: str) -> str:
+        with timing.timed(timing.SERIALISATION):
+            # Each step caches its own JSON (see Step.to_prompt_json())
+            fragments = [s.to_prompt_json() for s in self._agent.steps]
+            if self.observation_store is not None:
+                self._preview_stored_observations(fragments)
+            if self.max_prompt_tokens is not None:
+                self._fit_token_budget(fragments, suggestion)
 
-            prompt = Agent.fill_slots(
-                instructions_tpl,
-                {"steps": steps_json, "suggestion": suggestion},
+            return Agent.fill_slots(
+                self._INSTRUCTIONS_TEMPLATE,
+                {"steps": "[" + ",".join(fragments) + "]", "suggestion": suggestion},
             )
 
-            try:
-                reply = self.chat(prompt)
-            except Exception as exc:
-                error_step = (
-                    ToolCallStep.builder()
-                    .actor(self.id)
-                    .status(Status.ERROR)
-                    .thought("I had something in mind...")
-                    .action("LLM was called but this resulted in an error.")
-                    .action_input(prompt)
-                    .action_steps([])
-                    .observation(str(exc))
-                    .build()
+    def _preview_stored_observations(self, fragments: List[str]) -> None:
+        """Show stored observations of all but the latest steps as head, tail and handle."""
+        steps = self._agent.steps
+        for i in range(1, len(steps) - self.KEEP_FULL_STEPS):
+            if steps[i].observation_handle is not None:
+                fragments[i] = steps[i].to_elided_prompt_json(
+                    self.observation_head_chars, self.observation_tail_chars
                 )
-                self._add_step(error_step)
-                break
 
-            if reply.finish_reason != ChatCompletion.FinishReason.COMPLETED:
-                truncated_step = (
-                    ToolCallStep.builder()
-                    .actor(self.id)
-                    .status(Status.ERROR)
-                    .thought("I had something in mind...")
-                    .action("LLM was called but this resulted in a truncated message.")
-                    .action_input(prompt)
-                    .action_steps([])
-                    .observation(f"Response finish reason: {reply.finish_reason}")
-                    .build()
-                )
-                self._add_step(truncated_step)
+    def _fit_token_budget(self, fragments: List[str], suggestion: str) -> None:
+        """
+        Replace, oldest first, step *fragments* with their elided version until
+        the prompt fits :pyattr:`max_prompt_tokens` (or nothing is left to elide;
+        Agent then refuses to send an oversized request).
+        """
+        steps = self._agent.steps
+        budget = (
+            self.max_prompt_tokens
+            - self.count_fixed_tokens()
+            - self.count_tokens(self._INSTRUCTIONS_TEMPLATE + suggestion)
+        )
+        used = sum(self.count_tokens(f) for f in fragments)
+
+        # The first (bookkeeping) step is tiny; keep the latest ones intact
+        for i in range(1, len(steps) - self.KEEP_FULL_STEPS):
+            if used <= budget:
                 break
+            elided = steps[i].to_elided_prompt_json(
+                self.observation_head_chars, self.observation_tail_chars
+            )
+            used += self.count_tokens(elided) - self.count_tokens(fragments[i])
+            fragments[i] = elided
 
-            # ------------------- handle model output ------------------ #
-            if reply.message.has_tool_calls():
-                with_error = False
-                for call in reply.message.get_tool_calls():
-                    try:
-                        result = call.execute()
-                    except Exception as exc:
-                        result = ToolCallResult.from_exception(call, exc)
-                        with_error = True
-                    else:
-                        with_error |= (
-                            isinstance(result.result, str)
-                            and "error" in result.result.lower()
-                        )
+    def _llm_error_step(self, prompt: str, exc: Exception) -> ToolCallStep:
+        return (
+            ToolCallStep.builder()
+            .actor(self.id)
+            .status(Status.ERROR)
+            .thought("I had something in mind...")
+            .action("LLM was called but this resulted in an error.")
+            .action_input(prompt)
+            .action_steps([])
+            .observation(str(exc))
+            .build()
+        )
 
-                    args_no_thought = dict(call.arguments)
-                    thought = args_no_thought.pop("thought", "No thought passed explicitly.")
-                    call_step = (
-                        ToolCallStep.builder()
-                        .actor(self.id)
-                        .status(Status.IN_PROGRESS)
-                        .thought(str(thought))
-                        .action(f'The tool "{call.tool.id}" has been called')
-                        .action_input(JsonSchema.serialize(args_no_thought))
-                        .action_steps(
-                            call.tool.agent.steps  # type: ignore[attr-defined]
-                            if hasattr(call.tool, "agent")
-                            else []
-                        )
-                        .observation(str(result.result))
-                        .build()
-                    )
-                    self._add_step(call_step)
+    def _truncated_step(self, prompt: str, reply: ChatCompletion) -> ToolCallStep:
+        return (
+            ToolCallStep.builder()
+            .actor(self.id)
+            .status(Status.ERROR)
+            .thought("I had something in mind...")
+            .action("LLM was called but this resulted in a truncated message.")
+            .action_input(prompt)
+            .action_steps([])
+            .observation(f"Response finish reason: {reply.finish_reason}")
+            .build()
+        )
 
-                    if len(self._agent.steps) > self.MAX_STEPS:
-                        break
+    def _dispatch(self, calls: List[ToolCall]) -> Iterator[Tuple[ToolCall, ToolCallResult]]:
+        """
+        Yield ``(call, result)`` pairs in the order of *calls*.
 
-                suggestion = (
-                    self._agent.reviewer.review_tool_call(self._agent.steps)
-                    if with_error
-                    else "CONTINUE"
-                )
-            else:
-                try:
-                    step_obj = reply.get_object(Step)
-                    step_obj.actor = self.id
-                    self._add_step(step_obj)
-                except Exception as exc:
-                    fallback = (
-                        Step.builder()
-                        .actor(self.id)
-                        .status(Status.ERROR)
-                        .thought(f"I stopped because I encountered this error: {exc}")
-                        .observation(reply.get_text())
-                        .build()
-                    )
-                    self._add_step(fallback)
+        Calls run one at a time, lazily (so the caller can stop early), unless
+        :pyattr:`parallel_tool_calls` is set and there is more than one call.
+        """
+        if not self.parallel_tool_calls or len(calls) < 2:
+            for call in calls:
+                yield call, self._execute_call(call)
+            return
 
-                if self._last_step().status == Status.IN_PROGRESS:
-                    suggestion = (
-                        "**STRICTLY** proceed with next steps, by calling appropriate tools."
-                    )
-                elif self._check_last_step:
-                    suggestion = self._agent.reviewer.review_conclusions(self._agent.steps)
-                    if "continue" not in suggestion.lower():
-                        self._last_step().status = Status.IN_PROGRESS
+        workers = min(self.max_parallel_tool_calls, len(calls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=self.id) as pool:
+            results = list(pool.map(self._execute_call, calls))
+        yield from zip(calls, results)
+
+    async def _adispatch(
+        self, calls: List[ToolCall]
+    ) -> AsyncIterator[Tuple[ToolCall, ToolCallResult]]:
+        """Awaitable version of :meth:`_dispatch`; tools run in worker threads."""
+        if not self.parallel_tool_calls or len(calls) < 2:
+            for call in calls:
+                yield call, await asyncio.to_thread(self._execute_call, call)
+            return
+
+        limit = asyncio.Semaphore(self.max_parallel_tool_calls)
+
+        async def _run(call: ToolCall) -> ToolCallResult:
+            async with limit:
+                return await asyncio.to_thread(self._execute_call, call)
+
+        results = await asyncio.gather(*(_run(c) for c in calls))
+        for pair in zip(calls, results):
+            yield pair
+
+    # Streaming ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+    class _StreamedCalls:
+        """
+        Tool calls of a streamed reply, each run as soon as it is submitted
+        (at most *workers* at a time); results come back in call order.
+        Calls still queued on exit are dropped.
+        """
+
+        def __init__(
+            self, execute: Callable[[ToolCall], ToolCallResult], workers: int, name: str
+        ) -> None:
+            self._execute = execute
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+            self._calls: List[Tuple[ToolCall, Future]] = []
+
+        def submit(self, call: ToolCall) -> None:
+            self._calls.append((call, self._pool.submit(self._execute, call)))
+
+        def results(self) -> Iterator[Tuple[ToolCall, ToolCallResult]]:
+            for call, future in self._calls:
+                yield call, future.result()
+
+        def __enter__(self) -> "ExecutorModule._StreamedCalls":
+            return self
+
+        def __exit__(self, *exc: Any) -> None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    class _AStreamedCalls:
+        """Awaitable version of :class:`_StreamedCalls`; tools run in worker threads."""
+
+        def __init__(self, execute: Callable[[ToolCall], ToolCallResult], workers: int) -> None:
+            self._execute = execute
+            self._limit = asyncio.Semaphore(workers)
+            self._calls: List[Tuple[ToolCall, asyncio.Future]] = []
+
+        def submit(self, call: ToolCall) -> None:
+            self._calls.append((call, asyncio.ensure_future(self._run(call))))
+
+        async def _run(self, call: ToolCall) -> ToolCallResult:
+            async with self._limit:
+                return await asyncio.to_thread(self._execute, call)
+
+        async def results(self) -> AsyncIterator[Tuple[ToolCall, ToolCallResult]]:
+            for call, task in self._calls:
+                yield call, await task
+
+        async def __aenter__(self) -> "ExecutorModule._AStreamedCalls":
+            return self
+
+        async def __aexit__(self, *exc: Any) -> None:
+            tasks = [task for _, task in self._calls]
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-        # --------------------- overflow ------------------------------- #
+    def _stream_workers(self) -> int:
+        # Sequential, as without streaming, unless parallel_tool_calls is set
+        return self.max_parallel_tool_calls if self.parallel_tool_calls else 1
+
+    def _streamed_calls(self) -> contextlib.AbstractContextManager:
+        """Context yielding a :class:`_StreamedCalls` when streaming, None otherwise."""
+        if not self.streaming:
+            return contextlib.nullcontext()
+        return ExecutorModule._StreamedCalls(self._execute_call, self._stream_workers(), self.id)
+
+    def _astreamed_calls(self) -> contextlib.AbstractAsyncContextManager:
+        if not self.streaming:
+            return contextlib.nullcontext()
+        return ExecutorModule._AStreamedCalls(self._execute_call, self._stream_workers())
+
+    def _add_streamed_steps(self, streamed: "ExecutorModule._StreamedCalls | None") -> None:
+        """Record the tool calls already run from a reply that then failed."""
+        if streamed is not None:
+            for call, result in streamed.results():
+                self._add_tool_call_step(call, result)
+
+    async def _aadd_streamed_steps(self, streamed: "ExecutorModule._AStreamedCalls | None") -> None:
+        if streamed is not None:
+            async for call, result in streamed.results():
+                self._add_tool_call_step(call, result)
+
+    @staticmethod
+    def _execute_call(call: ToolCall) -> ToolCallResult:
+        """Execute *call*, honouring the tool's concurrency limit; never raises."""
+        slots = getattr(call.tool, "concurrency_slots", None)
+        try:
+            with timing.timed(timing.TOOL):
+                if slots is None:
+                    return call.execute()
+                with slots:
+                    return call.execute()
+        except Exception as exc:
+            return ToolCallResult.from_exception(call, exc)
+
+    def _add_tool_call_step(self, call: ToolCall, result: ToolCallResult) -> bool:
+        """Record the outcome of *call* as a step; return True if it errored."""
+        with_error = result.is_error or (
+            isinstance(result.result, str) and "error" in result.result.lower()
+        )
+
+        args_no_thought = dict(call.arguments)
+        thought = args_no_thought.pop("thought", "No thought passed explicitly.")
+        call_step = (
+            ToolCallStep.builder()
+            .actor(self.id)
+            .status(Status.IN_PROGRESS)
+            .thought(str(thought))
+            .action(f'The tool "{call.tool.id}" has been called')
+            .action_input(JsonSchema.serialize(args_no_thought))
+            .action_steps(
+                call.tool.agent.steps  # type: ignore[attr-defined]
+                if hasattr(call.tool, "agent")
+                else []
+            )
+            .observation(str(result.result))
+            .build()
+        )
+        store = self.observation_store
+        if store is not None and (
+            len(call_step.observation) > self.observation_head_chars + self.observation_tail_chars
+        ):
+            call_step.observation_handle = store.put(call_step.observation)
+        self._add_step(call_step)
+        return with_error
+
+    def _add_final_step(self, reply: ChatCompletion) -> None:
+        """Record a non tool-call reply, expected to be a :class:`Step` as JSON."""
+        try:
+            step_obj = reply.get_object(Step)
+            step_obj.actor = self.id
+            self._add_step(step_obj)
+        except Exception as exc:
+            fallback = (
+                Step.builder()
+                .actor(self.id)
+                .status(Status.ERROR)
+                .thought(f"I stopped because I encountered this error: {exc}")
+                .observation(reply.get_text())
+                .build()
+            )
+            self._add_step(fallback)
+
+    def _apply_conclusions_review(self, suggestion: str) -> None:
+        if "continue" not in suggestion.lower():
+            self._last_step().status = Status.IN_PROGRESS
+
+    def _conclusions_unchecked(self) -> None:
+        """The run budget ran out before the critic could review the conclusions."""
+        # Not accepted unreviewed; _finish() ends the run with the budget error
+        self._last_step().status = Status.IN_PROGRESS
+
+    def _finish(self) -> Step:
+        """Record overflow, if any, and return the last step."""
         if len(self._agent.steps) >= self.MAX_STEPS:
             overflow_step = (
                 Step.builder()
@@ -285,4 +643,34 @@ class ExecutorModule(Agent):
             self._add_step(overflow_step)
             logger.error("Maximum steps exceeded; aborting execution.")
 
+        last = self._last_step()
+        reason = self._budget_exhausted()
+        if reason is not None and (last.status is None or last.status == Status.IN_PROGRESS):
+            budget_step = (
+                Step.builder()
+                .actor(self.id)
+                .status(Status.ERROR)
+                .thought(f"Execution was stopped because the run budget ran out: {reason}.")
+                .observation(f"Run budget exhausted: {reason} (used: {self.run_budget}).")
+                .build()
+            )
+            self._add_step(budget_step)
+            logger.error("Run budget exhausted (%s); aborting execution.", reason)
+
+        stats = self._agent.reviewer.stats
+        if stats.reviews:
+            logger.info(
+                "Critic reviews: %d, LLM calls: %d, calls saved: %d",
+                stats.reviews,
+                stats.llm_calls,
+                stats.saved_calls,
+            )
+        if self.usage.requests:
+            logger.info(
+                "Executor prompt tokens: %d, served from prompt cache: %d (%.0f%%)",
+                self.usage.prompt_tokens,
+                self.usage.cached_tokens,
+                100 * self.usage.cache_hit_rate,
+            )
+
         return self._last_step()  # type: ignore[return-value]
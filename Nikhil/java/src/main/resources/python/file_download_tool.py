@@ -21,14 +21,12 @@ from scenario_component import ScenarioComponent
 
 # NOTE: This module is expected to be available in the project. Do NOT provide fallbacks.
 from capt import Capt  # noqa: F401
+import log_config
 
 # ------------------------------------------------------------------------------
 # Logging (equivalent to Java SimpleLogger)
 # ------------------------------------------------------------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
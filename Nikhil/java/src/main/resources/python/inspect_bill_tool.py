@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Mapping
+from typing import ClassVar, Mapping
 
 from pydantic import BaseModel, Field
 
@@ -10,6 +10,7 @@ from agent import Agent
 from chat_types import ToolCall, ToolCallResult
 from json_schema import JsonSchema
 from lab_agent import LabAgent
+import log_config
 from peace import Peace, Person  # assumes these are available as in the Java project
 from steps import Step, Status
 from tool import AbstractTool
@@ -17,10 +18,7 @@ from tool import AbstractTool
 # -----------------------------------------------------------------------------
 # Logging (equivalent to Java SimpleLogger)
 # -----------------------------------------------------------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -138,6 +136,76 @@ class InspectBillTool(LabAgent):
 
         model_config = {"populate_by_name": True}
 
+    # ------------------------------ prompts ------------------------------ #
+    # Built once, as they embed JSON schemas
+    _DESCRIPTION: ClassVar[str] = (
+        "This tool inspects one task attachment that is supposed to be a "
+        "bill/invoice determining whether it needs to be paid and corresponding "
+        "payment details. **STRICTLY** Do not call this tool on attachments you "
+        "know are not bill/invoices or to determine the type of an attachment. "
+        "Format of the returned result is described by this JSON Schema:\n"
+        + JsonSchema.get_json_schema(ResponseFormat)
+    )
+
+    # Additional context (Java setContext)
+    _CONTEXT: ClassVar[str] = (
+        '  * Documents you handle are in Danish, this means sometime you have to translate tool calls parameters. For example, "Customer Number" is sometimes indicated as "afdøde CPR" or "CPR" in documents.\n'
+        "  * Data about persons related to estates are described by the below JSON schema:\n"
+        f"{JsonSchema.get_json_schema(Person)}\n"
+        "  * Persons are uniquely identified by their Customer Number, sometimes also referred as CPR. Always provide the Customer Number if a tool needs to act on a specific person/client; indicate it as Customer Number and not CPR when passing it to tools.\n"
+    )
+
+    # COMMAND template (was a static final String in Java)
+    _COMMAND_TEMPLATE: ClassVar[str] = (
+        "Your task is to decide whether a payment should be fulfilled and extract and return some relevant information for the payment, by following the below instructions.\n"
+        '  * In the below instructions, terms "bill", "invoice", "bill/invoice", "attachment", etc. are synonyms.\n'
+        '  * Examine the contents of the task with Customer Number="{{estateCustomerNumber}}" ({{name}}) and Time Created="{{timeCreated}}" '
+        'and of its attachment with File Name="{{attachmentFileName}}", then extract all information needed to produce the required output.\n'
+        '  * Account numbers where payments should be made might come in "payment line" format such as: "+32<000000000063860+94720463" or "+32<000000000063860>+94720463<".\n'
+        '  * **STRICTLY**, if and only if task contents provide an account form where to fetch amounts for payments/reimbursements, then use this account for "fromAccount" field in your output both for payments and reimbursements.\n'
+        '  * **STRICTLY**, if and only if task contents or the attachment provide an account to where transfer amounts for reimbursements, then use this account for "toAccount" field in your output for reimbursements.\n'
+        "  * **STRICTLY**, if any instruction tells you to output a specific value for \"action\" field in your output, then you must create an output with the specified value for \"action\" field.\n"
+        "IF the attachment is a letter from Skifteretten mentioning a retsafgift (probate court fee) that may need to be paid THEN the fee must be paid; extract the Skifteretten account for payment, if provided in the document.\n"
+        "\n"
+        "IF any of the persons related to the estate has some Power of Attorney {\n"
+        "\tIF the attachment refers to expenses related to funeral (e.g. cemetery services and fees, church service, flowers, catering, etc.) THEN {\n"
+        "\t\tThe attachment must NOT be paid/reimbursed.\n"
+        "\t} ELSE {\n"
+        "\t\tIF only one person in <people> has power of attorney and their identity has been verified THEN {\n"
+        "\t\t\tIF content in <task> requests to pay attached bills/invoices and the task was created by the person with power of attorney THEN {\n"
+        "\t\t\t\tThe attachment must be paid/reimbursed.\n"
+        "\t\t\t} ELSE {\n"
+        "\t\t\t\tThe attachment must NOT be paid/reimbursed.\n"
+        "\t\t\t}\n"
+        "\t\t} ELSE {\n"
+        "\t\t\tThe attachment must NOT be paid/reimbursed.\n"
+        "\t\t}\n"
+        "\t}\n"
+        "}\n"
+        "IF none of the persons in <people> has some Power of Attorney {\n"
+        "\tDo not consider whether the identity of persons in <people> has been verified or not.\n"
+        "\tIF the attachment refers to expenses related to funeral (e.g. cemetery services and fees, church service, flowers, catering, etc.) THEN {\n"
+        "\t\tIF content in <task> requests to pay attached bills/invoices THEN {\n"
+        '\t\t\tIF (attachment amount is above 15,000.00 DKK) AND (the attachment is specifically related to food catering, gathering after funeral or tombstone costs THEN {\n'
+        "\t\t\t\tThe attachment must NOT be paid/reimbursed.\n"
+        "\t\t\t} ELSE {\n"
+        "\t\t\t\tThe attachment must be paid/reimbursed **EVEN IF** the identity of the person who created the task has not been verified.\n"
+        "\t\t\t}\n"
+        "\t\t} ELSE {\n"
+        "\t\t\tThe attachment must NOT be paid/reimbursed.\n"
+        "\t\t}\n"
+        "\t} ELSE {\n"
+        "\t}\n"
+        "}\n"
+        "If accordingly to above logic, the attachment must be paid, then if the attachment text indicates that the bill has already been paid, then the \"action\" field in your output **MUST** be to issue a reimbursement to the client.\n"
+        "If accordingly to above logic, the attachment must be paid, then if the attachment text indicates that the bill has **NOT** been paid, then the \"action\" field in your output **MUST** be to issue a payment to the person or entity who created the invoice, as specified in the attachment.\n"
+        "If accordingly to above logic, the attachment must NOT be paid, then the \"action\" field in your output **MUST** be to NOT issue a payment to the person or entity who created the invoice, as specified in the attachment.\n"
+        "  * Output your response as JSON, in the format described by the below JSON schema in <output_schema> tag.\n"
+        "\n<output_schema>\n"
+        f"{JsonSchema.get_json_schema(ResponseFormat)}"
+        "\n</output_schema>\n"
+    )
+
     # ------------------------------ init --------------------------------- #
     def __init__(self) -> None:
         # Tools available to this agent (same as in Java)
@@ -147,18 +215,10 @@ class InspectBillTool(LabAgent):
             Peace.GetFileContentApi(),
         ]
 
-        description = (
-            "This tool inspects one task attachment that is supposed to be a "
-            "bill/invoice determining whether it needs to be paid and corresponding "
-            "payment details. **STRICTLY** Do not call this tool on attachments you "
-            "know are not bill/invoices or to determine the type of an attachment. "
-            "Format of the returned result is described by this JSON Schema:\n"
-            + JsonSchema.get_json_schema(InspectBillTool.ResponseFormat)
-        )
 
         super().__init__(
             id_="inspectBillsTool",
-            description=description,
+            description=InspectBillTool._DESCRIPTION,
             tools=tools,
             check_last_step=False,  # mirrors commented Java line
         )
@@ -167,63 +227,10 @@ class InspectBillTool(LabAgent):
         self.json_parameters = JsonSchema.get_json_schema(InspectBillTool.Parameters)
 
         # Additional context (Java setContext)
-        self.context = (
-            '  * Documents you handle are in Danish, this means sometime you have to translate tool calls parameters. For example, "Customer Number" is sometimes indicated as "afdøde CPR" or "CPR" in documents.\n'
-            "  * Data about persons related to estates are described by the below JSON schema:\n"
-            f"{JsonSchema.get_json_schema(Person)}\n"
-            "  * Persons are uniquely identified by their Customer Number, sometimes also referred as CPR. Always provide the Customer Number if a tool needs to act on a specific person/client; indicate it as Customer Number and not CPR when passing it to tools.\n"
-        )
+        self.context = InspectBillTool._CONTEXT
 
-        # Build the COMMAND template (was a static final String in Java)
-        self._command_template: str = (
-            "Your task is to decide whether a payment should be fulfilled and extract and return some relevant information for the payment, by following the below instructions.\n"
-            '  * In the below instructions, terms "bill", "invoice", "bill/invoice", "attachment", etc. are synonyms.\n'
-            '  * Examine the contents of the task with Customer Number="{{estateCustomerNumber}}" ({{name}}) and Time Created="{{timeCreated}}" '
-            'and of its attachment with File Name="{{attachmentFileName}}", then extract all information needed to produce the required output.\n'
-            '  * Account numbers where payments should be made might come in "payment line" format such as: "+32<000000000063860+94720463" or "+32<000000000063860>+94720463<".\n'
-            '  * **STRICTLY**, if and only if task contents provide an account form where to fetch amounts for payments/reimbursements, then use this account for "fromAccount" field in your output both for payments and reimbursements.\n'
-            '  * **STRICTLY**, if and only if task contents or the attachment provide an account to where transfer amounts for reimbursements, then use this account for "toAccount" field in your output for reimbursements.\n'
-            "  * **STRICTLY**, if any instruction tells you to output a specific value for \"action\" field in your output, then you must create an output with the specified value for \"action\" field.\n"
-            "IF the attachment is a letter from Skifteretten mentioning a retsafgift (probate court fee) that may need to be paid THEN the fee must be paid; extract the Skifteretten account for payment, if provided in the document.\n"
-            "\n"
-            "IF any of the persons related to the estate has some Power of Attorney {\n"
-            "\tIF the attachment refers to expenses related to funeral (e.g. cemetery services and fees, church service, flowers, catering, etc.) THEN {\n"
-            "\t\tThe attachment must NOT be paid/reimbursed.\n"
-            "\t} ELSE {\n"
-            "\t\tIF only one person in <people> has power of attorney and their identity has been verified THEN {\n"
-            "\t\t\tIF content in <task> requests to pay attached bills/invoices and the task was created by the person with power of attorney THEN {\n"
-            "\t\t\t\tThe attachment must be paid/reimbursed.\n"
-            "\t\t\t} ELSE {\n"
-            "\t\t\t\tThe attachment must NOT be paid/reimbursed.\n"
-            "\t\t\t}\n"
-            "\t\t} ELSE {\n"
-            "\t\t\tThe attachment must NOT be paid/reimbursed.\n"
-            "\t\t}\n"
-            "\t}\n"
-            "}\n"
-            "IF none of the persons in <people> has some Power of Attorney {\n"
-            "\tDo not consider whether the identity of persons in <people> has been verified or not.\n"
-            "\tIF the attachment refers to expenses related to funeral (e.g. cemetery services and fees, church service, flowers, catering, etc.) THEN {\n"
-            "\t\tIF content in <task> requests to pay attached bills/invoices THEN {\n"
-            '\t\t\tIF (attachment amount is above 15,000.00 DKK) AND (the attachment is specifically related to food catering, gathering after funeral or tombstone costs THEN {\n'
-            "\t\t\t\tThe attachment must NOT be paid/reimbursed.\n"
-            "\t\t\t} ELSE {\n"
-            "\t\t\t\tThe attachment must be paid/reimbursed **EVEN IF** the identity of the person who created the task has not been verified.\n"
-            "\t\t\t}\n"
-            "\t\t} ELSE {\n"
-            "\t\t\tThe attachment must NOT be paid/reimbursed.\n"
-            "\t\t}\n"
-            "\t} ELSE {\n"
-            "\t}\n"
-            "}\n"
-            "If accordingly to above logic, the attachment must be paid, then if the attachment text indicates that the bill has already been paid, then the \"action\" field in your output **MUST** be to issue a reimbursement to the client.\n"
-            "If accordingly to above logic, the attachment must be paid, then if the attachment text indicates that the bill has **NOT** been paid, then the \"action\" field in your output **MUST** be to issue a payment to the person or entity who created the invoice, as specified in the attachment.\n"
-            "If accordingly to above logic, the attachment must NOT be paid, then the \"action\" field in your output **MUST** be to NOT issue a payment to the person or entity who created the invoice, as specified in the attachment.\n"
-            "  * Output your response as JSON, in the format described by the below JSON schema in <output_schema> tag.\n"
-            "\n<output_schema>\n"
-            f"{JsonSchema.get_json_schema(InspectBillTool.ResponseFormat)}"
-            "\n</output_schema>\n"
-        )
+        # Long replies: start running tool calls while the rest is generated
+        self.executor.streaming = True
 
     # ------------------------------ invoke -------------------------------- #
     def invoke(self, call: ToolCall) -> ToolCallResult:  # noqa: D401
@@ -273,7 +280,7 @@ class InspectBillTool(LabAgent):
         ctx = parent_lab.execution_context
 
         # Execute the ReAct flow with the filled command
-        command = Agent.fill_slots(self._command_template, slots)
+        command = Agent.fill_slots(InspectBillTool._COMMAND_TEMPLATE, slots)
         result: Step = self.execute(ctx, command)
 
         if result.status == Status.ERROR:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from typing import Type, TypeVar
+from typing import Any, Dict, List, Sequence, Type, TypeVar
 from pydantic import BaseModel, TypeAdapter
 
 T = TypeVar("T", bound=BaseModel)
@@ -13,8 +13,31 @@ class JsonSchema:
     1. Getting a JSON schema from a Pydantic model.
     2. Serializing a Pydantic model instance to JSON.
     3. Deserializing a JSON string to a Pydantic model instance.
+
+    Type adapters and schemas are built once per type and memoised (a race
+    at worst builds the same value twice, so no locking is needed).
     """
 
+    _adapters: Dict[Any, TypeAdapter] = {}
+    _schemas: Dict[Any, str] = {}
+
+    @staticmethod
+    def get_type_adapter(tp: Any) -> TypeAdapter:
+        """
+        Returns the (memoised) TypeAdapter for the given type.
+
+        Args:
+            tp: Any type Pydantic can validate, e.g. a model or ``List[Model]``.
+
+        Returns:
+            The TypeAdapter for the type.
+        """
+        adapter = JsonSchema._adapters.get(tp)
+        if adapter is None:
+            adapter = TypeAdapter(tp)
+            JsonSchema._adapters[tp] = adapter
+        return adapter
+
     @staticmethod
     def get_json_schema(cls: type[BaseModel]) -> str:
         """
@@ -26,12 +49,17 @@ class JsonSchema:
         Returns:
             A string containing the JSON schema for the class.
         """
-        return json.dumps(cls.model_json_schema(), separators=(",", ":"))
+        schema = JsonSchema._schemas.get(cls)
+        if schema is None:
+            schema = json.dumps(cls.model_json_schema(), separators=(",", ":"))
+            JsonSchema._schemas[cls] = schema
+        return schema
 
     @staticmethod
-    def serialize(obj: BaseModel) -> str:
+    def serialize(obj: Any) -> str:
         """
         Serializes a Pydantic model instance to a JSON string, omitting fields whose value is None.
+        Other values (e.g. dicts or lists of models) are serialized the same way.
 
         Args:
             obj: The Pydantic model instance.
@@ -39,7 +67,32 @@ class JsonSchema:
         Returns:
             The JSON string representation of the model.
         """
-        return obj.model_dump_json(exclude_none=True)
+        if isinstance(obj, BaseModel):
+            return obj.model_dump_json(exclude_none=True)
+        return (
+            JsonSchema.get_type_adapter(type(obj))
+            .dump_json(obj, exclude_none=True, serialize_as_any=True)
+            .decode("utf-8")
+        )
+
+    @staticmethod
+    def serialize_many(objs: Sequence[T], *, by_alias: bool = False) -> str:
+        """
+        Serializes a sequence of Pydantic model instances to a JSON array in one pass,
+        omitting fields whose value is None.
+
+        Args:
+            objs: The model instances; each is serialized according to its own class.
+            by_alias: Whether to use field aliases as JSON keys.
+
+        Returns:
+            The JSON string representation of the list.
+        """
+        return (
+            JsonSchema.get_type_adapter(List[BaseModel])
+            .dump_json(list(objs), exclude_none=True, by_alias=by_alias, serialize_as_any=True)
+            .decode("utf-8")
+        )
 
     @staticmethod
     def deserialize(json_str: str, cls: Type[T]) -> T:
@@ -54,5 +107,19 @@ class JsonSchema:
         Returns:
             An instance of the specified model class.
         """
-        adapter = TypeAdapter(cls)
-        return adapter.validate_json(json_str, strict=False)
+        return JsonSchema.get_type_adapter(cls).validate_json(json_str, strict=False)
+
+    @staticmethod
+    def deserialize_many(json_str: str, cls: Type[T]) -> List[T]:
+        """
+        Deserializes a JSON array into a list of instances of the specified Pydantic
+        model class, validating the whole array in one pass.
+
+        Args:
+            json_str: The JSON string to deserialize.
+            cls: The Pydantic model class of the elements.
+
+        Returns:
+            A list of instances of the specified model class.
+        """
+        return JsonSchema.get_type_adapter(List[cls]).validate_json(json_str, strict=False)
@@ -13,6 +13,8 @@ from typing import Sequence
 
 from chat_types import ToolCall, ToolCallResult
 from execution_context import ExecutionContext
+import log_config
+from run_budget import RunBudget
 from steps import Status, Step
 from tool import Tool
 from toolable_react_agent import ToolableReactAgent
@@ -20,10 +22,7 @@ from toolable_react_agent import ToolableReactAgent
 # --------------------------------------------------------------------------- #
 # Logging (equivalent to Java SimpleLogger)
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -69,6 +68,12 @@ class LabAgent(ToolableReactAgent):
             raise RuntimeError("Execution context is not set.")
         return self.execution_context.run_id
 
+    def get_run_budget(self) -> RunBudget | None:
+        """The budget of the execution context, shared with nested agents, if any."""
+        if self.execution_context is not None and self.execution_context.budget is not None:
+            return self.execution_context.budget
+        return super().get_run_budget()
+
     def get_lab_agent(self) -> "LabAgent | None":  # noqa: D401
         """
         Return the outermost :class:`LabAgent` in the call chain (may be *self*),
@@ -85,6 +90,13 @@ class LabAgent(ToolableReactAgent):
                 return inner
         return None
 
+    # ---------------------------- persistence ---------------------------- #
+    def add_step(self, step: Step) -> None:
+        """Add *step* and hand it to the context's DbConnector, if any."""
+        super().add_step(step)
+        if self.execution_context is not None:
+            self.execution_context.db.add_step(self.execution_context.run_id, step)
+
     # ------------------------- execution wrapper ------------------------- #
     def execute(self, ctx: ExecutionContext, command: str) -> Step:
         """
@@ -98,6 +110,16 @@ class LabAgent(ToolableReactAgent):
         self.execution_context = ctx
         return super().execute(command)
 
+    async def aexecute(self, ctx: ExecutionContext, command: str) -> Step:
+        """Awaitable version of :meth:`execute`."""
+        if ctx is None:
+            raise ValueError("ctx must not be None")
+        if command is None:
+            raise ValueError("command must not be None")
+
+        self.execution_context = ctx
+        return await super().aexecute(command)
+
     # ------------------------------ invoke ------------------------------- #
     def invoke(self, call: ToolCall) -> ToolCallResult:  # noqa: D401
         """
@@ -119,6 +141,12 @@ class LabAgent(ToolableReactAgent):
         if parent_lab is None or parent_lab.execution_context is None:
             return ToolCallResult.from_call(call, "ERROR: Execution context is missing.")
 
+        budget = parent_lab.execution_context.budget
+        if budget is not None and (reason := budget.exhausted()) is not None:
+            return ToolCallResult.from_call(
+                call, f"ERROR: Run budget exhausted ({reason}); {self.id} was not executed."
+            )
+
         # Delegate execution within the caller’s context
         step = self.execute(parent_lab.execution_context, question)
 
@@ -0,0 +1,484 @@
+"""llm_transport.py
+
+Transports used by :class:`agent.Agent` to send chat-completion requests.
+
+A transport takes an OpenAI request body and returns a *payload*: a plain,
+JSON-serialisable mapping with the ``finish_reason`` and ``message`` of the
+first choice (plus ``usage``, when available), which the agent converts into
+a :class:`chat_types.ChatCompletion`.
+
+- :class:`OpenAITransport`    calls OpenAI (default)
+- :class:`RecordingTransport` wraps another transport and writes every
+                              request/response to a JSONL *cassette*
+- :class:`ReplayTransport`    serves responses from a cassette, offline
+
+Transports can also stream a reply (:meth:`LlmTransport.stream`) as *chunks*:
+plain mappings with the ``delta`` of the first choice, its ``finish_reason``
+(in the last chunk) and, optionally, ``usage``. :class:`StreamedPayload`
+assembles chunks back into a payload, telling which tool calls are complete
+as soon as they are.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, AsyncIterator, ClassVar, Deque, Dict, Iterator, List, Mapping
+
+import openai
+
+import log_config
+from response_cache import ResponseCache
+
+# --------------------------------------------------------------------------- #
+# Logging configuration (equivalent to Java SimpleLogger)
+# --------------------------------------------------------------------------- #
+log_config.configure_logging()
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------------------------------------------- #
+# LlmTransport – base class
+# --------------------------------------------------------------------------- #
+class LlmTransport(ABC):
+    """
+    Sends one chat-completion request and returns its payload; *timeout* is
+    the max seconds the request may take (None == no limit).
+    """
+
+    @abstractmethod
+    def create(self, request: Mapping[str, Any], timeout: float | None = None) -> Dict[str, Any]: ...
+
+    async def acreate(
+        self, request: Mapping[str, Any], timeout: float | None = None
+    ) -> Dict[str, Any]:
+        """Awaitable version of :meth:`create`; by default runs it in a thread."""
+        return await asyncio.to_thread(self.create, request, timeout)
+
+    def stream(
+        self, request: Mapping[str, Any], timeout: float | None = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the reply to *request* as chunks; by default the whole reply
+        of :meth:`create` is returned as one chunk.
+        """
+        yield StreamedPayload.to_chunk(self.create(request, timeout))
+
+    async def astream(
+        self, request: Mapping[str, Any], timeout: float | None = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Awaitable version of :meth:`stream`."""
+        yield StreamedPayload.to_chunk(await self.acreate(request, timeout))
+
+    def close(self) -> None:
+        """Release any resource held by the transport."""
+
+
+# --------------------------------------------------------------------------- #
+# OpenAI
+# --------------------------------------------------------------------------- #
+class OpenAITransport(LlmTransport):
+    """
+    Calls OpenAI’s Chat Completions API.
+
+    Asynchronous calls go through one keep-alive HTTP session shared by the
+    whole process (see :attr:`POOL_SIZE`).
+    """
+
+    # Max number of open connections in the shared HTTP pool for asynchronous
+    # calls; set it before the first async call is made.
+    POOL_SIZE: ClassVar[int] = 100
+
+    # Idle connections are kept alive this long (seconds) to be reused.
+    KEEPALIVE_TIMEOUT: ClassVar[float] = 30.0
+
+    _aio_session: ClassVar[Any] = None  # aiohttp.ClientSession, created lazily
+    _aio_session_loop: ClassVar[asyncio.AbstractEventLoop | None] = None
+
+    def create(self, request: Mapping[str, Any], timeout: float | None = None) -> Dict[str, Any]:
+        resp = openai.ChatCompletion.create(**request, request_timeout=timeout)
+        return self.to_payload(resp)
+
+    async def acreate(
+        self, request: Mapping[str, Any], timeout: float | None = None
+    ) -> Dict[str, Any]:
+        # The SDK picks up the session from this context variable
+        openai.aiosession.set(await self._get_aio_session())
+        resp = await openai.ChatCompletion.acreate(**request, request_timeout=timeout)
+        return self.to_payload(resp)
+
+    def stream(
+        self, request: Mapping[str, Any], timeout: float | None = None
+    ) -> Iterator[Dict[str, Any]]:
+        resp = openai.ChatCompletion.create(
+            **request, stream=True, stream_options=self._STREAM_OPTIONS, request_timeout=timeout
+        )
+        for chunk in resp:
+            yield self._to_chunk(chunk)
+
+    async def astream(
+        self, request: Mapping[str, Any], timeout: float | None = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        openai.aiosession.set(await self._get_aio_session())
+        resp = await openai.ChatCompletion.acreate(
+            **request, stream=True, stream_options=self._STREAM_OPTIONS, request_timeout=timeout
+        )
+        async for chunk in resp:
+            yield self._to_chunk(chunk)
+
+    # Have the last chunk report token usage
+    _STREAM_OPTIONS: ClassVar[Dict[str, Any]] = {"include_usage": True}
+
+    @staticmethod
+    def _to_chunk(resp: Any) -> Dict[str, Any]:
+        chunk: Dict[str, Any] = {"delta": {}, "finish_reason": None}
+        if resp.choices:
+            choice = resp.choices[0]
+            delta = choice.get("delta") or {}
+            chunk["delta"] = delta.to_dict_recursive() if hasattr(delta, "to_dict_recursive") else dict(delta)
+            chunk["finish_reason"] = choice.get("finish_reason")
+        usage = resp.get("usage")
+        if usage:
+            chunk["usage"] = dict(usage)
+        return chunk
+
+    @staticmethod
+    def to_payload(resp: Any) -> Dict[str, Any]:
+        """Plain-JSON copy of the parts of *resp* needed to rebuild the reply."""
+        choice = resp.choices[0]
+        message = choice.message
+        payload_message: Dict[str, Any] = {
+            "role": message.get("role"),
+            "content": message.get("content"),
+        }
+        if "tool_calls" in message:
+            payload_message["tool_calls"] = [
+                {
+                    "id": tc["id"],
+                    "type": "function",
+                    "function": {
+                        "name": tc["function"]["name"],
+                        "arguments": tc["function"]["arguments"],
+                    },
+                }
+                for tc in message["tool_calls"]
+            ]
+
+        payload: Dict[str, Any] = {"finish_reason": choice.finish_reason, "message": payload_message}
+        usage = resp.get("usage") if hasattr(resp, "get") else None
+        if usage is not None:
+            payload["usage"] = dict(usage)
+        return payload
+
+    @staticmethod
+    async def _get_aio_session() -> Any:
+        """
+        Return the shared keep-alive HTTP session, (re)creating it when
+        missing, closed, or bound to another event loop.
+        """
+        import aiohttp  # optional dependency, only needed for async calls
+
+        loop = asyncio.get_running_loop()
+        session = OpenAITransport._aio_session
+        if session is None or session.closed or OpenAITransport._aio_session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=OpenAITransport.POOL_SIZE,
+                keepalive_timeout=OpenAITransport.KEEPALIVE_TIMEOUT,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            OpenAITransport._aio_session = session
+            OpenAITransport._aio_session_loop = loop
+        return session
+
+    @staticmethod
+    async def aclose_session() -> None:
+        """Close the HTTP connection pool shared by asynchronous calls."""
+        session = OpenAITransport._aio_session
+        OpenAITransport._aio_session = None
+        OpenAITransport._aio_session_loop = None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+# --------------------------------------------------------------------------- #
+# Record / replay
+# --------------------------------------------------------------------------- #
+class RecordingTransport(LlmTransport):
+    """
+    Forwards requests to *inner* and appends each exchange to a JSONL cassette,
+    one ``{"key", "request", "response"}`` object per line.
+
+    Parameters
+    ----------
+    inner : LlmTransport
+        Transport actually serving the requests.
+    path : str | os.PathLike
+        Cassette file; it is truncated when the transport is created.
+    """
+
+    def __init__(self, inner: LlmTransport, path: str | os.PathLike) -> None:
+        if inner is None:
+            raise ValueError("inner must not be None")
+        if path is None:
+            raise ValueError("path must not be None")
+
+        self.inner: LlmTransport = inner
+        self.path: Path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def create(self, request: Mapping[str, Any], timeout: float | None = None) -> Dict[str, Any]:
+        payload = self.inner.create(request, timeout)
+        self._record(request, payload)
+        return payload
+
+    async def acreate(
+        self, request: Mapping[str, Any], timeout: float | None = None
+    ) -> Dict[str, Any]:
+        payload = await self.inner.acreate(request, timeout)
+        self._record(request, payload)
+        return payload
+
+    def stream(
+        self, request: Mapping[str, Any], timeout: float | None = None
+    ) -> Iterator[Dict[str, Any]]:
+        streamed = StreamedPayload()
+        try:
+            for chunk in self.inner.stream(request, timeout):
+                streamed.add(chunk)
+                yield chunk
+        except GeneratorExit:
+            # Closed by the reader, e.g. at the end of a JSON reply
+            self._record_streamed(request, streamed)
+            raise
+        self._record_streamed(request, streamed)
+
+    async def astream(
+        self, request: Mapping[str, Any], timeout: float | None = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        streamed = StreamedPayload()
+        try:
+            async for chunk in self.inner.astream(request, timeout):
+                streamed.add(chunk)
+                yield chunk
+        except GeneratorExit:
+            self._record_streamed(request, streamed)
+            raise
+        self._record_streamed(request, streamed)
+
+    def _record_streamed(self, request: Mapping[str, Any], streamed: "StreamedPayload") -> None:
+        # The reply as read by the caller, completed as the caller completes it
+        streamed.finish()
+        self._record(request, streamed.payload())
+
+    def _record(self, request: Mapping[str, Any], payload: Mapping[str, Any]) -> None:
+        line = json.dumps(
+            {"key": ResponseCache.key_for(request), "request": request, "response": payload},
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+        self.inner.close()
+
+
+class ReplayTransport(LlmTransport):
+    """
+    Serves responses recorded by :class:`RecordingTransport`, without network.
+
+    Requests are matched by content (same key as :class:`ResponseCache`);
+    identical requests get their recorded responses in recording order.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Cassette file to replay.
+    latency : float
+        Seconds to wait before returning each response, to simulate the model.
+    """
+
+    def __init__(self, path: str | os.PathLike, latency: float = 0.0) -> None:
+        if path is None:
+            raise ValueError("path must not be None")
+        if latency < 0:
+            raise ValueError("latency must not be negative")
+
+        self.path: Path = Path(path)
+        self.latency: float = latency
+        self._responses: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+        with self.path.open(encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._responses[entry["key"]].append(entry["response"])
+
+    def create(self, request: Mapping[str, Any], timeout: float | None = None) -> Dict[str, Any]:
+        payload = self._next(request)
+        if self.latency:
+            time.sleep(self.latency)
+        return payload
+
+    async def acreate(
+        self, request: Mapping[str, Any], timeout: float | None = None
+    ) -> Dict[str, Any]:
+        payload = self._next(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return payload
+
+    def _next(self, request: Mapping[str, Any]) -> Dict[str, Any]:
+        key = ResponseCache.key_for(request)
+        with self._lock:
+            queue = self._responses.get(key)
+            if not queue:
+                raise LookupError(f"No recorded response in {self.path.name} for request {key}")
+            return queue.popleft()
+
+
+# --------------------------------------------------------------------------- #
+# Streaming
+# --------------------------------------------------------------------------- #
+class StreamedPayload:
+    """
+    Assembles streamed chunks into a payload (see :meth:`payload`).
+
+    A tool call is complete once the next one starts or the reply is
+    finished: :meth:`add` and :meth:`finish` return the indexes of the tool
+    calls they completed, so that they can be executed while the rest of the
+    reply is still being generated. For JSON replies, :attr:`json_complete`
+    tells when the content holds a whole JSON object, so that reading can stop
+    there.
+    """
+
+    def __init__(self) -> None:
+        self.role: str | None = None
+        self.finish_reason: str | None = None
+        self.usage: Dict[str, Any] | None = None
+        self._content: List[str] = []
+        self._tool_calls: List[Dict[str, Any]] = []
+        self._completed: int = 0  # tool calls already returned as complete
+
+        # Scanner state of the content, to find the end of a JSON object
+        self._depth: int = 0
+        self._in_string: bool = False
+        self._escape: bool = False
+        self._started: bool = False
+        self._scanning: bool = True  # False once the content is known not to be an object
+        self.json_complete: bool = False
+
+    @staticmethod
+    def to_chunk(payload: Mapping[str, Any]) -> Dict[str, Any]:
+        """The whole *payload* as a single chunk."""
+        message = dict(payload["message"])
+        if "tool_calls" in message:
+            message["tool_calls"] = [
+                {"index": i, **tc} for i, tc in enumerate(message["tool_calls"])
+            ]
+        chunk: Dict[str, Any] = {"delta": message, "finish_reason": payload["finish_reason"]}
+        if payload.get("usage") is not None:
+            chunk["usage"] = payload["usage"]
+        return chunk
+
+    def add(self, chunk: Mapping[str, Any]) -> List[int]:
+        """Add *chunk*; return the indexes of the tool calls it completed."""
+        delta = chunk.get("delta") or {}
+        if delta.get("role"):
+            self.role = delta["role"]
+        if delta.get("content"):
+            self._content.append(delta["content"])
+            self._scan(delta["content"])
+
+        completed: List[int] = []
+        for tc in delta.get("tool_calls") or ():
+            index = tc.get("index", len(self._tool_calls))
+            while len(self._tool_calls) <= index:
+                self._tool_calls.append(
+                    {"id": None, "type": "function", "function": {"name": "", "arguments": ""}}
+                )
+            # Calls are streamed one after the other: a new one closes the previous ones
+            completed += self._complete(index)
+            call = self._tool_calls[index]
+            if tc.get("id"):
+                call["id"] = tc["id"]
+            function = tc.get("function") or {}
+            call["function"]["name"] += function.get("name") or ""
+            call["function"]["arguments"] += function.get("arguments") or ""
+
+        if chunk.get("usage"):
+            self.usage = dict(chunk["usage"])
+        if chunk.get("finish_reason"):
+            self.finish_reason = chunk["finish_reason"]
+            completed += self.finish()
+        return completed
+
+    def finish(self) -> List[int]:
+        """Mark the reply as complete; return the indexes of the tool calls this completed."""
+        if self.finish_reason is None and self.json_complete:
+            self.finish_reason = "stop"  # reading stopped at the end of the object
+        if self.finish_reason in (None, "length"):
+            return []  # the last call may be cut
+        return self._complete(len(self._tool_calls))
+
+    def tool_call(self, index: int) -> Dict[str, Any]:
+        """Tool call *index*, as in a payload message."""
+        return self._tool_calls[index]
+
+    def payload(self) -> Dict[str, Any]:
+        """Payload of the reply received so far."""
+        message: Dict[str, Any] = {
+            "role": self.role or "assistant",
+            "content": "".join(self._content) if self._content else None,
+        }
+        if self._tool_calls:
+            message["tool_calls"] = self._tool_calls
+        payload: Dict[str, Any] = {"finish_reason": self.finish_reason, "message": message}
+        if self.usage is not None:
+            payload["usage"] = self.usage
+        return payload
+
+    def _complete(self, end: int) -> List[int]:
+        completed = list(range(self._completed, end))
+        self._completed = max(self._completed, end)
+        return completed
+
+    def _scan(self, text: str) -> None:
+        for ch in text:
+            if self.json_complete or not self._scanning:
+                return
+            if not self._started:
+                if ch.isspace():
+                    continue
+                if ch != "{":
+                    self._scanning = False
+                    return
+                self._started = True
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.json_complete = True
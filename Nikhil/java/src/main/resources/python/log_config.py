@@ -0,0 +1,228 @@
+"""log_config.py
+
+Central logging configuration (replaces the ``logging.basicConfig`` call each
+module used to make at import time).
+
+:func:`configure_logging` is called by every module and configures the root
+logger only once, and only if the application has not configured it already:
+records are put on a queue by a ``QueueHandler`` and written by a
+``QueueListener`` thread, so that formatting and I/O stay off the agent loop.
+Messages whose arguments are all :class:`Lazy` (see :func:`lazy_json`) are
+formatted in that thread too, so expensive values are turned into text only
+when (and if) a record is actually written.
+
+Defaults can be overridden by the environment:
+
+- ``LOG_LEVEL``          root level (default ``INFO``; ``INFO`` too if invalid)
+- ``LOG_FORMAT``         ``text`` (default) or ``json`` (one JSON object per line)
+- ``LOG_MAX_CHARS``      messages longer than this are truncated (default 20000;
+                         0 disables truncation)
+- ``LOG_PAYLOAD_SAMPLE`` fraction (0..1) of *payload* records written (default 1);
+                         payload records are those logged with ``extra=PAYLOAD``,
+                         e.g. full LLM requests
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from typing import IO, Any, Callable, Dict, Mapping, Optional
+
+TEXT_FORMAT: str = "%(asctime)s %(name)s [%(levelname)s] %(message)s"
+
+# Pass as ``extra=`` to mark a record as carrying a (large) payload
+PAYLOAD: Dict[str, Any] = {"payload": True}
+
+_listener: logging.handlers.QueueListener | None = None
+_lock = threading.Lock()
+
+
+# --------------------------------------------------------------------------- #
+# Deferred values
+# --------------------------------------------------------------------------- #
+class Lazy:
+    """
+    Logging argument computed by ``fn(*args)`` only when the record is written.
+
+    Example: ``logger.debug("Step: %s", Lazy(JsonSchema.serialize, step))``.
+    """
+
+    __slots__ = ("_fn", "_args")
+
+    def __init__(self, fn: Callable[..., Any], *args: Any) -> None:
+        self._fn = fn
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._fn(*self._args))
+
+
+def lazy_json(obj: Any) -> Lazy:
+    """*obj* as compact JSON, serialised only when the record is written."""
+    return Lazy(_dumps, obj)
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+# --------------------------------------------------------------------------- #
+# Handlers, filters and formatters
+# --------------------------------------------------------------------------- #
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Like the standard QueueHandler, merges the message with its arguments
+    before queuing the record, so that later changes to the arguments do not
+    show; messages whose arguments are all :class:`Lazy` are left to the
+    listener thread instead. The exception traceback (if any) is rendered
+    here, while it is still available; the rest of the formatting is done by
+    the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        if not _all_lazy(record.args):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _all_lazy(args: Any) -> bool:
+    values = args.values() if isinstance(args, Mapping) else (args or ())
+    return bool(values) and all(isinstance(v, Lazy) for v in values)
+
+
+class PayloadSampler(logging.Filter):
+    """Lets through only a fraction of the records marked with :data:`PAYLOAD`."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "payload", False) or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} characters truncated]"
+
+
+class TruncatingFormatter(logging.Formatter):
+    """Text formatter cutting messages longer than *max_chars*."""
+
+    def __init__(self, fmt: str, max_chars: int) -> None:
+        super().__init__(fmt)
+        self.max_chars = max_chars
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        record.message = _truncate(record.message, self.max_chars)
+        return super().formatMessage(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; messages longer than *max_chars* are cut."""
+
+    def __init__(self, max_chars: int) -> None:
+        super().__init__()
+        self.max_chars = max_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": _truncate(record.getMessage(), self.max_chars),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+# --------------------------------------------------------------------------- #
+# Setup
+# --------------------------------------------------------------------------- #
+def configure_logging(
+    level: int | str | None = None,
+    json_format: Optional[bool] = None,
+    max_chars: Optional[int] = None,
+    payload_sample_rate: Optional[float] = None,
+    stream: IO[str] | None = None,
+    force: bool = False,
+) -> None:
+    """
+    Configure the root logger, unless already done or the root logger has
+    handlers already (e.g. set up by the application); pass *force* to remove
+    them and replace the current configuration. Arguments left to None take
+    their value from the environment (see module docstring).
+    """
+    global _listener
+
+    with _lock:
+        root = logging.getLogger()
+        if (_listener is not None or root.handlers) and not force:
+            return
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+        invalid_level: str | None = None
+        if level is None:
+            level = os.getenv("LOG_LEVEL", "INFO").upper()
+            if not isinstance(logging.getLevelName(level), int):
+                invalid_level, level = level, logging.INFO
+        if json_format is None:
+            json_format = os.getenv("LOG_FORMAT", "text").lower() == "json"
+        if max_chars is None:
+            max_chars = int(os.getenv("LOG_MAX_CHARS", "20000"))
+        if payload_sample_rate is None:
+            payload_sample_rate = float(os.getenv("LOG_PAYLOAD_SAMPLE", "1"))
+
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(
+            JsonFormatter(max_chars) if json_format else TruncatingFormatter(TEXT_FORMAT, max_chars)
+        )
+
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        handler = _DeferredQueueHandler(records)
+        handler.addFilter(PayloadSampler(payload_sample_rate))
+
+        for h in list(root.handlers):
+            root.removeHandler(h)
+        root.addHandler(handler)
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+        _listener.start()
+
+    if invalid_level is not None:
+        logging.getLogger(__name__).warning(
+            "Invalid LOG_LEVEL %r, using INFO instead", invalid_level
+        )
+
+
+def shutdown_logging() -> None:
+    """Flush pending records and stop the writer thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,145 @@
+"""observation_store.py
+
+Out-of-band storage for large tool observations.
+
+When an executor uses an :class:`ObservationStore` (see
+:meth:`ExecutorModule.use_observation_store`), the full observation of every
+large tool call is kept here under a short *handle*; prompts then show older
+steps with a truncated preview and the handle, and the model can read the
+full content on demand with :class:`FetchObservationTool`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+from pydantic import Field
+
+from chat_types import ToolCall, ToolCallResult
+import log_config
+from react_agent import ReactAgent
+from tool import AbstractTool
+
+# --------------------------------------------------------------------------- #
+# Logging configuration (equivalent to Java SimpleLogger)
+# --------------------------------------------------------------------------- #
+log_config.configure_logging()
+logger = logging.getLogger(__name__)
+
+
+class ObservationStore:
+    """
+    Thread-safe map from handles to observation texts.
+
+    Handles are derived from the content, so storing the same text twice
+    (e.g. the same file read twice) returns the same handle.
+    """
+
+    HANDLE_PREFIX: str = "obs-"
+
+    def __init__(self) -> None:
+        self._payloads: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def handle_for(cls, text: str) -> str:
+        return cls.HANDLE_PREFIX + hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+    def put(self, text: str) -> str:
+        """Store *text* and return its handle."""
+        if text is None:
+            raise ValueError("text must not be None")
+
+        handle = self.handle_for(text)
+        with self._lock:
+            if handle in self._payloads:
+                return handle
+            self._payloads[handle] = text
+        logger.debug("Stored observation %s (%d characters)", handle, len(text))
+        return handle
+
+    def get(self, handle: str) -> Optional[str]:
+        """Return the text stored under *handle*, or None if there is none."""
+        return self._payloads.get(handle)
+
+    def clear(self) -> None:
+        with self._lock:
+            n = len(self._payloads)
+            self._payloads.clear()
+        if n:
+            logger.debug("Cleared %d stored observation(s)", n)
+
+    def __contains__(self, handle: object) -> bool:
+        return handle in self._payloads
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+
+class FetchObservationTool(AbstractTool):
+    """Returns (a slice of) an observation kept in an :class:`ObservationStore`."""
+
+    ID: str = "fetchObservation"
+
+    # Characters returned when no length is given
+    DEFAULT_LENGTH: int = 4000
+
+    class Parameters(ReactAgent.Parameters):
+        handle: str = Field(
+            ...,
+            alias="handle",
+            description='Handle of the observation to read (e.g. "obs-1a2b3c4d5e6f").',
+        )
+        offset: Optional[int] = Field(
+            None,
+            alias="offset",
+            description="Position of the first character to return (default 0).",
+        )
+        length: Optional[int] = Field(
+            None,
+            alias="length",
+            description="Max number of characters to return (default 4000).",
+        )
+
+        model_config = {"populate_by_name": True}
+
+    def __init__(self, store: ObservationStore) -> None:
+        if store is None:
+            raise ValueError("store must not be None")
+
+        super().__init__(
+            id_=FetchObservationTool.ID,
+            description=(
+                "Returns the full content of an observation that was shortened in <steps>, "
+                "given its handle; use offset and length to read long contents in parts."
+            ),
+            parameters_cls=FetchObservationTool.Parameters,
+        )
+        self.store: ObservationStore = store
+
+    def invoke(self, call: ToolCall) -> ToolCallResult:  # noqa: D401
+        if call is None:
+            raise ValueError("call must not be None")
+
+        handle = self.get_string("handle", call.arguments)
+        text = self.store.get(handle or "")
+        if text is None:
+            return ToolCallResult.from_call(call, f"ERROR: No observation with handle {handle}.")
+
+        args = call.arguments
+        offset = self.get_long("offset", args) if args.get("offset") is not None else 0
+        length = (
+            self.get_long("length", args) if args.get("length") is not None else self.DEFAULT_LENGTH
+        )
+        if offset < 0 or length <= 0:
+            return ToolCallResult.from_call(
+                call, "ERROR: offset must not be negative and length must be positive."
+            )
+
+        end = min(offset + length, len(text))
+        return ToolCallResult.from_call(
+            call, f"[characters {offset}-{end} of {len(text)}]\n{text[offset:end]}"
+        )
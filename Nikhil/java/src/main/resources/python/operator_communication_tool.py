@@ -21,15 +21,13 @@ from pydantic import Field
 from api import Api
 from chat_types import ToolCall, ToolCallResult
 from lab_agent import LabAgent
+import log_config
 from react_agent import ReactAgent
 
 # ------------------------------------------------------------------------------
 # Logging configuration (equivalent to Java SimpleLogger)
 # ------------------------------------------------------------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
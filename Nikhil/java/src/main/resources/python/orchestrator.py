@@ -15,16 +15,14 @@ from execution_context import ExecutionContext
 from lab_agent import LabAgent
 from peace import Peace
 from json_schema import JsonSchema
+import log_config
 from steps import Step
 from tool import Tool
 
 ##### --------------------------------------------------------------------------- #
 ##### Logging configuration (equivalent to Java SimpleLogger)
 ##### --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -93,6 +91,15 @@ class Orchestrator(LabAgent):
     # --------------------------------------------------------------------- #
     # Default process execution
     # --------------------------------------------------------------------- #
+    PROCESS_DESCRIPTION: str = (
+        "Run the below process described in pseudo-code inside <process> tag.\n\n"
+        "<process>\n"
+        'Check for any unassigned payment task (Step Name="Handle Account 1") and assign '
+        "the oldest created payment task to you.\n\n"
+        'Assign to you any unassigned payment task (Step Name="Handle Account 1") for the '
+        "same estate (Client Number).</process>"
+    )
+
     def execute(self, ctx: ExecutionContext) -> Step:  # noqa: D401
         """
         Run the default process inside *ctx*.
@@ -100,16 +107,16 @@ class Orchestrator(LabAgent):
         if ctx is None:
             raise ValueError("ctx must not be None")
 
-        process_description = (
-            "Run the below process described in pseudo-code inside <process> tag.\n\n"
-            "<process>\n"
-            'Check for any unassigned payment task (Step Name="Handle Account 1") and assign '
-            "the oldest created payment task to you.\n\n"
-            'Assign to you any unassigned payment task (Step Name="Handle Account 1") for the '
-            "same estate (Client Number).</process>"
-        )
+        return super().execute(ctx, self.PROCESS_DESCRIPTION)
+
+    async def aexecute(self, ctx: ExecutionContext) -> Step:  # noqa: D401
+        """
+        Awaitable version of :meth:`execute`.
+        """
+        if ctx is None:
+            raise ValueError("ctx must not be None")
 
-        return super().execute(ctx, process_description)
+        return await super().aexecute(ctx, self.PROCESS_DESCRIPTION)
 
     # --------------------------------------------------------------------- #
     # Entry-point for manual testing (mirrors Java `main`)
@@ -15,26 +15,25 @@ from __future__ import annotations
 import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Mapping, Optional, Sequence
+from typing import Any, ClassVar, Dict, List, Literal, Mapping, Optional, Sequence
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from api import Api
 from execution_context import ExecutionContext
 from json_schema import JsonSchema
 from lab_agent import LabAgent
+import log_config
 from react_agent import ReactAgent
 from scenario_component import ScenarioComponent
 from steps import Status
+from task_store import TaskStore
 from tool import ToolCallResult
 
 # --------------------------------------------------------------------------- #
 # Logging configuration (equivalent to Java SimpleLogger)
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -82,6 +81,23 @@ class Peace(LabAgent):
 
         model_config = {"populate_by_name": True, "extra": "ignore"}
 
+        # Format of "Time Created" and "Due Date" (e.g. "4/16/2025, 2:31 PM")
+        TIME_FORMAT: ClassVar[str] = "%m/%d/%Y, %I:%M %p"
+
+        _created_at: Optional[datetime] = PrivateAttr(default=None)
+
+        def model_post_init(self, __context: Any) -> None:
+            # Parsed once at load time, so tasks can be sorted chronologically
+            try:
+                self._created_at = datetime.strptime(self.time_created.strip(), self.TIME_FORMAT)
+            except ValueError:
+                logger.warning("Cannot parse Time Created: %r", self.time_created)
+
+        @property
+        def created_at(self) -> Optional[datetime]:
+            """Time Created as a datetime, or None if it could not be parsed."""
+            return self._created_at
+
         # ------------------------ fluent Builder ------------------------ #
         class Builder:
             def __init__(self) -> None:
@@ -190,27 +206,26 @@ class Peace(LabAgent):
     # --------------------------------------------------------------------- #
     # API definitions
     # --------------------------------------------------------------------- #
-    # Helper to (de)serialise lists of Task/Person ------------------------- #
-    @staticmethod
-    def _to_json(objs: Sequence[BaseModel]) -> str:
-        return json.dumps(
-            [o.model_dump(exclude_none=True, by_alias=True) for o in objs],
-            separators=(",", ":"),
-        )
-
+    # Helper to deserialise lists of Task/Person -------------------------- #
     @staticmethod
     def _from_json_tasks(s: str) -> List["Peace.Task"]:
-        data = json.loads(s or "[]")
-        return [Peace.Task.model_validate(o) for o in data]
+        return JsonSchema.deserialize_many(s or "[]", Peace.Task)
 
     @staticmethod
     def _from_json_persons(s: str) -> List["Peace.Person"]:
-        data = json.loads(s or "[]")
-        return [Peace.Person.model_validate(o) for o in data]
+        return JsonSchema.deserialize_many(s or "[]", Peace.Person)
+
+    @staticmethod
+    def _unassigned_tasks(ctx: ExecutionContext, scenario: str) -> TaskStore:
+        """Unassigned tasks of *ctx*; loaded from the scenario on first use."""
+        if ctx.unassigned_tasks is None:
+            tasks_json = ScenarioComponent.get_instance().get(scenario, "getUnassignedTasks", {})
+            ctx.unassigned_tasks = TaskStore(Peace._from_json_tasks(tasks_json))
+        return ctx.unassigned_tasks
 
     # ---------------- getUnassignedTasks ---------------------------------- #
     class GetUnassignedTasksApi(Api):
-        class Parameters(ReactAgent.Parameters):
+        class Parameters(ReactAgent.Parameters, Api.PageParameters):
             filter_by: Optional[str] = Field(
                 None,
                 alias="filterBy",
@@ -229,13 +244,23 @@ class Peace(LabAgent):
                 alias="customerNumber",
                 description="If provided, only tasks for this client are returned.",
             )
-
+            order: Optional[Literal["oldest", "newest"]] = Field(
+                None,
+                alias="order",
+                description=(
+                    'If provided, tasks are sorted by "Time Created": "oldest" first or '
+                    '"newest" first (e.g. order="oldest" and limit=1 returns only the oldest task).'
+                ),
+            )
             model_config = {"populate_by_name": True}
 
         def __init__(self) -> None:
             super().__init__(
                 id_="getUnassignedTasks",
-                description="Returns a list of unassigned tasks, optionally filtered.",
+                description=(
+                    "Returns a list of unassigned tasks, optionally filtered, sorted by "
+                    "creation time and paged."
+                ),
                 schema=Peace.GetUnassignedTasksApi.Parameters,
             )
 
@@ -251,24 +276,30 @@ class Peace(LabAgent):
             if log:
                 self.get_lab_agent().execution_context.log_api_call(scenario, self.id, args)
 
-            ctx = self.get_execution_context()
-            if ctx.unassigned_tasks is None:
-                tasks_json = ScenarioComponent.get_instance().get(scenario, self.id, {})
-                ctx.unassigned_tasks = Peace._from_json_tasks(tasks_json)
+            tasks = Peace._unassigned_tasks(self.get_execution_context(), scenario)
 
             filter_by = self.get_string("filterBy", call.arguments, None)
             filter_val = self.get_string("filterValue", call.arguments, None)
             if filter_by and filter_val is None:
                 raise ValueError(f"Must provide filterValue for filterBy={filter_by}")
             customer_number = self.get_string("customerNumber", call.arguments, None)
-
-            filtered = ExecutionContext.filter_tasks(
-                ctx.unassigned_tasks,
-                filter_by,
-                filter_val,
-                customer_number,
-            )
-            return ToolCallResult.from_call(call, Peace._to_json(filtered))
+            order = self.get_string("order", call.arguments, None)
+            if order not in (None, "oldest", "newest"):
+                raise ValueError(f'order must be "oldest" or "newest", not "{order}"')
+
+            # Only the tasks up to the end of the requested page are selected
+            offset, page_size = self.page_window(call.arguments)
+            limit = None if page_size is None else offset + page_size
+            with TaskStore.locked(tasks):
+                filtered = tasks.filter(
+                    filter_by,
+                    filter_val,
+                    customer_number,
+                    order=order,
+                    limit=limit,
+                )
+                total = None if limit is None else tasks.count(filter_by, filter_val, customer_number)
+            return ToolCallResult.from_call(call, self.page(filtered, call.arguments, total=total))
 
     # ---------------- assignTask ------------------------------------------ #
     class AssignTaskApi(Api):
@@ -331,24 +362,20 @@ class Peace(LabAgent):
                 )
 
             # task already assigned?
-            for t in ctx.operator_tasks:
-                if t.time_created == time_created and t.customer_number == customer_number:
-                    return ToolCallResult.from_call(
-                        call,
-                        f"ERROR: Task with timeCreated={time_created} and "
-                        f"customerNumber={customer_number} is already assigned to operator ID=42",
-                    )
+            if (customer_number, time_created) in ctx.operator_tasks:
+                return ToolCallResult.from_call(
+                    call,
+                    f"ERROR: Task with timeCreated={time_created} and "
+                    f"customerNumber={customer_number} is already assigned to operator ID=42",
+                )
 
             # move task
-            for i, t in enumerate(ctx.unassigned_tasks):
-                if t.time_created == time_created and t.customer_number == customer_number:
-                    ctx.unassigned_tasks.pop(i)
-                    ctx.operator_tasks.append(t)
-                    return ToolCallResult.from_call(
-                        call,
-                        f"Task with timeCreated={time_created} and customerNumber={customer_number} "
-                        f"has been successfully assigned to operator {operator_id}",
-                    )
+            if ctx.unassigned_tasks.move_to(customer_number, time_created, ctx.operator_tasks):
+                return ToolCallResult.from_call(
+                    call,
+                    f"Task with timeCreated={time_created} and customerNumber={customer_number} "
+                    f"has been successfully assigned to operator {operator_id}",
+                )
 
             return ToolCallResult.from_call(
                 call,
@@ -356,9 +383,142 @@ class Peace(LabAgent):
                 f"customerNumber={customer_number} exists.",
             )
 
+    # ---------------- bulkAssignTasks ------------------------------------- #
+    class BulkAssignTasksApi(Api):
+        class TaskKey(BaseModel):
+            time_created: str = Field(
+                ...,
+                alias="timeCreated",
+                description='Time created ("mm/dd/yyyy, hh:mm AM/PM").',
+            )
+            customer_number: str = Field(
+                ...,
+                alias="customerNumber",
+                description="Unique customer number of the estate.",
+            )
+
+            model_config = {"populate_by_name": True}
+
+        class Parameters(ReactAgent.Parameters):
+            step_name: Optional[str] = Field(
+                None,
+                alias="stepName",
+                description="If provided, only unassigned tasks with this Step Name are assigned.",
+            )
+            customer_number: Optional[str] = Field(
+                None,
+                alias="customerNumber",
+                description="If provided, only unassigned tasks for this client are assigned.",
+            )
+            tasks: Optional[List[TaskKey]] = Field(
+                None,
+                alias="tasks",
+                description=(
+                    "Explicit list of tasks to assign; use it instead of stepName/customerNumber."
+                ),
+            )
+            operator_id: str = Field(
+                ...,
+                alias="operatorId",
+                description="Identifier of the operator (always 42).",
+            )
+
+            model_config = {"populate_by_name": True}
+
+        def __init__(self) -> None:
+            super().__init__(
+                id_="bulkAssignTasks",
+                description=(
+                    "Assigns to the operator with operatorId, in one go, either all unassigned "
+                    "tasks matching stepName and/or customerNumber, or the tasks listed in tasks. "
+                    "Returns the outcome for each task."
+                ),
+                schema=Peace.BulkAssignTasksApi.Parameters,
+            )
+
+        def invoke(self, call, *, log: bool = False):  # noqa: D401
+            if not self.is_initialized():
+                raise ValueError("Tool must be initialized.")
+
+            args: Dict[str, Any] = dict(call.arguments)
+            args.pop("thought", None)
+
+            operator_id = self.get_string("operatorId", args)
+            if operator_id != "42":
+                return ToolCallResult.from_call(
+                    call,
+                    "ERROR: You are trying to assign tasks to an operator other than yourself.",
+                )
+
+            step_name = self.get_string("stepName", args, None)
+            customer_number = self.get_string("customerNumber", args, None)
+            keys = [
+                Peace.BulkAssignTasksApi.TaskKey.model_validate(k)
+                for k in (args.get("tasks") or [])
+            ]
+            if keys and (step_name or customer_number):
+                return ToolCallResult.from_call(
+                    call, "ERROR: Provide either stepName/customerNumber or tasks, not both."
+                )
+            if not (keys or step_name or customer_number):
+                return ToolCallResult.from_call(
+                    call, "ERROR: Provide stepName and/or customerNumber, or a list of tasks."
+                )
+
+            scenario = self.get_lab_agent().get_scenario_id()
+            ctx = self.get_execution_context()
+            tasks = Peace._unassigned_tasks(ctx, scenario)
+
+            # Check and move all tasks as one transaction
+            results: List[Dict[str, str]] = []
+            with TaskStore.locked(tasks, ctx.operator_tasks):
+                if not keys:
+                    keys = [
+                        Peace.BulkAssignTasksApi.TaskKey(
+                            time_created=t.time_created, customer_number=t.customer_number
+                        )
+                        for t in tasks.filter(
+                            "Step Name" if step_name else None, step_name, customer_number
+                        )
+                    ]
+
+                for k in keys:
+                    if (k.customer_number, k.time_created) in ctx.operator_tasks:
+                        outcome = "ERROR: already assigned to operator ID=42"
+                    elif tasks.move_to(
+                        k.customer_number, k.time_created, ctx.operator_tasks
+                    ):
+                        outcome = "assigned"
+                    else:
+                        outcome = "ERROR: no such task"
+                    results.append(
+                        {
+                            "timeCreated": k.time_created,
+                            "customerNumber": k.customer_number,
+                            "result": outcome,
+                        }
+                    )
+
+            assigned = [
+                {"timeCreated": r["timeCreated"], "customerNumber": r["customerNumber"]}
+                for r in results
+                if r["result"] == "assigned"
+            ]
+
+            # always log, as one entry for the whole batch
+            self.get_lab_agent().execution_context.log_api_call(
+                scenario, self.id, {**args, "assignedTasks": assigned}
+            )
+
+            return ToolCallResult.from_call(
+                call,
+                f"{len(assigned)} of {len(results)} task(s) assigned to operator {operator_id}: "
+                + json.dumps(results, ensure_ascii=False, separators=(",", ":")),
+            )
+
     # ---------------- getMyTasks ------------------------------------------ #
     class GetMyTasksApi(Api):
-        class Parameters(ReactAgent.Parameters):
+        class Parameters(ReactAgent.Parameters, Api.PageParameters):
             operator_id: str = Field(
                 ...,
                 alias="operatorId",
@@ -389,8 +549,8 @@ class Peace(LabAgent):
             if operator_id != "42":
                 return ToolCallResult.from_call(call, "[]")  # empty list
 
-            tasks_json = Peace._to_json(self.get_execution_context().operator_tasks)
-            return ToolCallResult.from_call(call, tasks_json)
+            tasks = list(self.get_execution_context().operator_tasks)
+            return ToolCallResult.from_call(call, self.page(tasks, args))
 
     # ---------------- closeTask ------------------------------------------- #
     class CloseTaskApi(Api):
@@ -423,18 +583,16 @@ class Peace(LabAgent):
             customer_number = self.get_string("customerNumber", args)
 
             ctx = self.get_execution_context()
-            for i, t in enumerate(ctx.operator_tasks):
-                if t.time_created == time_created and t.customer_number == customer_number:
-                    # always log
-                    scenario = self.get_lab_agent().get_scenario_id()
-                    self.get_lab_agent().execution_context.log_api_call(scenario, self.id, args)
+            if ctx.operator_tasks.remove(customer_number, time_created) is not None:
+                # always log
+                scenario = self.get_lab_agent().get_scenario_id()
+                self.get_lab_agent().execution_context.log_api_call(scenario, self.id, args)
 
-                    ctx.operator_tasks.pop(i)
-                    return ToolCallResult.from_call(
-                        call,
-                        f"Task with timeCreated={time_created} and customerNumber={customer_number} "
-                        "has been successfully closed.",
-                    )
+                return ToolCallResult.from_call(
+                    call,
+                    f"Task with timeCreated={time_created} and customerNumber={customer_number} "
+                    "has been successfully closed.",
+                )
 
             return ToolCallResult.from_call(
                 call,
@@ -536,10 +694,7 @@ class Peace(LabAgent):
             customer_number = self.get_string("customerNumber", args, "null")
 
             ctx = self.get_execution_context()
-            task = ExecutionContext.filter_tasks(
-                ctx.operator_tasks, "Time Created", time_created, customer_number
-            )
-            if len(task) != 1:
+            if ctx.operator_tasks.get(customer_number, time_created) is None:
                 return ToolCallResult.from_call(
                     call,
                     f"ERROR: No assigned task with Time Created = {time_created} "
@@ -560,7 +715,7 @@ class Peace(LabAgent):
 
     # ---------------- getRelatedPersons ---------------------------------- #
     class GetRelatedPersonsApi(Api):
-        class Parameters(ReactAgent.Parameters):
+        class Parameters(ReactAgent.Parameters, Api.PageParameters):
             customer_number: str = Field(..., alias="customerNumber")
 
             model_config = {"populate_by_name": True}
@@ -590,21 +745,24 @@ class Peace(LabAgent):
 
                 return ToolCallResult.from_call(
                     call,
-                    Peace._to_json(ctx.related_persons.values()),
+                    self.page(list(ctx.related_persons.values()), call.arguments),
                 )
 
             # first invocation → defer to canned data
-            persons_result = super().invoke(call, log)
+            persons_result = super().invoke(call, log=log)
             if "ERROR" in str(persons_result.result):
                 return persons_result
 
             person_list = Peace._from_json_persons(str(persons_result.result))
             ctx.related_persons = {p.customer_number: p for p in person_list}
 
-            return ToolCallResult.from_call(call, Peace._to_json(person_list))
+            return ToolCallResult.from_call(call, self.page(person_list, call.arguments))
 
     # ---------------- updatePersonData ----------------------------------- #
     class UpdatePersonDataApi(Api):
+        # Reads, then replaces person records
+        max_concurrency = 1
+
         class Parameters(ReactAgent.Parameters):
             customer_number: str = Field(..., alias="customerNumber")
             relation_to_estate: Optional[str] = Field(None, alias="relationToEstate")
@@ -639,31 +797,65 @@ class Peace(LabAgent):
             self.get_lab_agent().execution_context.log_api_call(scenario, self.id, args)
 
             customer_number = self.get_string("customerNumber", args, "null")
-            person = self.get_execution_context().related_persons.get(customer_number)  # type: ignore[union-attr]
+            persons = self.get_execution_context().related_persons
+            person = persons.get(customer_number)  # type: ignore[union-attr]
             if person is None:
                 return ToolCallResult.from_call(
                     call,
                     f"ERROR: Cannot update non-existing customer with Customer Number={customer_number}",
                 )
 
-            # update fields if provided
-            for fld in (
-                "relationToEstate",
-                "name",
-                "identificationCompleted",
-                "powerOfAttorneyType",
-                "address",
-                "email",
-                "phoneNumber",
-            ):
-                if fld in args and args[fld]:
-                    setattr(person, Peace.Person.model_fields[fld].alias, args[fld])  # type: ignore[arg-type]
+            # update fields if provided; persons may be shared with forks of
+            # the context, so the record is replaced, not changed in place
+            update = {
+                name: args[f.alias]
+                for name, f in Peace.UpdatePersonDataApi.Parameters.model_fields.items()
+                if name in Peace.Person.model_fields
+                and name != "customer_number"
+                and args.get(f.alias)
+            }
+            persons[customer_number] = person.model_copy(update=update)  # type: ignore[index]
 
             return ToolCallResult.from_call(
                 call,
                 f"Data for Customer Number={customer_number} have been updated successfully.",
             )
 
+    # --------------------------------------------------------------------- #
+    # Context (verbatim from Java); built once, as it embeds the JSON schemas
+    # --------------------------------------------------------------------- #
+    _CONTEXT: ClassVar[str] = (
+        "  * Documents you handle are in Danish, this means sometime you have to translate "
+        'tool calls parameters. For example, "Customer Number" is sometimes indicated as '
+        '"afdøde CPR" or "CPR" in documents.\n'
+        "  * Probate Certificate is a document that lists heirs for one estate; it is "
+        'sometime indicated as "SKS".\n'
+        "  * Power of Attorney document (PoA) is a document that define people's legal rights "
+        "over the estate's asset. It is sometime indicated as \"PoA\".\n"
+        "  * Proforma Document is a document containing the amount of cash available on "
+        "estate's account at the time of their death.\n"
+        "  * Probate Court (Skifteretten) Notification Letter is an official letter from "
+        "Skifteretten informing the heirs about the opening of an estate after a person’s "
+        "death; this is NOT same as SKS, even it might notify heirs that SKS has been issued.\n"
+        "  * When asked to determine the type of an attachment, don't simply provide the "
+        "file name but try to infer its type and provide a short summary of contents.\n"
+        "  * To indicate time stamps, always use \"mm/dd/yyyy, hh:mm AM/PM\" format "
+        '(e.g. "4/16/2025, 2:31 PM").\n'
+        "  * For amounts, always use the format NNN,NNN.NN CCC (e.g. \"2,454.33 DKK\").\n"
+        f"  * Tasks are described by the below JSON schema:\n{JsonSchema.get_json_schema(Task)}\n"
+        "  * Payment tasks are identified by having Step Name=\"Handle Account 1\".\n"
+        "  * When asked to provide the content of a task or an attachment, STRICTLY provide "
+        "the complete content without summarisation, unless explicitly requested.\n"
+        "  * Data about persons related to estates are described by the below JSON schema:\n"
+        f"{JsonSchema.get_json_schema(Person)}\n"
+        "  * Persons are uniquely identified by their Customer Number (sometimes CPR).\n"
+        "  * When asked to update person's data, you do not need to retrieve the full record; "
+        "just update the fields provided by the user, ignoring others.\n"
+        "  * When writing diary entries you MUST use one of the predefined categories.\n"
+        "  * The diary is not to be used for normal communication; create entries only when "
+        "explicitly instructed.\n"
+    )
+
     # --------------------------------------------------------------------- #
     # Construction
     # --------------------------------------------------------------------- #
@@ -677,6 +869,7 @@ class Peace(LabAgent):
             tools=(
                 Peace.GetUnassignedTasksApi(),
                 Peace.AssignTaskApi(),
+                Peace.BulkAssignTasksApi(),
                 Peace.GetMyTasksApi(),
                 Peace.CloseTaskApi(),
                 Peace.GetTaskContentApi(),
@@ -688,38 +881,7 @@ class Peace(LabAgent):
             ),
         )
 
-        # context (verbatim from Java)
-        self.context = (
-            "  * Documents you handle are in Danish, this means sometime you have to translate "
-            'tool calls parameters. For example, "Customer Number" is sometimes indicated as '
-            '"afdøde CPR" or "CPR" in documents.\n'
-            "  * Probate Certificate is a document that lists heirs for one estate; it is "
-            'sometime indicated as "SKS".\n'
-            "  * Power of Attorney document (PoA) is a document that define people's legal rights "
-            "over the estate's asset. It is sometime indicated as \"PoA\".\n"
-            "  * Proforma Document is a document containing the amount of cash available on "
-            "estate's account at the time of their death.\n"
-            "  * Probate Court (Skifteretten) Notification Letter is an official letter from "
-            "Skifteretten informing the heirs about the opening of an estate after a person’s "
-            "death; this is NOT same as SKS, even it might notify heirs that SKS has been issued.\n"
-            "  * When asked to determine the type of an attachment, don't simply provide the "
-            "file name but try to infer its type and provide a short summary of contents.\n"
-            "  * To indicate time stamps, always use \"mm/dd/yyyy, hh:mm AM/PM\" format "
-            '(e.g. "4/16/2025, 2:31 PM").\n'
-            "  * For amounts, always use the format NNN,NNN.NN CCC (e.g. \"2,454.33 DKK\").\n"
-            f"  * Tasks are described by the below JSON schema:\n{JsonSchema.get_json_schema(Peace.Task)}\n"
-            "  * Payment tasks are identified by having Step Name=\"Handle Account 1\".\n"
-            "  * When asked to provide the content of a task or an attachment, STRICTLY provide "
-            "the complete content without summarisation, unless explicitly requested.\n"
-            "  * Data about persons related to estates are described by the below JSON schema:\n"
-            f"{JsonSchema.get_json_schema(Peace.Person)}\n"
-            "  * Persons are uniquely identified by their Customer Number (sometimes CPR).\n"
-            "  * When asked to update person's data, you do not need to retrieve the full record; "
-            "just update the fields provided by the user, ignoring others.\n"
-            "  * When writing diary entries you MUST use one of the predefined categories.\n"
-            "  * The diary is not to be used for normal communication; create entries only when "
-            "explicitly instructed.\n"
-        )
+        self.context = Peace._CONTEXT
 
         # examples (verbatim from Java)
         self.examples = (
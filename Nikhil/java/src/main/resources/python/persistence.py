@@ -0,0 +1,355 @@
+"""persistence.py
+
+Buffered persistence of run data (Steps and :class:`ExecutionContext.LogEntry`
+records) behind the :class:`ExecutionContext.DbConnector` hook.
+
+:class:`BufferedDbConnector` only appends to an in-memory buffer when a step
+or a log entry is added, so that ``ReactAgent.add_step`` and
+``ExecutionContext.log`` never wait for I/O; a background thread writes the
+buffered records, grouped by run, as soon as *max_batch* of them are pending
+or *max_delay* seconds after the oldest one was buffered, whichever comes
+first. :meth:`BufferedDbConnector.flush` writes everything pending right away
+and :meth:`BufferedDbConnector.close` flushes and stops the thread.
+
+Records are serialised when they are written, not when they are added: a Step
+that is still being updated (e.g. a tool call whose nested steps are not
+finished yet) is stored in the state it has at flush time.
+
+:class:`SqliteDbConnector` is the reference implementation::
+
+    db = SqliteDbConnector("runs.sqlite")
+    try:
+        step = Orchestrator().execute(ExecutionContext(db, "scenario-01", "run-0001"))
+    finally:
+        db.close()
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from execution_context import ExecutionContext
+from json_schema import JsonSchema
+import log_config
+from steps import Step
+
+# --------------------------------------------------------------------------- #
+# Logging configuration (equivalent to Java SimpleLogger)
+# --------------------------------------------------------------------------- #
+log_config.configure_logging()
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------------------------------------------- #
+# BufferedDbConnector – base class
+# --------------------------------------------------------------------------- #
+class BufferedDbConnector(ExecutionContext.DbConnector):
+    """
+    DbConnector that buffers records in memory and writes them in batches
+    from a background thread; sub-classes only implement :meth:`_write_batch`.
+
+    Parameters
+    ----------
+    max_batch : int
+        Pending records that trigger a write.
+    max_delay : float
+        Max seconds a record stays in the buffer before being written.
+    """
+
+    DEFAULT_MAX_BATCH: int = 200
+    DEFAULT_MAX_DELAY: float = 2.0
+
+    @dataclass
+    class Batch:
+        """Records of one run, in the order they were added."""
+
+        run_id: str
+        # (sequence number within the run, counted from the first record this
+        # connector added for it; see _write_batch(), record)
+        steps: List[Tuple[int, Step]] = field(default_factory=list)
+        log_entries: List[Tuple[int, ExecutionContext.LogEntry]] = field(default_factory=list)
+
+        def __len__(self) -> int:
+            return len(self.steps) + len(self.log_entries)
+
+    def __init__(
+        self,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be positive")
+        if max_delay <= 0:
+            raise ValueError("max_delay must be positive")
+
+        self.max_batch: int = max_batch
+        self.max_delay: float = max_delay
+
+        self._pending: Dict[str, BufferedDbConnector.Batch] = {}
+        self._pending_count: int = 0
+        self._oldest: float | None = None  # monotonic time the oldest pending record was added
+        self._step_seq: Dict[str, int] = {}
+        self._entry_seq: Dict[str, int] = {}
+        self._closed: bool = False
+
+        self._lock = threading.Lock()  # guards the buffer
+        self._write_lock = threading.Lock()  # serialises writes
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = threading.Thread(
+            target=self._run, name=f"{type(self).__name__}-flusher", daemon=True
+        )
+        self._thread.start()
+
+    # ------------------------------------------------------------------ #
+    # DbConnector
+    # ------------------------------------------------------------------ #
+    def add_step(self, run_id: str, step: Step) -> None:
+        if run_id is None:
+            raise ValueError("run_id must not be None")
+        if step is None:
+            raise ValueError("step must not be None")
+
+        with self._lock:
+            seq = self._next(self._step_seq, run_id)
+            self._batch(run_id).steps.append((seq, step))
+            self._added()
+
+    def add_log_entry(self, run_id: str, entry: ExecutionContext.LogEntry) -> None:
+        if run_id is None:
+            raise ValueError("run_id must not be None")
+        if entry is None:
+            raise ValueError("entry must not be None")
+
+        with self._lock:
+            seq = self._next(self._entry_seq, run_id)
+            self._batch(run_id).log_entries.append((seq, entry))
+            self._added()
+
+    def flush(self) -> None:
+        """Write all pending records now."""
+        with self._write_lock:
+            with self._lock:
+                batches = self._take()
+            self._write(batches)
+
+    def close(self) -> None:
+        """Flush pending records and stop the background thread; idempotent."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join()
+        self.flush()
+        self._close()
+
+    def __enter__(self) -> "BufferedDbConnector":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ #
+    # Storage (sub-classes)
+    # ------------------------------------------------------------------ #
+    @abstractmethod
+    def _write_batch(self, batches: List["BufferedDbConnector.Batch"]) -> None:
+        """
+        Persist *batches* (one per run); called by one thread at a time.
+        Records of a run already stored (e.g. a re-run) must be numbered after
+        the stored ones.
+        """
+
+    def _close(self) -> None:
+        """Release storage resources; called once, after the last write."""
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _next(counters: Dict[str, int], run_id: str) -> int:
+        seq = counters.get(run_id, 0)
+        counters[run_id] = seq + 1
+        return seq
+
+    def _batch(self, run_id: str) -> "BufferedDbConnector.Batch":
+        if self._closed:
+            raise RuntimeError("Connector is closed.")
+        batch = self._pending.get(run_id)
+        if batch is None:
+            batch = self._pending[run_id] = BufferedDbConnector.Batch(run_id)
+        return batch
+
+    def _added(self) -> None:
+        self._pending_count += 1
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+            self._wakeup.notify()  # start the max_delay clock
+        elif self._pending_count >= self.max_batch:
+            self._wakeup.notify()
+
+    def _take(self) -> List["BufferedDbConnector.Batch"]:
+        batches = list(self._pending.values())
+        self._pending = {}
+        self._pending_count = 0
+        self._oldest = None
+        return batches
+
+    def _write(self, batches: List["BufferedDbConnector.Batch"]) -> None:
+        if not batches:
+            return
+        try:
+            self._write_batch(batches)
+        except Exception:  # noqa: BLE001  (the agents must keep running)
+            logger.error(
+                "Failed to persist %d record(s) of run(s) %s",
+                sum(len(b) for b in batches),
+                ", ".join(b.run_id for b in batches),
+                exc_info=True,
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed:
+                    if self._pending_count >= self.max_batch:
+                        break
+                    if self._oldest is None:
+                        self._wakeup.wait()
+                        continue
+                    remaining = self._oldest + self.max_delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wakeup.wait(remaining)
+                if self._closed:
+                    return  # close() writes what is left
+            self.flush()
+
+
+# --------------------------------------------------------------------------- #
+# SqliteDbConnector
+# --------------------------------------------------------------------------- #
+class SqliteDbConnector(BufferedDbConnector):
+    """
+    Stores steps and log entries in a SQLite database file, one transaction
+    per flush. Several processes can share the same file.
+
+    Tables:
+
+    - ``steps(run_id, seq, actor, status, json, created)``
+    - ``log_entries(run_id, seq, type, json, created)``
+
+    where ``json`` is the serialised Step (nested steps included) or LogEntry.
+    Records of a run id that is already stored (e.g. a re-run) are numbered
+    after the existing ones; a record is never overwritten.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Database file; created if missing.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_batch: int = BufferedDbConnector.DEFAULT_MAX_BATCH,
+        max_delay: float = BufferedDbConnector.DEFAULT_MAX_DELAY,
+    ) -> None:
+        if path is None:
+            raise ValueError("path must not be None")
+
+        self.path: str = os.fspath(path)
+        self._conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS steps ("
+            " run_id TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " actor TEXT,"
+            " status TEXT,"
+            " json TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " PRIMARY KEY (run_id, seq))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS log_entries ("
+            " run_id TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " type TEXT NOT NULL,"
+            " json TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " PRIMARY KEY (run_id, seq))"
+        )
+        self._conn.commit()
+        # (table, run_id) -> sequence number of the first record written by this connector
+        self._offsets: Dict[Tuple[str, str], int] = {}
+        super().__init__(max_batch=max_batch, max_delay=max_delay)
+
+    def _write_batch(self, batches: List[BufferedDbConnector.Batch]) -> None:
+        now = time.time()
+        steps = [
+            (
+                b.run_id,
+                seq,
+                step.actor,
+                step.status.value if step.status else None,
+                JsonSchema.serialize(step),
+                now,
+            )
+            for b in batches
+            for seq, step in b.steps
+        ]
+        entries = [
+            (b.run_id, seq, str(entry.type), _entry_json(entry), now)
+            for b in batches
+            for seq, entry in b.log_entries
+        ]
+        with self._conn:  # one transaction
+            # Taken before reading the stored numbers, so that writers sharing
+            # the file cannot number their records alike
+            self._conn.execute("BEGIN IMMEDIATE")
+            steps = [
+                (run_id, self._offset("steps", run_id) + seq, *rest)
+                for run_id, seq, *rest in steps
+            ]
+            entries = [
+                (run_id, self._offset("log_entries", run_id) + seq, *rest)
+                for run_id, seq, *rest in entries
+            ]
+            self._conn.executemany(
+                "INSERT INTO steps (run_id, seq, actor, status, json, created)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                steps,
+            )
+            self._conn.executemany(
+                "INSERT INTO log_entries (run_id, seq, type, json, created)"
+                " VALUES (?, ?, ?, ?, ?)",
+                entries,
+            )
+        logger.debug("Persisted %d step(s) and %d log entry(ies)", len(steps), len(entries))
+
+    def _offset(self, table: str, run_id: str) -> int:
+        # Records of a run id already stored are numbered after the stored ones
+        key = (table, run_id)
+        offset = self._offsets.get(key)
+        if offset is None:
+            (offset,) = self._conn.execute(
+                f"SELECT COALESCE(MAX(seq) + 1, 0) FROM {table} WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            self._offsets[key] = offset
+        return offset
+
+    def _close(self) -> None:
+        self._conn.close()
+
+
+def _entry_json(entry: ExecutionContext.LogEntry) -> str:
+    return json.dumps(asdict(entry), ensure_ascii=False, default=str)
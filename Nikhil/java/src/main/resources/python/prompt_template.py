@@ -0,0 +1,96 @@
+"""prompt_template.py
+
+Compiled ``{{slot}}`` templates (see :meth:`Agent.fill_slots`).
+
+A template is parsed once into its literal parts and slot names; rendering
+then only joins strings, instead of running a regular expression over the
+whole text each time. :meth:`PromptTemplate.bind` fills the slots whose value
+does not change between calls (e.g. agent context, examples or tool
+descriptions) once, so that later renders only substitute the dynamic ones::
+
+    personality = PromptTemplate.compile(TEMPLATE).bind({"context": ctx})
+    ...
+    prompt = personality.render({"command": command})
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Mapping, Tuple
+
+_SLOT = re.compile(r"\{\{([^}]+)\}\}")
+
+
+class PromptTemplate:
+    """
+    Immutable, pre-parsed ``{{slot}}`` template.
+
+    Rendering follows :meth:`Agent.fill_slots`: slot names are stripped of
+    surrounding blanks, and slots with no value (or None) are replaced by the
+    empty string.
+    """
+
+    __slots__ = ("_parts", "_slots")
+
+    def __init__(self, template: str) -> None:
+        if template is None:
+            raise ValueError("template must not be None")
+
+        # Literal text and slot names alternate, starting and ending with text
+        parts: List[str] = []
+        pos = 0
+        for match in _SLOT.finditer(template):
+            parts.append(template[pos : match.start()])
+            parts.append(match.group(1).strip())
+            pos = match.end()
+        parts.append(template[pos:])
+        self._parts: Tuple[str, ...] = tuple(parts)
+        self._slots: FrozenSet[str] = frozenset(parts[1::2])
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def compile(template: str) -> "PromptTemplate":
+        """Return the (memoised) compiled version of *template*."""
+        return PromptTemplate(template)
+
+    @property
+    def slots(self) -> FrozenSet[str]:
+        """Names of the slots still to be filled."""
+        return self._slots
+
+    def render(self, slots: Mapping[str, Any]) -> str:
+        """Return the template text with every slot replaced by its value in *slots*."""
+        if slots is None:
+            raise ValueError("slots must not be None")
+
+        parts = list(self._parts)
+        for i in range(1, len(parts), 2):
+            value = slots.get(parts[i])
+            parts[i] = "" if value is None else str(value)
+        return "".join(parts)
+
+    def bind(self, slots: Mapping[str, Any]) -> "PromptTemplate":
+        """
+        Return a template where the slots in *slots* are already filled and
+        the others are left for :meth:`render`.
+        """
+        if slots is None:
+            raise ValueError("slots must not be None")
+
+        parts: List[str] = [self._parts[0]]
+        for i in range(1, len(self._parts), 2):
+            name, text = self._parts[i], self._parts[i + 1]
+            if name in slots:
+                value = slots[name]
+                parts[-1] += ("" if value is None else str(value)) + text
+            else:
+                parts += [name, text]
+
+        bound = PromptTemplate.__new__(PromptTemplate)
+        bound._parts = tuple(parts)
+        bound._slots = frozenset(parts[1::2])
+        return bound
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"PromptTemplate(slots={sorted(self._slots)})"
@@ -0,0 +1,318 @@
+"""rate_limiter.py
+
+Process-wide scheduler for LLM requests (see :meth:`Agent._chat_completion`).
+
+Every request made by any agent (orchestrator, nested LabAgents, executor and
+critic modules) first takes its share of two token buckets kept per model:
+one for requests per minute (RPM) and one for tokens per minute (TPM). When
+a budget is exhausted, requests wait in a queue instead of failing with a 429;
+the queue is served by priority (:data:`RateLimiter.HIGH` before
+:data:`RateLimiter.NORMAL` before :data:`RateLimiter.LOW`, FIFO within a
+priority), so executor steps go ahead of critic reviews.
+
+Limits are set per model with :meth:`RateLimiter.set_limits`; the shared
+instance (:meth:`RateLimiter.get_instance`) applies ``OPENAI_RPM`` and
+``OPENAI_TPM`` from the environment, if set, to models without their own
+limits. Models without limits are never queued.
+
+Token counts are not known until the reply arrives, so each request reserves
+an estimate, and :meth:`RateLimiter.settle` corrects the bucket with the
+usage reported by the API.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import ClassVar, Dict, List, Mapping, Optional, Tuple
+
+import log_config
+
+# --------------------------------------------------------------------------- #
+# Logging configuration (equivalent to Java SimpleLogger)
+# --------------------------------------------------------------------------- #
+log_config.configure_logging()
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Token-bucket scheduler with priority queues, one per model; thread-safe
+    and usable from asyncio code (see :meth:`aacquire`).
+
+    Parameters
+    ----------
+    limits : Mapping[str, RateLimiter.Limits] | None
+        Limits per model.
+    default_limits : RateLimiter.Limits | None
+        Limits of models not in *limits*; None == not limited.
+    """
+
+    # Priority classes (lower is served first)
+    HIGH: ClassVar[int] = 0  # executor steps
+    NORMAL: ClassVar[int] = 1
+    LOW: ClassVar[int] = 2  # critic reviews
+
+    # Max seconds an asyncio waiter sleeps before checking the queue again
+    ASYNC_POLL_INTERVAL: ClassVar[float] = 0.05
+
+    # Waits longer than this (seconds) are logged
+    LOG_WAIT_THRESHOLD: ClassVar[float] = 1.0
+
+    @dataclass(frozen=True)
+    class Limits:
+        requests_per_minute: Optional[float] = None
+        tokens_per_minute: Optional[float] = None
+
+    @dataclass
+    class Metrics:
+        """Counters for one model; see :meth:`RateLimiter.metrics`."""
+
+        granted: int = 0  # requests let through
+        delayed: int = 0  # requests that had to wait
+        wait_seconds: float = 0.0  # total time spent waiting
+        queue_depth: int = 0  # requests waiting now
+        max_queue_depth: int = 0
+
+    class _Bucket:
+        def __init__(self, per_minute: float) -> None:
+            self.capacity: float = per_minute
+            self.rate: float = per_minute / 60.0  # refill per second
+            self.level: float = per_minute
+            self.updated: float = time.monotonic()
+
+        def refill(self, now: float) -> None:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+
+        def wait_for(self, amount: float) -> float:
+            # Seconds until *amount* is available; requests larger than the
+            # capacity only need a full bucket (and then drive it negative).
+            deficit = min(amount, self.capacity) - self.level
+            return deficit / self.rate if deficit > 0 else 0.0
+
+    class _Model:
+        def __init__(self, limits: "RateLimiter.Limits | None") -> None:
+            self.requests: RateLimiter._Bucket | None = None
+            self.tokens: RateLimiter._Bucket | None = None
+            if limits is not None:
+                if limits.requests_per_minute:
+                    self.requests = RateLimiter._Bucket(limits.requests_per_minute)
+                if limits.tokens_per_minute:
+                    self.tokens = RateLimiter._Bucket(limits.tokens_per_minute)
+            self.waiters: List[Tuple[int, int]] = []  # heap of (priority, seq)
+            self.metrics: RateLimiter.Metrics = RateLimiter.Metrics()
+
+        @property
+        def limited(self) -> bool:
+            return self.requests is not None or self.tokens is not None
+
+    # Process-wide shared instance (see get_instance()) ------------------ #
+    _instance: ClassVar[Optional["RateLimiter"]] = None
+    _instance_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        limits: Mapping[str, "RateLimiter.Limits"] | None = None,
+        default_limits: "RateLimiter.Limits | None" = None,
+    ) -> None:
+        self._limits: Dict[str, RateLimiter.Limits] = dict(limits or {})
+        self.default_limits: RateLimiter.Limits | None = default_limits
+        self._models: Dict[str, RateLimiter._Model] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    @classmethod
+    def get_instance(cls) -> "RateLimiter":
+        """Return the scheduler shared by every agent in the process."""
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                instance = cls._instance
+                if instance is None:
+                    instance = cls(default_limits=cls._limits_from_env())
+                    cls._instance = instance
+        return instance
+
+    @staticmethod
+    def _limits_from_env() -> "RateLimiter.Limits | None":
+        rpm, tpm = os.getenv("OPENAI_RPM"), os.getenv("OPENAI_TPM")
+        if not rpm and not tpm:
+            return None
+        return RateLimiter.Limits(
+            requests_per_minute=float(rpm) if rpm else None,
+            tokens_per_minute=float(tpm) if tpm else None,
+        )
+
+    def set_limits(self, model: str, limits: "RateLimiter.Limits | None") -> None:
+        """Set (None == remove) the limits of *model*; budgets restart full."""
+        if model is None:
+            raise ValueError("model must not be None")
+        with self._cond:
+            if limits is None:
+                self._limits.pop(model, None)
+            else:
+                self._limits[model] = limits
+            state = self._models.get(model)
+            if state is not None:
+                # Replace the buckets only: waiters and counters are kept
+                fresh = RateLimiter._Model(self._limits.get(model, self.default_limits))
+                state.requests, state.tokens = fresh.requests, fresh.tokens
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------ #
+    # Scheduling
+    # ------------------------------------------------------------------ #
+    def acquire(self, model: str, tokens: int, priority: int = NORMAL) -> float:
+        """
+        Wait until *model* has budget for one request of *tokens* tokens, then
+        take it; return the seconds waited.
+        """
+        start = time.monotonic()
+        with self._cond:
+            state = self._state(model)
+            if not state.limited and not state.waiters:
+                state.metrics.granted += 1
+                return 0.0
+
+            entry = self._enqueue(state, priority)
+            try:
+                while True:
+                    delay = self._try_take(state, entry, tokens)
+                    if delay == 0.0:
+                        break
+                    self._cond.wait(delay)
+            finally:
+                self._dequeue(state, entry)
+        return self._granted(model, state, start)
+
+    async def aacquire(self, model: str, tokens: int, priority: int = NORMAL) -> float:
+        """Awaitable version of :meth:`acquire`; does not block the event loop."""
+        start = time.monotonic()
+        with self._cond:
+            state = self._state(model)
+            if not state.limited and not state.waiters:
+                state.metrics.granted += 1
+                return 0.0
+            entry = self._enqueue(state, priority)
+
+        try:
+            while True:
+                with self._cond:
+                    delay = self._try_take(state, entry, tokens)
+                if delay == 0.0:
+                    break
+                poll = self.ASYNC_POLL_INTERVAL
+                await asyncio.sleep(min(delay, poll) if delay is not None else poll)
+        finally:
+            with self._cond:
+                self._dequeue(state, entry)
+        return self._granted(model, state, start)
+
+    def settle(self, model: str, reserved: int, used: int) -> None:
+        """Correct the token budget of *model* once the actual usage of a request is known."""
+        with self._cond:
+            state = self._state(model)
+            if state.tokens is not None and used != reserved:
+                state.tokens.refill(time.monotonic())
+                state.tokens.level -= used - reserved
+                if used < reserved:
+                    self._cond.notify_all()
+
+    # ------------------------------------------------------------------ #
+    # Metrics
+    # ------------------------------------------------------------------ #
+    def queue_depth(self, model: str | None = None) -> int:
+        """Requests waiting for *model* (for all models if None)."""
+        with self._cond:
+            if model is not None:
+                state = self._models.get(model)
+                return len(state.waiters) if state is not None else 0
+            return sum(len(s.waiters) for s in self._models.values())
+
+    def metrics(self, model: str) -> "RateLimiter.Metrics":
+        """Snapshot of the counters of *model*."""
+        with self._cond:
+            state = self._models.get(model)
+            if state is None:
+                return RateLimiter.Metrics()
+            return replace(state.metrics, queue_depth=len(state.waiters))
+
+    def all_metrics(self) -> Dict[str, "RateLimiter.Metrics"]:
+        """Snapshot of the counters of every model seen so far."""
+        with self._cond:
+            models = list(self._models)
+        return {m: self.metrics(m) for m in models}
+
+    # ------------------------------------------------------------------ #
+    # Internals (called with the lock held, except _granted)
+    # ------------------------------------------------------------------ #
+    def _state(self, model: str) -> "RateLimiter._Model":
+        state = self._models.get(model)
+        if state is None:
+            state = RateLimiter._Model(self._limits.get(model, self.default_limits))
+            self._models[model] = state
+        return state
+
+    def _enqueue(self, state: "RateLimiter._Model", priority: int) -> Tuple[int, int]:
+        entry = (priority, next(self._seq))
+        heapq.heappush(state.waiters, entry)
+        depth = len(state.waiters)
+        state.metrics.queue_depth = depth
+        state.metrics.max_queue_depth = max(state.metrics.max_queue_depth, depth)
+        return entry
+
+    def _dequeue(self, state: "RateLimiter._Model", entry: Tuple[int, int]) -> None:
+        if state.waiters and state.waiters[0] == entry:
+            heapq.heappop(state.waiters)
+        elif entry in state.waiters:  # gave up (e.g. cancelled) while queued
+            state.waiters.remove(entry)
+            heapq.heapify(state.waiters)
+        state.metrics.queue_depth = len(state.waiters)
+        self._cond.notify_all()  # the next in line may go now
+
+    def _try_take(
+        self, state: "RateLimiter._Model", entry: Tuple[int, int], tokens: int
+    ) -> float | None:
+        """
+        Take the budget for *entry* if it is first in line and the budget is
+        there (return 0); otherwise return the seconds to wait before trying
+        again, or None to wait until notified.
+        """
+        if state.waiters[0] != entry:
+            return None
+
+        now = time.monotonic()
+        delay = 0.0
+        for bucket, amount in ((state.requests, 1), (state.tokens, tokens)):
+            if bucket is not None:
+                bucket.refill(now)
+                delay = max(delay, bucket.wait_for(amount))
+        if delay > 0.0:
+            return delay
+
+        if state.requests is not None:
+            state.requests.level -= 1
+        if state.tokens is not None:
+            state.tokens.level -= tokens
+        return 0.0
+
+    def _granted(self, model: str, state: "RateLimiter._Model", start: float) -> float:
+        waited = time.monotonic() - start
+        with self._cond:
+            state.metrics.granted += 1
+            if waited > 0.001:
+                state.metrics.delayed += 1
+                state.metrics.wait_seconds += waited
+            depth = len(state.waiters)
+        if waited > self.LOG_WAIT_THRESHOLD:
+            logger.info(
+                "Request to %s waited %.1fs for rate limits (%d still queued)", model, waited, depth
+            )
+        return waited
@@ -8,17 +8,17 @@ from pydantic import BaseModel, Field
 
 from agent import Agent
 from json_schema import JsonSchema
+import log_config
 from steps import Step
+import timing
 from tool import Tool
 
 if TYPE_CHECKING:  # avoid circular imports at runtime
     from executor_module import ExecutorModule
     from critic_module import CriticModule
+    from run_budget import RunBudget
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -103,10 +103,20 @@ class ReactAgent(Agent):
 
     def add_step(self, step: Step) -> None:
         self._steps.append(step)
-        try:
-            logger.info(JsonSchema.serialize(step))
-        except Exception:
-            logger.exception("Unable to serialise step for logging")
+        with timing.timed(timing.SERIALISATION):
+            step.to_prompt_json()  # serialise once, reused by every later prompt
+        # Serialised by the logging thread, only if the record is written
+        logger.info("%s", log_config.Lazy(JsonSchema.serialize, step), extra=log_config.PAYLOAD)
+
+    # ------------------------------------------------------------------ #
+    # run budget
+    # ------------------------------------------------------------------ #
+    def get_run_budget(self) -> "RunBudget | None":
+        """
+        Budget consumed by the executor and critic of this agent while it
+        executes (None == unlimited); see :class:`run_budget.RunBudget`.
+        """
+        return self.run_budget
 
     # ------------------------------------------------------------------ #
     # inner modules (read-only)
@@ -127,3 +137,10 @@ class ReactAgent(Agent):
             raise ValueError("command must not be None")
         logger.info("Executing command: %s", command)
         return self._executor.execute(command)
+
+    async def aexecute(self, command: str) -> Step:
+        """Awaitable version of :meth:`execute`."""
+        if command is None:
+            raise ValueError("command must not be None")
+        logger.info("Executing command: %s", command)
+        return await self._executor.aexecute(command)
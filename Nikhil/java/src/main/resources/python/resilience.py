@@ -0,0 +1,349 @@
+"""resilience.py
+
+Retries, deadlines and hedged requests for LLM calls (see
+:attr:`Agent.retry_policy`).
+
+:class:`RetryPolicy` runs one model call with:
+
+- **retries** of transient errors (timeouts, connection errors, rate limits,
+  5xx), after a jittered exponential backoff ("full jitter": a random delay
+  between 0 and ``initial_backoff * multiplier ** n``, capped at
+  ``max_backoff``); a ``Retry-After`` header, when present, is honoured;
+- a **deadline** for the whole call, retries included, and an optional
+  timeout for each attempt;
+- optional **hedging**: when an attempt takes longer than the
+  ``hedge_quantile`` (p95 by default) of the latencies recently observed for
+  the same model, a second, identical request is sent and whichever answers
+  first is used.
+
+Errors that are not transient (e.g. invalid requests) are raised at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, ClassVar, Deque, Dict, Optional, Tuple, TypeVar
+
+import openai
+
+import log_config
+
+# --------------------------------------------------------------------------- #
+# Logging configuration (equivalent to Java SimpleLogger)
+# --------------------------------------------------------------------------- #
+log_config.configure_logging()
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Transient errors of the OpenAI SDK (names differ across SDK versions)
+_RETRYABLE_OPENAI_ERRORS: Tuple[type, ...] = tuple(
+    e
+    for e in (
+        getattr(getattr(openai, "error", None), name, None)
+        for name in (
+            "Timeout",
+            "APIConnectionError",
+            "APIError",
+            "RateLimitError",
+            "ServiceUnavailableError",
+            "TryAgain",
+        )
+    )
+    if isinstance(e, type)
+)
+
+
+class LatencyTracker:
+    """Latencies of the most recent successful calls, for one model."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The *q* quantile (0..1) of the recorded latencies, None if there are none."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class RetryPolicy:
+    """
+    How an agent retries, times out and hedges its model calls; a policy can
+    be shared by many agents (latencies are tracked per model).
+
+    Parameters
+    ----------
+    max_attempts : int
+        Max number of attempts (1 == no retries).
+    initial_backoff, max_backoff, multiplier : float
+        Backoff before retry *n* (0-based) is drawn uniformly in
+        ``[0, min(max_backoff, initial_backoff * multiplier ** n)]`` seconds.
+    deadline : float | None
+        Max seconds for the whole call, retries included.
+    attempt_timeout : float | None
+        Max seconds for each attempt.
+    hedge_quantile : float | None
+        Latency quantile after which a hedged request is sent; None == no hedging.
+    hedge_min_samples : int
+        Latencies needed for a model before hedging its calls.
+    """
+
+    # Threads running hedged synchronous calls (shared by all policies)
+    _hedge_pool: ClassVar[ThreadPoolExecutor | None] = None
+    _hedge_pool_lock: ClassVar[threading.Lock] = threading.Lock()
+    HEDGE_POOL_SIZE: ClassVar[int] = 16
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        multiplier: float = 2.0,
+        deadline: float | None = 600.0,
+        attempt_timeout: float | None = None,
+        hedge_quantile: float | None = None,
+        hedge_min_samples: int = 20,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if initial_backoff < 0 or max_backoff < 0:
+            raise ValueError("backoff must not be negative")
+        if hedge_quantile is not None and not 0 < hedge_quantile < 1:
+            raise ValueError("hedge_quantile must be between 0 and 1")
+
+        self.max_attempts: int = max_attempts
+        self.initial_backoff: float = initial_backoff
+        self.max_backoff: float = max_backoff
+        self.multiplier: float = multiplier
+        self.deadline: float | None = deadline
+        self.attempt_timeout: float | None = attempt_timeout
+        self.hedge_quantile: float | None = hedge_quantile
+        self.hedge_min_samples: int = hedge_min_samples
+
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Policy
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def is_retryable(exc: BaseException) -> bool:
+        """True for errors worth retrying: timeouts, connection errors, rate limits, 5xx."""
+        if isinstance(exc, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+            return True
+        if _RETRYABLE_OPENAI_ERRORS and isinstance(exc, _RETRYABLE_OPENAI_ERRORS):
+            status = getattr(exc, "http_status", None)
+            return status is None or status == 429 or status >= 500
+        return False
+
+    def backoff(self, attempt: int, exc: BaseException | None = None) -> float:
+        """Seconds to wait before retry *attempt* (0-based), after error *exc*."""
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        cap = min(self.max_backoff, self.initial_backoff * self.multiplier**attempt)
+        return random.uniform(0.0, cap)
+
+    def latencies(self, key: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._latencies.get(key)
+            if tracker is None:
+                tracker = self._latencies[key] = LatencyTracker()
+            return tracker
+
+    def hedge_delay(self, key: str) -> float | None:
+        """Seconds after which a call for *key* is hedged; None == do not hedge."""
+        if self.hedge_quantile is None:
+            return None
+        tracker = self.latencies(key)
+        if len(tracker) < self.hedge_min_samples:
+            return None
+        return tracker.quantile(self.hedge_quantile)
+
+    # ------------------------------------------------------------------ #
+    # Synchronous calls
+    # ------------------------------------------------------------------ #
+    def call(self, key: str, fn: Callable[[float | None], T], hedge: bool = True) -> T:
+        """
+        Run ``fn(timeout)`` under this policy and return its result; *key*
+        (the model) selects the latencies used for hedging. *timeout* is
+        the time left for the attempt (None == unlimited). Pass
+        ``hedge=False`` when *fn* must not run twice at the same time (e.g.
+        it has side effects).
+        """
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            timeout = self._attempt_timeout(start)
+            try:
+                if not hedge:
+                    return self._timed(key, fn, timeout)
+                return self._hedged(key, fn, timeout)
+            except Exception as exc:  # noqa: BLE001
+                delay = self._retry_delay(key, attempt, exc, start)
+            time.sleep(delay)
+            attempt += 1
+
+    def _hedged(self, key: str, fn: Callable[[float | None], T], timeout: float | None) -> T:
+        delay = self.hedge_delay(key)
+        if delay is None or (timeout is not None and delay >= timeout):
+            return self._timed(key, fn, timeout)
+
+        pool = RetryPolicy._get_hedge_pool()
+        started = time.monotonic()
+        pending = {pool.submit(self._timed, key, fn, timeout)}
+        done, _ = wait(pending, timeout=delay)
+        if not done:
+            logger.info("No reply from %s after %.1fs, sending a hedged request", key, delay)
+            left = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+            pending.add(pool.submit(self._timed, key, fn, left))
+
+        error: BaseException | None = None
+        while pending:
+            left = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+            done, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        # Late replies, if any, are discarded
+        raise error if error is not None else TimeoutError(f"No reply from {key} in {timeout:.1f}s")
+
+    def _timed(self, key: str, fn: Callable[[float | None], T], timeout: float | None) -> T:
+        start = time.monotonic()
+        result = fn(timeout)
+        self.latencies(key).add(time.monotonic() - start)
+        return result
+
+    @classmethod
+    def _get_hedge_pool(cls) -> ThreadPoolExecutor:
+        pool = cls._hedge_pool
+        if pool is None:
+            with cls._hedge_pool_lock:
+                pool = cls._hedge_pool
+                if pool is None:
+                    pool = cls._hedge_pool = ThreadPoolExecutor(
+                        max_workers=cls.HEDGE_POOL_SIZE, thread_name_prefix="llm-hedge"
+                    )
+        return pool
+
+    # ------------------------------------------------------------------ #
+    # Asynchronous calls
+    # ------------------------------------------------------------------ #
+    async def acall(
+        self, key: str, fn: Callable[[float | None], Awaitable[T]], hedge: bool = True
+    ) -> T:
+        """Awaitable version of :meth:`call`; attempts exceeding their timeout are cancelled."""
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            timeout = self._attempt_timeout(start)
+            try:
+                if not hedge:
+                    return await asyncio.wait_for(self._atimed(key, fn, timeout), timeout)
+                return await self._ahedged(key, fn, timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                delay = self._retry_delay(key, attempt, exc, start)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _ahedged(
+        self, key: str, fn: Callable[[float | None], Awaitable[T]], timeout: float | None
+    ) -> T:
+        delay = self.hedge_delay(key)
+        if delay is None or (timeout is not None and delay >= timeout):
+            return await asyncio.wait_for(self._atimed(key, fn, timeout), timeout)
+
+        started = time.monotonic()
+        pending = {asyncio.ensure_future(self._atimed(key, fn, timeout))}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                logger.info("No reply from %s after %.1fs, sending a hedged request", key, delay)
+                left = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+                pending.add(asyncio.ensure_future(self._atimed(key, fn, left)))
+
+            error: BaseException | None = None
+            while pending:
+                left = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+                done, pending = await asyncio.wait(
+                    pending, timeout=left, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error if error is not None else asyncio.TimeoutError(
+                f"No reply from {key} in {timeout:.1f}s"
+            )
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _atimed(
+        self, key: str, fn: Callable[[float | None], Awaitable[T]], timeout: float | None
+    ) -> T:
+        start = time.monotonic()
+        result = await fn(timeout)
+        self.latencies(key).add(time.monotonic() - start)
+        return result
+
+    # ------------------------------------------------------------------ #
+    # Helpers
+    # ------------------------------------------------------------------ #
+    def _attempt_timeout(self, start: float) -> float | None:
+        timeout = self.attempt_timeout
+        if self.deadline is not None:
+            left = self.deadline - (time.monotonic() - start)
+            timeout = left if timeout is None else min(timeout, left)
+        return timeout
+
+    def _retry_delay(self, key: str, attempt: int, exc: Exception, start: float) -> float:
+        """Backoff before the next attempt; re-raises *exc* when there must be none."""
+        if not self.is_retryable(exc) or attempt + 1 >= self.max_attempts:
+            raise exc
+        delay = self.backoff(attempt, exc)
+        if self.deadline is not None and time.monotonic() - start + delay >= self.deadline:
+            raise TimeoutError(
+                f"Call to {key} did not succeed within its {self.deadline:g}s deadline "
+                f"({attempt + 1} attempts; last error: {exc or type(exc).__name__})"
+            ) from exc
+        logger.warning(
+            "Call to %s failed (attempt %d of %d): %s; retrying in %.1fs",
+            key, attempt + 1, self.max_attempts, exc or type(exc).__name__, delay,
+        )
+        return delay
+
+
+def _retry_after(exc: BaseException | None) -> float | None:
+    headers = getattr(exc, "headers", None) if exc is not None else None
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
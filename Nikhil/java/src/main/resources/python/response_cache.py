@@ -0,0 +1,290 @@
+"""response_cache.py
+
+Content-addressed cache for LLM responses, pluggable into :class:`agent.Agent`.
+
+Responses are keyed by a stable hash of everything that determines the
+model output (model, messages, tool definitions, response_format and
+temperature), so replaying the same scenario against the same model is
+served locally instead of calling OpenAI.
+
+Two backends are provided:
+
+- :class:`LruResponseCache`    in-memory, least-recently-used
+- :class:`SqliteResponseCache` on disk, survives across processes/runs
+
+Both support size- and age-based eviction and expose hit/miss counters
+through :pyattr:`ResponseCache.stats`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Tuple
+
+import log_config
+
+# --------------------------------------------------------------------------- #
+# Logging configuration (equivalent to Java SimpleLogger)
+# --------------------------------------------------------------------------- #
+log_config.configure_logging()
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------------------------------------------- #
+# ResponseCache – base class
+# --------------------------------------------------------------------------- #
+class ResponseCache(ABC):
+    """
+    Base class for response caches.
+
+    Cached values are the JSON-serialisable payloads of complete replies, put
+    by :meth:`agent.Agent._to_chat_completion` under the key computed by
+    :meth:`agent.Agent._cache_key`; sub-classes only implement storage.
+
+    Parameters
+    ----------
+    max_entries : int | None
+        Max number of entries kept; least recently used ones are evicted first.
+    max_age : float | None
+        Entries older than this many seconds are considered expired.
+    """
+
+    # Request fields that determine the model output
+    KEY_FIELDS: Tuple[str, ...] = (
+        "model",
+        "messages",
+        "tools",
+        "response_format",
+        "temperature",
+    )
+
+    @dataclass
+    class Stats:
+        hits: int = 0
+        misses: int = 0
+        evictions: int = 0
+
+        @property
+        def hit_rate(self) -> float:
+            total = self.hits + self.misses
+            return self.hits / total if total else 0.0
+
+    def __init__(self, max_entries: int | None = None, max_age: float | None = None) -> None:
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_age is not None and max_age <= 0:
+            raise ValueError("max_age must be positive")
+
+        self.max_entries: int | None = max_entries
+        self.max_age: float | None = max_age
+        self.stats: ResponseCache.Stats = ResponseCache.Stats()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Keys
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def key_for(cls, request: Mapping[str, Any]) -> str:
+        """Return a stable SHA-256 hex digest for an OpenAI request body."""
+        material = {k: request.get(k) for k in cls.KEY_FIELDS}
+        canonical = json.dumps(material, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    def get(self, key: str) -> Dict[str, Any] | None:
+        """Return the cached payload for *key*, or *None* on a miss."""
+        if key is None:
+            raise ValueError("key must not be None")
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+        return json.loads(value)
+
+    def put(self, key: str, payload: Mapping[str, Any]) -> None:
+        """Store *payload* under *key*, evicting old entries as needed."""
+        if key is None:
+            raise ValueError("key must not be None")
+        if payload is None:
+            raise ValueError("payload must not be None")
+        value = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            self._put(key, value)
+            self.stats.evictions += self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def close(self) -> None:
+        """Release any resource held by the backend."""
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.max_age is not None and now - created > self.max_age
+
+    # ------------------------------------------------------------------ #
+    # Storage (called with the lock held)
+    # ------------------------------------------------------------------ #
+    @abstractmethod
+    def _get(self, key: str) -> str | None: ...
+
+    @abstractmethod
+    def _put(self, key: str, value: str) -> None: ...
+
+    @abstractmethod
+    def _evict(self) -> int:
+        """Drop expired and overflowing entries; return how many were dropped."""
+
+    @abstractmethod
+    def _clear(self) -> None: ...
+
+
+# --------------------------------------------------------------------------- #
+# In-memory LRU backend
+# --------------------------------------------------------------------------- #
+class LruResponseCache(ResponseCache):
+    """In-memory LRU cache; by default holds at most 1,000 responses."""
+
+    def __init__(self, max_entries: int | None = 1000, max_age: float | None = None) -> None:
+        super().__init__(max_entries=max_entries, max_age=max_age)
+        # key -> (creation time, JSON value), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def _get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry[0], time.time()):
+            del self._entries[key]
+            self.stats.evictions += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _put(self, key: str, value: str) -> None:
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+
+    def _evict(self) -> int:
+        evicted = 0
+        if self.max_age is not None:
+            now = time.time()
+            for k in [k for k, (created, _) in self._entries.items() if self._expired(created, now)]:
+                del self._entries[k]
+                evicted += 1
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def _clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# --------------------------------------------------------------------------- #
+# SQLite backend
+# --------------------------------------------------------------------------- #
+class SqliteResponseCache(ResponseCache):
+    """
+    Cache persisted in a SQLite database file, shareable across runs.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Database file; created if missing.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_entries: int | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        if path is None:
+            raise ValueError("path must not be None")
+        super().__init__(max_entries=max_entries, max_age=max_age)
+
+        self.path: str = os.fspath(path)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+        self._conn.commit()
+
+    def _get(self, key: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT value, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if self._expired(row[1], now):
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+            self.stats.evictions += 1
+            return None
+        self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return row[0]
+
+    def _put(self, key: str, value: str) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+            (key, value, now, now),
+        )
+        self._conn.commit()
+
+    def _evict(self) -> int:
+        evicted = 0
+        if self.max_age is not None:
+            cur = self._conn.execute(
+                "DELETE FROM responses WHERE created < ?", (time.time() - self.max_age,)
+            )
+            evicted += cur.rowcount
+        if self.max_entries is not None:
+            cur = self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            evicted += cur.rowcount
+        if evicted:
+            self._conn.commit()
+        return evicted
+
+    def _clear(self) -> None:
+        self._conn.execute("DELETE FROM responses")
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
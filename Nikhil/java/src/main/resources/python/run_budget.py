@@ -0,0 +1,141 @@
+"""run_budget.py
+
+Hard limits for one orchestrated run (see :attr:`ExecutionContext.budget`).
+
+Agents invoked as tools (``LabAgent.invoke`` → ``execute`` →
+``ExecutorModule.execute``) each have their own MAX_STEPS and no time limit,
+so nested agents multiply cost (Orchestrator × Peace × critic). A
+:class:`RunBudget` is instead shared by every agent running in the same
+:class:`ExecutionContext`, nested ones included:
+
+- every LLM request (executor and critic, retries included) takes one call
+  from it, and is charged the tokens it used;
+- every step recorded by an executor takes one step;
+- the wall-clock deadline also bounds the timeout of LLM requests.
+
+Once any limit is reached, no further LLM request is sent
+(:class:`RunBudget.Exhausted` is raised instead), executors stop with an
+ERROR step that says why, and nested agents are not invoked anymore. A
+request already in flight is not interrupted, so the token limit can be
+exceeded by the usage of the requests running when it is reached::
+
+    ctx.budget = RunBudget(RunBudget.Limits(max_seconds=600, max_llm_calls=200))
+    step = Orchestrator().execute(ctx)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+class RunBudget:
+    """
+    Wall-clock, LLM-call, token and step limits shared by all the agents of
+    one run; thread-safe. The clock starts when the budget is created.
+
+    Parameters
+    ----------
+    limits : RunBudget.Limits
+        Limits of the run.
+    """
+
+    @dataclass(frozen=True)
+    class Limits:
+        """Limits of a run; None == no limit."""
+
+        max_seconds: Optional[float] = None
+        max_llm_calls: Optional[int] = None
+        max_tokens: Optional[int] = None
+        max_steps: Optional[int] = None
+
+    class Exhausted(RuntimeError):
+        """Raised when an LLM request is attempted after the budget ran out."""
+
+    def __init__(self, limits: "RunBudget.Limits") -> None:
+        if limits is None:
+            raise ValueError("limits must not be None")
+
+        self.limits: RunBudget.Limits = limits
+        self.started: float = time.monotonic()
+
+        # Consumption so far
+        self.llm_calls: int = 0
+        self.tokens: int = 0
+        self.steps: int = 0
+
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Status
+    # ------------------------------------------------------------------ #
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining_seconds(self) -> float | None:
+        """Seconds left before the deadline (None == no deadline)."""
+        if self.limits.max_seconds is None:
+            return None
+        return max(0.0, self.limits.max_seconds - self.elapsed())
+
+    def exhausted(self) -> str | None:
+        """Why the budget ran out, or None if it did not."""
+        with self._lock:
+            return self._reason()
+
+    def check(self) -> None:
+        """Raise :class:`RunBudget.Exhausted` if the budget ran out."""
+        reason = self.exhausted()
+        if reason is not None:
+            raise RunBudget.Exhausted(f"Run budget exhausted: {reason}")
+
+    # ------------------------------------------------------------------ #
+    # Consumption
+    # ------------------------------------------------------------------ #
+    def start_llm_call(self, timeout: float | None = None) -> float | None:
+        """
+        Take one LLM call from the budget, or raise
+        :class:`RunBudget.Exhausted`; return *timeout* (the request timeout,
+        None == none) cut to the time left before the deadline.
+        """
+        with self._lock:
+            reason = self._reason()
+            if reason is not None:
+                raise RunBudget.Exhausted(f"Run budget exhausted: {reason}")
+            self.llm_calls += 1
+        remaining = self.remaining_seconds()
+        if remaining is None:
+            return timeout
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def add_tokens(self, tokens: int) -> None:
+        """Charge the tokens (prompt and completion) used by an LLM call."""
+        with self._lock:
+            self.tokens += tokens
+
+    def add_step(self) -> None:
+        with self._lock:
+            self.steps += 1
+
+    def __str__(self) -> str:
+        return (
+            f"{self.llm_calls} LLM calls, {self.tokens} tokens, {self.steps} steps, "
+            f"{self.elapsed():.1f}s"
+        )
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    def _reason(self) -> str | None:
+        limits = self.limits
+        if limits.max_seconds is not None and self.elapsed() >= limits.max_seconds:
+            return f"wall-clock limit of {limits.max_seconds:g}s reached"
+        if limits.max_llm_calls is not None and self.llm_calls >= limits.max_llm_calls:
+            return f"limit of {limits.max_llm_calls} LLM calls reached"
+        if limits.max_tokens is not None and self.tokens >= limits.max_tokens:
+            return f"limit of {limits.max_tokens} tokens reached"
+        if limits.max_steps is not None and self.steps >= limits.max_steps:
+            return f"limit of {limits.max_steps} steps reached"
+        return None
@@ -16,18 +16,19 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional
+from typing import Any, ClassVar, Dict, List, Mapping, Optional, Tuple
 
 from pydantic import BaseModel, Field, ValidationError
 
+import log_config
+import timing
+
 # --------------------------------------------------------------------------- #
 # Logging configuration (equivalent to Java SimpleLogger)
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -70,12 +71,25 @@ class ScenarioComponent:
     """
     Access-point for scenario definitions loaded from disk.
 
+    Scenarios are loaded and validated once, at construction; lookups are then
+    served from in-memory indexes (scenarios by id, tool calls by
+    ``(scenario_id, tool_id)``) holding pre-normalised inputs, so that
+    :meth:`get` is a dictionary hit plus a small subset check.
+
     Parameters
     ----------
     folder : str | os.PathLike
         Directory containing one or more JSON files with scenario definitions.
     """
 
+    DEFAULT_FOLDER: ClassVar[Path] = Path(
+        "D:/Users/mzatt/Projects/DELETEME PnBC/pnbc-services/src/main/resources/scenarios"
+    )
+
+    # Process-wide shared instance (see get_instance()) ------------------ #
+    _instance: ClassVar[Optional["ScenarioComponent"]] = None
+    _instance_lock: ClassVar[threading.Lock] = threading.Lock()
+
     # ------------------------- construction ---------------------------- #
     def __init__(self, folder: str | os.PathLike) -> None:
         if folder is None:
@@ -86,15 +100,35 @@ class ScenarioComponent:
             raise IOError(f"Scenario folder {self.scenario_folder} does not exist.")
 
         self._scenarios: List[Scenario] = []
+        # scenario id -> scenario (first definition wins, as in a linear scan)
+        self._scenario_index: Dict[str, Scenario] = {}
+        # (scenario id, tool id) -> [(normalised input, text output), ...]
+        self._call_index: Dict[Tuple[str, str], List[Tuple[Dict[str, str], str]]] = {}
         self._load_scenarios()
 
     # Factory mirroring Java getInstance() ----------------------------- #
     @classmethod
     def get_instance(cls) -> "ScenarioComponent":
-        default = Path(
-            "D:/Users/mzatt/Projects/DELETEME PnBC/pnbc-services/src/main/resources/scenarios"
-        )
-        return cls(default)
+        """
+        Return the process-wide component, loading scenarios on first use.
+
+        The instance is created lazily and shared by every caller (thread-safe);
+        the component is read-only after loading, so no further locking is needed.
+        """
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                instance = cls._instance
+                if instance is None:
+                    instance = cls(cls.DEFAULT_FOLDER)
+                    cls._instance = instance
+        return instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the shared instance; next :meth:`get_instance` reloads from disk."""
+        with cls._instance_lock:
+            cls._instance = None
 
     # --------------------------- API ---------------------------------- #
     def list_scenarios(self) -> List[Scenario]:
@@ -108,10 +142,7 @@ class ScenarioComponent:
         if scenario_id is None:
             raise ValueError("scenario_id must not be None")
 
-        for s in self._scenarios:
-            if scenario_id == s.id:
-                return s
-        return None
+        return self._scenario_index.get(scenario_id)
 
     def get_success_criteria(self, scenario_id: str) -> Optional[str]:
         """Return the success criteria for *scenario_id*, if available."""
@@ -136,16 +167,16 @@ class ScenarioComponent:
         if scenario_id is None or tool_id is None or args is None:
             raise ValueError("scenario_id, tool_id and args must not be None")
 
-        scenario = self.get_scenario(scenario_id)
-        if scenario is None:
+        if scenario_id not in self._scenario_index:
             return f"ERROR: Scenario {scenario_id} does not exist."
 
-        for call in scenario.tool_calls:
-            if call.tool_id != tool_id:
-                continue
-            if not self._matched(call.input, args):
-                continue
-            return "".join(o.value for o in call.output if o.type == "text")
+        with timing.timed(timing.SCENARIO):
+            candidates = self._call_index.get((scenario_id, tool_id))
+            if candidates:
+                normalised_args = self._transform_map(args)
+                for expected, text in candidates:
+                    if self._is_subset(expected, normalised_args):
+                        return text
 
         return "ERROR: System failure, wrong API call parameters."
 
@@ -165,6 +196,23 @@ class ScenarioComponent:
                 logger.error("Error parsing scenario %s", file.name, exc_info=exc)
                 raise
 
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """Index scenarios and their tool calls, pre-normalising call inputs."""
+        for scenario in self._scenarios:
+            if scenario.id in self._scenario_index:
+                # Lookups always returned the first definition; keep it that way
+                logger.warning("Duplicate scenario id %s ignored", scenario.id)
+                continue
+            self._scenario_index[scenario.id] = scenario
+
+            for call in scenario.tool_calls:
+                text = "".join(o.value for o in call.output if o.type == "text")
+                self._call_index.setdefault((scenario.id, call.tool_id), []).append(
+                    (self._transform_map(call.input), text)
+                )
+
     # Map-normalisation & matching logic (verbatim port) --------------- #
     @staticmethod
     def _transform_map(raw: Mapping[str, Any]) -> Dict[str, str]:
@@ -177,9 +225,12 @@ class ScenarioComponent:
 
     @classmethod
     def _matched(cls, map1: Mapping[str, Any], map2: Mapping[str, Any]) -> bool:
-        t1 = cls._transform_map(map1)
-        t2 = cls._transform_map(map2)
-        for k, v in t1.items():
-            if k not in t2 or t2[k] != v:
+        return cls._is_subset(cls._transform_map(map1), cls._transform_map(map2))
+
+    @staticmethod
+    def _is_subset(expected: Mapping[str, str], actual: Mapping[str, str]) -> bool:
+        """True if every (already normalised) entry of *expected* is in *actual*."""
+        for k, v in expected.items():
+            if actual.get(k) != v:
                 return False
         return True
@@ -1,19 +1,19 @@
 # react_step.py
 from __future__ import annotations
 
+import json
 import logging
 from enum import Enum
-from typing import List, Self
+from typing import Any, ClassVar, List, Self
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+
+import log_config
 
 # --------------------------------------------------------------------------- #
 # Logging configuration (equivalent to Java SimpleLogger)
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -54,6 +54,75 @@ class Step(BaseModel):
         description="Any additional data, like step outcomes, error messages, etc.",
     )
 
+    # Fields left out of the JSON sent to the LLM in <steps>
+    _PROMPT_EXCLUDE: ClassVar[frozenset[str]] = frozenset()
+
+    # Cached output of to_prompt_json(); reset whenever a field is assigned
+    _prompt_json: str | None = PrivateAttr(default=None)
+    # Cached output of to_elided_prompt_json() and the (head, tail) it used
+    _elided_json: str | None = PrivateAttr(default=None)
+    _elided_limits: tuple[int, int] | None = PrivateAttr(default=None)
+    # Handle of the full observation in an ObservationStore, if it is kept there
+    _observation_handle: str | None = PrivateAttr(default=None)
+
+    # ------------------------------------------------------------------ #
+    # Serialisation for prompts
+    # ------------------------------------------------------------------ #
+    def to_prompt_json(self) -> str:
+        """
+        Return the compact JSON for this step as embedded in executor prompts.
+
+        The string is computed once and cached; assigning any field (e.g.
+        forcing ``status`` back to IN_PROGRESS) invalidates it.
+        """
+        if self._prompt_json is None:
+            self._prompt_json = json.dumps(
+                self.model_dump(exclude=set(self._PROMPT_EXCLUDE)),
+                separators=(",", ":"),
+            )
+        return self._prompt_json
+
+    @property
+    def observation_handle(self) -> str | None:
+        """Handle under which the full observation is stored out of band, if any."""
+        return self._observation_handle
+
+    @observation_handle.setter
+    def observation_handle(self, handle: str | None) -> None:
+        self._observation_handle = handle
+        self._elided_json = None
+
+    def to_elided_prompt_json(self, head: int, tail: int) -> str:
+        """
+        Like :meth:`to_prompt_json`, but an observation longer than
+        ``head + tail`` characters keeps only its first *head* and last *tail*
+        characters, to save tokens in long runs. If the observation has an
+        :pyattr:`observation_handle`, the elision marker tells how to fetch it.
+        """
+        obs = self.observation
+        if len(obs) <= head + tail:
+            return self.to_prompt_json()
+
+        if self._elided_json is None or self._elided_limits != (head, tail):
+            data = self.model_dump(exclude=set(self._PROMPT_EXCLUDE))
+            elided = len(obs) - head - tail
+            marker = f"[... {elided} characters elided ...]"
+            if self._observation_handle is not None:
+                marker = (
+                    f"[... {elided} characters elided; call fetchObservation with "
+                    f"handle={self._observation_handle} to read them ...]"
+                )
+            data["observation"] = f"{obs[:head]}\n{marker}\n{obs[len(obs) - tail:]}"
+            self._elided_json = json.dumps(data, separators=(",", ":"))
+            self._elided_limits = (head, tail)
+        return self._elided_json
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._prompt_json = None
+            self._elided_json = None
+
     # ------------------------------------------------------------------ #
     # Fluent builder pattern
     # ------------------------------------------------------------------ #
@@ -130,6 +199,9 @@ class ToolCallStep(Step):
         ),
     )
 
+    # Nested steps are never sent back to the executor
+    _PROMPT_EXCLUDE: ClassVar[frozenset[str]] = frozenset({"action_steps"})
+
     # ------------------------------------------------------------------ #
     # Fluent builder pattern
     # ------------------------------------------------------------------ #
@@ -0,0 +1,313 @@
+"""task_store.py
+
+Indexed in-memory collection of PEACE tasks, used by :class:`ExecutionContext`
+for the unassigned and the operator task lists.
+
+Tasks are uniquely identified by (Customer Number, Time Created); the store
+keeps a primary index on that pair and secondary indexes on Step Name and
+Customer Number, so that lookups, filters on indexed columns and moves
+between stores do not scan the whole list. A chronological index on the
+parsed Time Created (``Task.created_at``) serves "oldest"/"newest" queries
+without sorting. Iteration follows insertion order, as the plain lists used
+before did.
+
+:meth:`TaskStore.fork` returns a copy-on-write copy of a store (see
+:meth:`ExecutionContext.fork`).
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import itertools
+import logging
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from peace import Peace
+
+    _Task = Peace.Task
+
+logger = logging.getLogger(__name__)
+
+TaskKey = Tuple[str, str]  # (customer_number, time_created)
+
+OLDEST = "oldest"
+NEWEST = "newest"
+
+
+@lru_cache(maxsize=None)
+def field_for_alias(model_cls: type, alias: str) -> Optional[str]:
+    """Name of the field of *model_cls* whose JSON alias is *alias* (memoised)."""
+    for name, fld in model_cls.model_fields.items():  # type: ignore[attr-defined]
+        if fld.alias == alias:
+            return name
+    return None
+
+
+class TaskStore:
+    """
+    Thread-safe, indexed set of tasks.
+
+    Parameters
+    ----------
+    tasks : Iterable[Peace.Task]
+        Initial content; when two tasks share the same (Customer Number,
+        Time Created) only the first one is kept.
+    """
+
+    # Fields with a secondary index
+    INDEXED_FIELDS: Tuple[str, ...] = ("step_name", "customer_number")
+
+    def __init__(self, tasks: Iterable["_Task"] = ()) -> None:
+        self._tasks: Dict[TaskKey, "_Task"] = {}
+        self._indexes: Dict[str, Dict[str, Dict[TaskKey, "_Task"]]] = {
+            f: {} for f in self.INDEXED_FIELDS
+        }
+        # Chronological index: sorted (timestamp, seq, key) of tasks with a
+        # parsed Time Created; the others are kept apart, in insertion order.
+        self._by_time: List[Tuple[float, int, TaskKey]] = []
+        self._time_entries: Dict[TaskKey, Tuple[float, int, TaskKey]] = {}
+        self._untimed: Dict[TaskKey, "_Task"] = {}
+        self._seq = itertools.count()
+        self._shared = False  # True if the structures above are shared with a fork
+        self._lock = threading.RLock()
+        for t in tasks:
+            self.add(t)
+
+    @staticmethod
+    @contextmanager
+    def locked(*stores: "TaskStore") -> Iterator[None]:
+        """
+        Hold the locks of all *stores*, to check and move tasks across them as
+        one transaction. Locks are always taken in the same order, so that
+        concurrent transactions cannot deadlock.
+        """
+        with ExitStack() as stack:
+            for store in sorted(set(stores), key=id):
+                stack.enter_context(store._lock)
+            yield
+
+    @staticmethod
+    def key_of(task: "_Task") -> TaskKey:
+        return (task.customer_number, task.time_created)
+
+    # ------------------------------------------------------------------ #
+    # Copy-on-write
+    # ------------------------------------------------------------------ #
+    def fork(self) -> "TaskStore":
+        """
+        Return a store with the same tasks, sharing this store's indexes until
+        either of the two is modified (Task objects are always shared).
+        """
+        with self._lock:
+            child = TaskStore.__new__(TaskStore)
+            child._tasks = self._tasks
+            child._indexes = self._indexes
+            child._by_time = self._by_time
+            child._time_entries = self._time_entries
+            child._untimed = self._untimed
+            child._seq = self._seq
+            child._lock = threading.RLock()
+            child._shared = self._shared = True
+            return child
+
+    def _own(self) -> None:
+        # Called with the lock held, before any mutation
+        if not self._shared:
+            return
+        self._tasks = dict(self._tasks)
+        self._indexes = {
+            f: {value: dict(bucket) for value, bucket in index.items()}
+            for f, index in self._indexes.items()
+        }
+        self._by_time = list(self._by_time)
+        self._time_entries = dict(self._time_entries)
+        self._untimed = dict(self._untimed)
+        self._shared = False
+
+    # ------------------------------------------------------------------ #
+    # Mutations
+    # ------------------------------------------------------------------ #
+    def add(self, task: "_Task") -> bool:
+        """Add *task*; return False (and leave the store as it is) if its key is taken."""
+        if task is None:
+            raise ValueError("task must not be None")
+
+        key = self.key_of(task)
+        with self._lock:
+            if key in self._tasks:
+                logger.warning("Duplicate task ignored: Customer Number=%s, Time Created=%s", *key)
+                return False
+            self._own()
+            self._tasks[key] = task
+            for f, index in self._indexes.items():
+                index.setdefault(getattr(task, f), {})[key] = task
+
+            created_at: Optional[datetime] = getattr(task, "created_at", None)
+            if created_at is None:
+                self._untimed[key] = task
+            else:
+                entry = (created_at.timestamp(), next(self._seq), key)
+                self._time_entries[key] = entry
+                bisect.insort(self._by_time, entry)
+            return True
+
+    def remove(self, customer_number: str, time_created: str) -> Optional["_Task"]:
+        """Remove and return the task with the given key, or None if it is not here."""
+        key = (customer_number, time_created)
+        with self._lock:
+            if key not in self._tasks:
+                return None
+            self._own()
+            task = self._tasks.pop(key)
+            for f, index in self._indexes.items():
+                bucket = index[getattr(task, f)]
+                del bucket[key]
+                if not bucket:
+                    del index[getattr(task, f)]
+
+            entry = self._time_entries.pop(key, None)
+            if entry is None:
+                del self._untimed[key]
+            else:
+                del self._by_time[bisect.bisect_left(self._by_time, entry)]
+            return task
+
+    def move_to(self, customer_number: str, time_created: str, other: "TaskStore") -> Optional["_Task"]:
+        """Move the task with the given key into *other*; return it, or None if it is not here."""
+        if other is None:
+            raise ValueError("other must not be None")
+
+        task = self.remove(customer_number, time_created)
+        if task is not None:
+            other.add(task)
+        return task
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+    def get(self, customer_number: str, time_created: str) -> Optional["_Task"]:
+        return self._tasks.get((customer_number, time_created))
+
+    def items(self) -> List[Tuple[TaskKey, "_Task"]]:
+        """(key, task) pairs, in insertion order."""
+        with self._lock:
+            return list(self._tasks.items())
+
+    def filter(
+        self,
+        filter_by: str | None = None,
+        filter_value: str | None = None,
+        customer_number: str | None = None,
+        order: str | None = None,
+        limit: int | None = None,
+    ) -> List["_Task"]:
+        """
+        Same semantics as :meth:`ExecutionContext.filter_tasks`: tasks matching
+        *customer_number* (if given) **and** the (*filter_by*, *filter_value*)
+        criterion (if given), where *filter_by* is a JSON alias of a Task field.
+
+        Parameters
+        ----------
+        order : str | None
+            ``"oldest"`` or ``"newest"`` to sort the result by Time Created
+            (tasks whose Time Created cannot be parsed come last); insertion
+            order otherwise.
+        limit : int | None
+            Max number of tasks returned.
+        """
+        if order not in (None, OLDEST, NEWEST):
+            raise ValueError(f"order must be '{OLDEST}' or '{NEWEST}'")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative")
+
+        with self._lock:
+            if order is not None and not customer_number and not filter_by:
+                # Straight from the chronological index
+                return list(itertools.islice(self._chronological(order == NEWEST), limit))
+
+            found = self._matching(filter_by, filter_value, customer_number)
+            if order is None:
+                return found[:limit] if limit is not None else found
+
+            sort_key = self._sort_key(order == NEWEST)
+            if limit is not None:
+                return heapq.nsmallest(limit, found, key=sort_key)
+            return sorted(found, key=sort_key)
+
+    def count(
+        self,
+        filter_by: str | None = None,
+        filter_value: str | None = None,
+        customer_number: str | None = None,
+    ) -> int:
+        """Number of tasks :meth:`filter` returns for the same criteria, without a limit."""
+        with self._lock:
+            if not customer_number and not filter_by:
+                return len(self._tasks)
+            return len(self._matching(filter_by, filter_value, customer_number))
+
+    def _matching(
+        self,
+        filter_by: str | None,
+        filter_value: str | None,
+        customer_number: str | None,
+    ) -> List["_Task"]:
+        candidates: Iterable["_Task"] = self._tasks.values()
+        if customer_number:
+            candidates = self._indexes["customer_number"].get(customer_number, {}).values()
+
+        if not (filter_by and filter_value is not None):
+            return list(candidates)
+        if not self._tasks:
+            return []
+
+        fld = field_for_alias(type(next(iter(self._tasks.values()))), filter_by)
+        if fld is None:  # If alias not found, nothing matches
+            return []
+        if fld in self._indexes and not customer_number:
+            return list(self._indexes[fld].get(filter_value, {}).values())
+        if fld == "time_created" and customer_number:
+            task = self._tasks.get((customer_number, filter_value))
+            return [task] if task is not None else []
+        return [t for t in candidates if str(getattr(t, fld)) == filter_value]
+
+    def _chronological(self, newest: bool) -> Iterator["_Task"]:
+        # Tasks created at the same time stay in insertion order, as in _sort_key()
+        entries: Iterable[Tuple[float, int, TaskKey]] = iter(self._by_time)
+        if newest:
+            entries = itertools.chain.from_iterable(
+                reversed(list(ties))
+                for _, ties in itertools.groupby(reversed(self._by_time), key=lambda e: e[0])
+            )
+        timed = (self._tasks[key] for _, _, key in entries)
+        return itertools.chain(timed, self._untimed.values())
+
+    def _sort_key(self, newest: bool):
+        untimed = float("inf")
+
+        def key(task: "_Task") -> Tuple[float, int]:
+            entry = self._time_entries.get(self.key_of(task))
+            if entry is None:
+                return (untimed, 0)
+            return (-entry[0] if newest else entry[0], entry[1])
+
+        return key
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator["_Task"]:
+        with self._lock:
+            return iter(list(self._tasks.values()))
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"TaskStore({len(self)} tasks)"
@@ -0,0 +1,37 @@
+import sys
+import threading
+
+from cow_collections import CowDict, CowList
+
+
+def _in_threads(fn, n=8):
+    barrier = threading.Barrier(n)
+
+    def run(i):
+        barrier.wait()
+        fn(i)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_concurrent_writes_to_a_fresh_fork_are_not_lost():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads often, to provoke the race
+    try:
+        for _ in range(200):
+            original = CowList(range(1000))
+            forked = original.fork()
+            _in_threads(forked.append)
+            assert sorted(forked[1000:]) == list(range(8))
+            assert len(original) == 1000
+
+            mapping = CowDict({i: i for i in range(1000)})
+            child = mapping.fork()
+            _in_threads(lambda i: child.__setitem__(f"k{i}", i))
+            assert len(child) == 1008 and len(mapping) == 1000
+    finally:
+        sys.setswitchinterval(interval)
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from chat_types import ToolCall
+from cow_collections import CowDict
+from execution_context import ExecutionContext
+from peace import Peace
+from scenario_component import ScenarioComponent
+
+TASKS = [
+    {
+        "Step Name": "Check bill",
+        "Time Created": "4/16/2025, 2:31 PM",
+        "Customer Number": "C1",
+        "Customer Name": "Ann",
+    },
+    {
+        "Step Name": "Check bill",
+        "Time Created": "4/17/2025, 9:05 AM",
+        "Customer Number": "C2",
+        "Customer Name": "Bob",
+    },
+    {
+        "Step Name": "Close estate",
+        "Time Created": "4/18/2025, 10:00 AM",
+        "Customer Number": "C3",
+        "Customer Name": "Cid",
+    },
+]
+
+
+class _Scenario:
+    def get(self, scenario_id, tool_id, args):
+        assert tool_id == "getUnassignedTasks"
+        return json.dumps(TASKS)
+
+
+class _LabAgent:
+    def __init__(self, ctx):
+        self.execution_context = ctx
+
+    def get_scenario_id(self):
+        return self.execution_context.scenario_id
+
+
+@pytest.fixture
+def ctx(monkeypatch):
+    monkeypatch.setattr(ScenarioComponent, "get_instance", classmethod(lambda cls: _Scenario()))
+    return ExecutionContext(ExecutionContext.DbConnector(), "scenario", "run")
+
+
+def _invoke(api, ctx, monkeypatch, **arguments):
+    monkeypatch.setattr(api, "is_initialized", lambda: True)
+    monkeypatch.setattr(api, "get_lab_agent", lambda: _LabAgent(ctx))
+    return api.invoke(ToolCall("call", api, arguments)).result
+
+
+def test_bulk_assign_before_get_unassigned_tasks_loads_the_scenario(ctx, monkeypatch):
+    result = _invoke(
+        Peace.BulkAssignTasksApi(), ctx, monkeypatch, stepName="Check bill", operatorId="42"
+    )
+
+    assert result.startswith("2 of 2 task(s) assigned")
+    assert ("C1", "4/16/2025, 2:31 PM") in ctx.operator_tasks
+    assert ("C2", "4/17/2025, 9:05 AM") in ctx.operator_tasks
+
+    # The other scenario tasks are still unassigned
+    remaining = json.loads(_invoke(Peace.GetUnassignedTasksApi(), ctx, monkeypatch))
+    assert [t["Customer Number"] for t in remaining] == ["C3"]
+
+
+def test_update_person_data_does_not_change_forks(ctx, monkeypatch):
+    ctx.related_persons = CowDict(
+        {
+            "P1": Peace.Person(
+                customer_number="P1",
+                relation_to_estate="Heir",
+                name="Dan",
+                power_of_attorney_type="None",
+                address="Street 1",
+                email="dan@example.com",
+                phone_number="123",
+            )
+        }
+    )
+    fork = ctx.fork()
+
+    _invoke(
+        Peace.UpdatePersonDataApi(), fork, monkeypatch, customerNumber="P1", email="new@example.com"
+    )
+
+    assert fork.related_persons["P1"].email == "new@example.com"
+    assert fork.related_persons["P1"].name == "Dan"
+    assert ctx.related_persons["P1"].email == "dan@example.com"
+
+
+def test_get_unassigned_tasks_pages_sorted_tasks(ctx, monkeypatch):
+    api = Peace.GetUnassignedTasksApi()
+
+    first = json.loads(_invoke(api, ctx, monkeypatch, order="newest", limit=2))
+    assert first["total"] == 3
+    assert [t["Customer Number"] for t in first["items"]] == ["C3", "C2"]
+
+    rest = json.loads(
+        _invoke(api, ctx, monkeypatch, order="newest", limit=2, cursor=first["nextCursor"])
+    )
+    assert rest["total"] == 3 and "nextCursor" not in rest
+    assert [t["Customer Number"] for t in rest["items"]] == ["C1"]
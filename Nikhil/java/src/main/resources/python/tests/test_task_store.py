@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel, Field
+
+from task_store import NEWEST, OLDEST, TaskStore
+
+
+class _Task(BaseModel):
+    """The fields of Peace.Task the store relies on."""
+
+    customer_number: str = Field(..., alias="Customer Number")
+    time_created: str = Field(..., alias="Time Created")
+    step_name: str = Field("Check bill", alias="Step Name")
+
+    model_config = {"populate_by_name": True}
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        try:
+            return datetime.strptime(self.time_created, "%m/%d/%Y, %I:%M %p")
+        except ValueError:
+            return None
+
+
+def _task(customer_number: str, time_created: str) -> _Task:
+    return _Task(customer_number=customer_number, time_created=time_created)
+
+
+def _store() -> TaskStore:
+    return TaskStore(
+        [
+            _task("C1", "4/16/2025, 2:31 PM"),
+            _task("C2", "4/17/2025, 9:05 AM"),
+            _task("C3", "4/17/2025, 9:05 AM"),
+            _task("C4", "4/15/2025, 8:00 AM"),
+            _task("C5", "not a date"),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "order, expected",
+    [
+        (OLDEST, ["C4", "C1", "C2", "C3", "C5"]),
+        (NEWEST, ["C2", "C3", "C1", "C4", "C5"]),
+    ],
+)
+def test_tasks_created_in_the_same_minute_keep_insertion_order(order, expected):
+    store = _store()
+
+    # Served from the chronological index
+    assert [t.customer_number for t in store.filter(order=order)] == expected
+    # Filtered (all tasks have the same Step Name), then sorted or the top-k selected
+    filtered = store.filter("Step Name", "Check bill", order=order)
+    assert [t.customer_number for t in filtered] == expected
+    top = store.filter("Step Name", "Check bill", order=order, limit=2)
+    assert [t.customer_number for t in top] == expected[:2]
@@ -0,0 +1,83 @@
+"""timing.py
+
+Lightweight, opt-in timing of the agent loop, used by the offline benchmark.
+
+Code under measurement is wrapped in ``with timed("<category>"):`` blocks.
+Times are *exclusive*: when blocks nest (e.g. an LLM call made by a nested
+agent invoked as a tool), the inner time is subtracted from the outer block,
+so that categories add up to at most the wall-clock time.
+
+Nothing is measured unless a collector has been started with
+:func:`start_timing`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+# Categories used across the project
+LLM = "llm"
+TOOL = "tool"
+SERIALISATION = "serialisation"
+SCENARIO = "scenario"
+
+
+class Timings:
+    """Accumulates exclusive time and number of calls per category."""
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, category: str, seconds: float) -> None:
+        with self._lock:
+            self.seconds[category] += seconds
+            self.counts[category] += 1
+
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+
+_active: Timings | None = None
+_local = threading.local()
+
+
+def start_timing() -> Timings:
+    """Start collecting timings (replacing any running collector)."""
+    global _active
+    _active = Timings()
+    return _active
+
+
+def stop_timing() -> Timings | None:
+    """Stop collecting; return the collector that was running, if any."""
+    global _active
+    timings, _active = _active, None
+    return timings
+
+
+@contextmanager
+def timed(category: str) -> Iterator[None]:
+    """Charge the time spent in the block to *category* (no-op when inactive)."""
+    timings = _active
+    if timings is None:
+        yield
+        return
+
+    stack: List[List[float]] = _local.__dict__.setdefault("stack", [])
+    frame = [0.0]  # time spent in nested blocks
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        timings.add(category, elapsed - frame[0])
+        if stack:
+            stack[-1][0] += elapsed
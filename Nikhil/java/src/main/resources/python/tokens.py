@@ -0,0 +1,72 @@
+"""tokens.py
+
+Token counting for prompt budgets.
+
+Uses the tokenizer matching the model when the optional ``tiktoken`` package
+is installed; otherwise falls back to an estimate of one token every
+:data:`CHARS_PER_TOKEN` characters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Tuple
+
+try:
+    import tiktoken
+except ImportError:  # optional dependency
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Used when tiktoken is not available
+CHARS_PER_TOKEN: int = 4
+
+# Encoding used for models unknown to tiktoken (GPT-4o / GPT-4.1 family)
+DEFAULT_ENCODING: str = "o200k_base"
+
+# Approximate per-message overhead of the chat format (role, separators)
+TOKENS_PER_MESSAGE: int = 4
+
+# Counts memoised by count_tokens(), keyed by (digest of the text, model) so
+# that the cache does not keep the (possibly long) texts alive
+CACHE_SIZE: int = 8192
+_counts: "OrderedDict[Tuple[bytes, str], int]" = OrderedDict()
+_counts_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):  # -> tiktoken.Encoding | None
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        logger.debug("No tokenizer known for model %s, using %s", model, DEFAULT_ENCODING)
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Return the number of tokens of *text* for *model* (memoised)."""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    key = (hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(), model)
+    with _counts_lock:
+        n = _counts.get(key)
+        if n is not None:
+            _counts.move_to_end(key)
+            return n
+    n = len(encoding.encode(text, disallowed_special=()))
+    with _counts_lock:
+        _counts[key] = n
+        if len(_counts) > CACHE_SIZE:
+            _counts.popitem(last=False)
+    return n
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
 import logging
+import threading
 from abc import ABC, abstractmethod
 from typing import Any, Mapping, Type
 
+import log_config
+
 # --------------------------------------------------------------------------- #
 # Logging configuration (equivalent to Java SimpleLogger)
 # --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------------- #
@@ -83,6 +83,11 @@ class AbstractTool(Tool):
         Its JSON schema is exposed through :pyattr:`json_parameters`.
     """
 
+    # Max number of invocations of one tool instance allowed to run at the
+    # same time when an executor dispatches tool calls concurrently; *None*
+    # means unlimited. Tools holding per-call state must lower this.
+    max_concurrency: int | None = None
+
     # --------------------------------------------------------------------- #
     # Construction & life-cycle
     # --------------------------------------------------------------------- #
@@ -103,6 +108,14 @@ class AbstractTool(Tool):
 
         self._agent: "Agent | None" = None
         self._closed: bool = False
+        self._concurrency_slots: threading.BoundedSemaphore | None = (
+            None if self.max_concurrency is None else threading.BoundedSemaphore(self.max_concurrency)
+        )
+
+    @property
+    def concurrency_slots(self) -> threading.BoundedSemaphore | None:
+        """Semaphore enforcing :pyattr:`max_concurrency`, or *None* if unlimited."""
+        return self._concurrency_slots
 
     # --------------------------------------------------------------------- #
     # Life-cycle helpers
@@ -6,6 +6,7 @@ from typing import Sequence
 from pydantic import Field
 
 from agent import Agent  # for type hints only
+import log_config
 from react_agent import ReactAgent
 from steps import Step, Status
 from tool import AbstractTool, Tool, ToolCall, ToolCallResult
@@ -13,10 +14,7 @@ from tool import AbstractTool, Tool, ToolCall, ToolCallResult
 # ---------------------------------------------------------------------------#
 # Logging configuration (Java-style simple logger)
 # ---------------------------------------------------------------------------#
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +29,10 @@ class ToolableReactAgent(ReactAgent, AbstractTool):
     `AbstractTool` (tool life-cycle & helpers).
     """
 
+    # One agent holds the state of a single run (steps, conversation),
+    # so concurrent calls to the same instance must be serialised.
+    max_concurrency = 1
+
     # --------------------------- parameters --------------------------- #
     class Parameters(ReactAgent.Parameters):
         """JSON-serialisable parameters for invoking the tool."""
@@ -19,7 +19,7 @@ Notes
 from __future__ import annotations
 
 import logging
-from typing import Mapping
+from typing import ClassVar, Mapping
 
 from pydantic import BaseModel, Field
 
@@ -35,14 +35,12 @@ from peace import Peace, Person  # Person schema used in context
 from customer_portal import CustomerPortal
 from operator_communication_tool import OperatorCommunicationTool
 from file_download_tool import FileDownloadTool
+import log_config
 
 ##### --------------------------------------------------------------------------- #
 ##### Logging configuration (equivalent to Java SimpleLogger)
 ##### --------------------------------------------------------------------------- #
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(name)s [%(levelname)s] %(message)s",
-)
+log_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -98,6 +96,17 @@ class UpdatePoATool(LabAgent):
         "}\n"
     )
 
+    # Execution context/person schema; built once, as it embeds the JSON schema
+    _CONTEXT: ClassVar[str] = (
+        '  * Documents you handle are in Danish, this means sometime you have to translate tool calls parameters. For example, "Customer Number" is sometimes indicated as "afdøde CPR" or "CPR" in documents.\n'
+        "  * Probate Certificate is a document that lists heirs for one estate; it is sometime indicated as \"SKS\".\n"
+        "  * Power of Attorney document (PoA) is a document that define people's legal rights over the estate's asset. It is sometime indicated as \"PoA\".\n"
+        "\n"
+        "  * Data about persons related to estates are described by the below JSON schema:\n"
+        f"{JsonSchema.get_json_schema(Person)}\n"
+        "  * Persons are uniquely identified by their Customer Number, sometimes also referred as CPR. Always provide the Customer Number if a tool needs to act on a specific person/client; indicate it as Customer Number and not CPR when passing it to tools.\n"
+    )
+
     # ------------------------------ init -------------------------------- #
     def __init__(self) -> None:
         super().__init__(
@@ -120,15 +129,10 @@ class UpdatePoATool(LabAgent):
         self.json_parameters = JsonSchema.get_json_schema(UpdatePoATool.Parameters)
 
         # Provide execution context/person schema to the underlying ReAct agent
-        self.context = (
-            '  * Documents you handle are in Danish, this means sometime you have to translate tool calls parameters. For example, "Customer Number" is sometimes indicated as "afdøde CPR" or "CPR" in documents.\n'
-            "  * Probate Certificate is a document that lists heirs for one estate; it is sometime indicated as \"SKS\".\n"
-            "  * Power of Attorney document (PoA) is a document that define people's legal rights over the estate's asset. It is sometime indicated as \"PoA\".\n"
-            "\n"
-            "  * Data about persons related to estates are described by the below JSON schema:\n"
-            f"{JsonSchema.get_json_schema(Person)}\n"
-            "  * Persons are uniquely identified by their Customer Number, sometimes also referred as CPR. Always provide the Customer Number if a tool needs to act on a specific person/client; indicate it as Customer Number and not CPR when passing it to tools.\n"
-        )
+        self.context = UpdatePoATool._CONTEXT
+
+        # Long replies: start running tool calls while the rest is generated
+        self.executor.streaming = True
 
     # ------------------------------ invoke ------------------------------ #
     def invoke(self, call: ToolCall) -> ToolCallResult:  # noqa: D401